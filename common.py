@@ -1,8 +1,11 @@
 import os
+import time
 from brownie import *
 import brownie
+from scripts.proposal_builder import build_proposal
 
-BLOCKS_PER_DAY = 86400 / 12 # 12 blocks per second
+SECONDS_PER_BLOCK = 12
+BLOCKS_PER_DAY = 86400 / SECONDS_PER_BLOCK # 12 seconds per block
 
 STRATEGIST = '0xF14BBdf064E3F67f51cd9BD646aE3716aD938FDC'
 GOV_MULTISIG = '0xbe2AB3d3d8F6a32b96414ebbd865dBD276d3d899'
@@ -32,59 +35,64 @@ def governanceProposal(deployment):
     actions = deploymentInfo['actions']
 
     if (len(actions) > 0):
-        ogvGovernor = Contract.from_explorer(GOVERNOR_FIVE)
+        proposal = build_proposal(actions, deploymentInfo['name'])
         proposal_args = [
-            [action['contract'].address for action in actions],
-            [0 for action in actions],
-            [action['signature'] for action in actions],
-            # To explain this code salad:
-            #  - action['signature'][:action['signature'].index('(')] -> this part gets the function name from signature
-            #  - encode_input(*action['args']) -> encodes said function data
-            #  - [10:] trim first 10 character to trim function name signature away from data
-            [getattr(action['contract'], action['signature'][:action['signature'].index('(')]).encode_input(*action['args'])[10:] for action in actions],
-            deploymentInfo['name'],
+            proposal.targets,
+            proposal.values,
+            proposal.signatures,
+            ["0x" + calldata.hex() for calldata in proposal.calldatas],
+            proposal.description,
         ]
 
         if is_fork:
-            print('Creating governance proposal on fork')
-            ogvGovernor.propose(
-                *proposal_args,
-                {'from': GOV_MULTISIG}
-            )
-            # Simulate execution on fork
-            proposalId = propose_tx.events['ProposalCreated'][0][0]['proposalId']
-
-            # Move forward 30s so that we can vote
-            timetravel(30)
-
-            # Vote on Proposal
-            print("Voting on the proposal")
-            ogvGovernor.castVote(proposalId, 1, {'from': GOV_MULTISIG})
-            
-            # 3 days to queue (+2 for buffer since contract has a different BLOCKS_PER_DAY now)
-            timetravel(86400 * 5)
-
-            print("Queueing proposal")
-            ogvGovernor.queue(proposalId, {'from': GOV_MULTISIG})
-
-            # 2 day timelock (+1 day for buffer)
-            timetravel(86400 * 3)
-
-            print("Executing proposal")
-            ogvGovernor.execute(proposalId, {'from': GOV_MULTISIG})
-
-        else:
-            propose_data = ogvGovernor.propose.encode_input(
-                *proposal_args
-            )
+            # Imported here since the simulator itself builds on this module
+            from scripts.proposal_simulator import proposal_simulator
+
+            print('Simulating governance proposal on fork')
+            proposal_simulator().simulate(proposal).report()
 
         print("Raw Args", proposal_args)
+        print("Proposal ID: {}".format(proposal.proposal_id))
 
         print("Execute the following transaction to create OGV Governance proposal")
         print("To: {}".format(GOVERNOR_FIVE))
-        print("Data: {}".format(propose_data))
+        print("Data: {}".format(proposal.data))
 
 
 def timetravel(seconds):
-    brownie.chain.sleep(seconds + 1)
-    brownie.chain.mine(int(seconds / BLOCKS_PER_DAY) + 1)
\ No newline at end of file
+    advance_chain(int(seconds / SECONDS_PER_BLOCK) + 1, seconds + 1)
+
+
+def _node_rpc_prefix():
+    # anvil and hardhat expose the same mining helpers under their own prefix
+    client = web3.provider.make_request("web3_clientVersion", [])["result"]
+    return "anvil" if client.lower().startswith("anvil") else "hardhat"
+
+
+# Moves the chain forward by `blocks` blocks spanning `seconds` seconds (12s per
+# block by default) using a single hardhat_mine/anvil_mine call instead of one
+# RPC per block. hardhat_mine resets the base fee, so the base fee from before
+# the jump is restored for the last block which is mined at the exact target
+# timestamp. Returns the wall clock time the jump took.
+def advance_chain(blocks, seconds=None, silent=False):
+    if blocks < 1:
+        raise ValueError("Must advance at least one block")
+    if seconds is None:
+        seconds = blocks * SECONDS_PER_BLOCK
+    interval = max(1, seconds // blocks)
+    prefix = _node_rpc_prefix()
+
+    started = time.perf_counter()
+    latest = web3.eth.get_block("latest")
+    base_fee = latest.get("baseFeePerGas", 0)
+    target = latest["timestamp"] + max(seconds, blocks)
+    if blocks > 1:
+        web3.provider.make_request("{}_mine".format(prefix), [hex(blocks - 1), hex(interval)])
+        target = max(target, web3.eth.get_block("latest")["timestamp"] + 1)
+    web3.provider.make_request("{}_setNextBlockBaseFeePerGas".format(prefix), [hex(base_fee)])
+    brownie.chain.mine(timestamp=target)
+    elapsed = time.perf_counter() - started
+
+    if not silent:
+        print("Advanced {} blocks and {} seconds in {:.3f}s".format(blocks, target - latest["timestamp"], elapsed))
+    return elapsed
\ No newline at end of file
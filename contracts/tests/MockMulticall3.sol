@@ -0,0 +1,26 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.10;
+
+/// @dev aggregate3 of Multicall3 (0xcA11bde05977b3631167028862bE2a173976CA11),
+/// which isn't deployed on local development chains.
+contract MockMulticall3 {
+    struct Call3 {
+        address target;
+        bool allowFailure;
+        bytes callData;
+    }
+
+    struct Result {
+        bool success;
+        bytes returnData;
+    }
+
+    function aggregate3(Call3[] calldata calls) external payable returns (Result[] memory returnData) {
+        returnData = new Result[](calls.length);
+        for (uint256 i = 0; i < calls.length; i++) {
+            Result memory result = returnData[i];
+            (result.success, result.returnData) = calls[i].target.call(calls[i].callData);
+            require(calls[i].allowFailure || result.success, "Multicall3: call failed");
+        }
+    }
+}
@@ -0,0 +1,97 @@
+import json
+import os
+import sys
+from collections import namedtuple
+
+from eth_utils import keccak
+
+from scripts.merkle_tree import parse_amount
+from scripts.multicall import JsonRpc
+
+# claimedBitMap is the only storage variable of AbstractLockupDistributor, the
+# other fields are immutables
+CLAIMED_BIT_MAP_SLOT = 0
+CLAIMS_PER_WORD = 256
+BATCH_SIZE = 500
+
+Claim = namedtuple("Claim", ["account", "index", "amount"])
+
+
+class ClaimReport(
+    namedtuple("ClaimReport", ["block_number", "claimed", "unclaimed", "claimed_amount", "unclaimed_amount"])
+):
+    def report(self):
+        for claim in self.unclaimed:
+            print("{}\t{}\t{}".format(claim.account, claim.index, claim.amount))
+        print("Claim status at block {}".format(self.block_number))
+        print("  claimed\t{} claims\t{}".format(len(self.claimed), self.claimed_amount))
+        print("  unclaimed\t{} claims\t{}".format(len(self.unclaimed), self.unclaimed_amount))
+
+
+def word_slot(word_index, slot=CLAIMED_BIT_MAP_SLOT):
+    """Storage slot of claimedBitMap[word_index]."""
+    return "0x" + keccak(word_index.to_bytes(32, "big") + slot.to_bytes(32, "big")).hex()
+
+
+def load_claims(path):
+    """Claims from a `*_claims.json` file as written by scripts/merkle_tree.py."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return [
+        Claim(account, claim["index"], parse_amount(claim["amount"])) for account, claim in data["claims"].items()
+    ]
+
+
+def claimed_words(rpc, distributor, word_indexes, block_number, batch_size=BATCH_SIZE):
+    """{word index: claimedBitMap word} at `block_number`, read with one
+    batch of eth_getStorageAt calls per `batch_size` words."""
+    word_indexes = sorted(set(word_indexes))
+    words = {}
+    for start in range(0, len(word_indexes), batch_size):
+        batch = word_indexes[start : start + batch_size]
+        results = rpc.batch(
+            [("eth_getStorageAt", [distributor, word_slot(word), hex(block_number)]) for word in batch]
+        )
+        words.update(zip(batch, (int(result, 16) for result in results)))
+    return words
+
+
+def is_claimed(words, index):
+    """AbstractLockupDistributor.isClaimed against words from claimed_words."""
+    return (words.get(index // CLAIMS_PER_WORD, 0) >> (index % CLAIMS_PER_WORD)) & 1 == 1
+
+
+def scan(rpc, distributor, claims, block_number, batch_size=BATCH_SIZE):
+    """Splits `claims` into claimed and unclaimed at `block_number`.
+
+    Each storage word holds the status of 256 consecutive claim indexes, so
+    the cost is one batched request per `batch_size` * 256 claims rather
+    than an isClaimed call per claim.
+    """
+    claims = list(claims)
+    words = claimed_words(
+        rpc, distributor, (claim.index // CLAIMS_PER_WORD for claim in claims), block_number, batch_size
+    )
+    claimed, unclaimed = [], []
+    for claim in claims:
+        (claimed if is_claimed(words, claim.index) else unclaimed).append(claim)
+    return ClaimReport(
+        block_number,
+        claimed,
+        unclaimed,
+        sum(claim.amount for claim in claimed),
+        sum(claim.amount for claim in unclaimed),
+    )
+
+
+# Lists the unclaimed claims of a distributor, e.g. before burnRemainingOGV, run with
+# `python -m scripts.claim_status <distributor> scripts/1_data/mandatory_lockup_claims.json [block]`
+def main(distributor, claims_file, block_number=None):
+    rpc = JsonRpc(os.environ["PROVIDER_URL"])
+    block_number = int(block_number) if block_number else rpc.block_number()
+    scan(rpc, distributor, load_claims(claims_file), block_number).report()
+    print("{} RPC requests".format(rpc.requests))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,245 @@
+import json
+import mmap
+import struct
+import sys
+from collections import namedtuple
+
+from eth_utils import to_checksum_address
+
+from scripts.merkle_tree import NODE_SIZE, format_amount, parse_amount
+
+# Binary claims file layout, all integers big endian:
+#
+#   header    magic (8 bytes) | claim count (uint64) | merkle root (32 bytes) | source count (uint32)
+#   sources   source count x 32 byte split source names, utf-8 padded with zeros
+#   addresses claim count x 20 byte addresses, sorted ascending
+#   records   claim count x (index uint64 | amount uint256 | proof offset uint64 | proof length uint32),
+#             in the same order as the addresses
+#   splits    claim count x source count x uint256 split amounts, in the same order as the addresses
+#   proofs    32 byte proof nodes, the offset of a record counts nodes from the start of this section
+#
+# Lookups binary search the address section of the memory-mapped file, so only
+# the pages that are touched end up in memory.
+MAGIC = b"OGVCLM02"
+HEADER = struct.Struct(">8sQ32sI")
+RECORD = struct.Struct(">Q32sQI")
+ADDRESS_SIZE = 20
+SOURCE_SIZE = 32
+AMOUNT_SIZE = 32
+
+# `split` maps source names to amounts, or is None for claims without one
+Claim = namedtuple("Claim", ["account", "index", "amount", "proof", "split"], defaults=[None])
+
+
+def _address_bytes(account):
+    raw = bytes.fromhex(account[2:] if account.startswith(("0x", "0X")) else account)
+    if len(raw) != ADDRESS_SIZE:
+        raise ValueError("Invalid address {}".format(account))
+    return raw
+
+
+def _split_sources(claims):
+    # Every claim splits over the sources of the first one, or none does
+    split = claims[0].split if len(claims) else None
+    sources = list(split or ())
+    for source in sources:
+        if len(source.encode()) > SOURCE_SIZE:
+            raise ValueError("Split source name {!r} is too long".format(source))
+    return sources
+
+
+def _split_bytes(claim, sources):
+    if list(claim.split or ()) != sources:
+        raise ValueError("Claim for {} doesn't split over {}".format(claim.account, sources))
+    return b"".join(claim.split[source].to_bytes(AMOUNT_SIZE, "big") for source in sources)
+
+
+def write_store(path, merkle_root, claims):
+    """Writes a claims store from a sized sequence of Claim tuples.
+
+    Proof nodes are streamed to disk as they come in, only the addresses, the
+    fixed width records and the split amounts are held in memory to be sorted.
+    """
+    if isinstance(merkle_root, str):
+        merkle_root = bytes.fromhex(merkle_root[2:])
+    count = len(claims)
+    sources = _split_sources(claims)
+    proofs_start = (
+        HEADER.size
+        + len(sources) * SOURCE_SIZE
+        + count * (ADDRESS_SIZE + RECORD.size + len(sources) * AMOUNT_SIZE)
+    )
+
+    entries = []
+    with open(path, "wb") as f:
+        f.seek(proofs_start)
+        offset = 0
+        for claim in claims:
+            for node in claim.proof:
+                f.write(bytes.fromhex(node[2:]) if isinstance(node, str) else node)
+            entries.append(
+                (
+                    _address_bytes(claim.account),
+                    RECORD.pack(claim.index, claim.amount.to_bytes(32, "big"), offset, len(claim.proof)),
+                    _split_bytes(claim, sources),
+                )
+            )
+            offset += len(claim.proof)
+
+        if len(entries) != count:
+            raise ValueError("Expected {} claims, got {}".format(count, len(entries)))
+        entries.sort()
+        for (address, _, _), (next_address, _, _) in zip(entries, entries[1:]):
+            if address == next_address:
+                raise ValueError("Duplicate claim for 0x{}".format(address.hex()))
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, count, merkle_root, len(sources)))
+        f.writelines(source.encode().ljust(SOURCE_SIZE, b"\0") for source in sources)
+        f.writelines(address for address, _, _ in entries)
+        f.writelines(record for _, record, _ in entries)
+        f.writelines(split for _, _, split in entries)
+
+
+def write_store_from_claims_file(claims_file, path):
+    """Converts a `*_claims.json` file as written by scripts/merkle_tree.py."""
+    with open(claims_file, encoding="utf-8") as f:
+        data = json.load(f)
+    claims = [
+        Claim(
+            account,
+            claim["index"],
+            parse_amount(claim["amount"]),
+            claim["proof"],
+            {source: parse_amount(amount) for source, amount in claim["split"].items()} if "split" in claim else None,
+        )
+        for account, claim in data["claims"].items()
+    ]
+    write_store(path, data["merkleRoot"], claims)
+
+
+class ClaimsStore:
+    """Read-only, memory-mapped view over a binary claims file."""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, self.merkle_root, source_count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("{} is not a claims store".format(path))
+        self.sources = [
+            self._map[start : start + SOURCE_SIZE].rstrip(b"\0").decode()
+            for start in range(HEADER.size, HEADER.size + source_count * SOURCE_SIZE, SOURCE_SIZE)
+        ]
+        self._addresses_start = HEADER.size + source_count * SOURCE_SIZE
+        self._records_start = self._addresses_start + self._count * ADDRESS_SIZE
+        self._splits_start = self._records_start + self._count * RECORD.size
+        self._proofs_start = self._splits_start + self._count * source_count * AMOUNT_SIZE
+
+    def close(self):
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def _address(self, position):
+        start = self._addresses_start + position * ADDRESS_SIZE
+        return self._map[start : start + ADDRESS_SIZE]
+
+    def _position(self, account):
+        address = _address_bytes(account)
+        low, high = 0, self._count
+        while low < high:
+            mid = (low + high) // 2
+            if self._address(mid) < address:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self._count and self._address(low) == address:
+            return low
+        return None
+
+    def _claim(self, position):
+        index, amount, offset, length = RECORD.unpack_from(
+            self._map, self._records_start + position * RECORD.size
+        )
+        start = self._proofs_start + offset * NODE_SIZE
+        proof = [
+            "0x" + self._map[node : node + NODE_SIZE].hex()
+            for node in range(start, start + length * NODE_SIZE, NODE_SIZE)
+        ]
+        split = None
+        if self.sources:
+            start = self._splits_start + position * len(self.sources) * AMOUNT_SIZE
+            amounts = self._map[start : start + len(self.sources) * AMOUNT_SIZE]
+            split = {
+                source: int.from_bytes(amounts[n * AMOUNT_SIZE : (n + 1) * AMOUNT_SIZE], "big")
+                for n, source in enumerate(self.sources)
+            }
+        return Claim(
+            to_checksum_address(self._address(position)),
+            index,
+            int.from_bytes(amount, "big"),
+            proof,
+            split,
+        )
+
+    def get(self, account, default=None):
+        position = self._position(account)
+        return default if position is None else self._claim(position)
+
+    def __getitem__(self, account):
+        position = self._position(account)
+        if position is None:
+            raise KeyError(account)
+        return self._claim(position)
+
+    def __contains__(self, account):
+        return self._position(account) is not None
+
+    def __iter__(self):
+        """Yields every claim in address order."""
+        for position in range(self._count):
+            yield self._claim(position)
+
+    def export_json(self, path):
+        """Writes the claims back out as a `*_claims.json` style document, in
+        claim index order, formatted like scripts/merkle_tree.py writes it."""
+        positions = sorted(
+            range(self._count),
+            key=lambda position: RECORD.unpack_from(
+                self._map, self._records_start + position * RECORD.size
+            )[0],
+        )
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{\n  "merkleRoot": "0x%s",\n  "claims": {' % self.merkle_root.hex())
+            for n, position in enumerate(positions):
+                claim = self._claim(position)
+                data = {"index": claim.index, "amount": format_amount(claim.amount)}
+                if claim.split is not None:
+                    data["split"] = {source: format_amount(amount) for source, amount in claim.split.items()}
+                data["proof"] = claim.proof
+                f.write("%s\n    %s: %s" % ("," if n else "", json.dumps(claim.account), json.dumps(data)))
+            f.write("\n  }\n}\n")
+
+
+# Builds a claims store next to a claims file, run with
+# `python -m scripts.claims_store scripts/1_data/mandatory_lockup_claims.json`
+def main(claims_file, store_file=None):
+    store_file = store_file or claims_file.rsplit(".", 1)[0] + ".bin"
+    write_store_from_claims_file(claims_file, store_file)
+    with ClaimsStore(store_file) as store:
+        print("Wrote {} claims to {}".format(len(store), store_file))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -1,6 +1,8 @@
 import json
 from brownie import *
 import os
+import sys
+from scripts.verify_proofs import verify_claims_file
 
 EPOCH = 1657584000  # start of rewards: Tuesday, July 12, 2022 12:00:00 AM UTC
 EST_EPOCH_BLOCK = 15124542
@@ -13,14 +15,17 @@ OPTIONAL_END_BLOCK = MANDATORY_END_BLOCK
 def main(
     output_file=None,
 ):
-    mandatory_lockup_claims = open(
-        "./scripts/{}_data/mandatory_lockup_claims.json".format(web3.chain_id)
-    )
-    optional_lockup_claims = open(
-        "./scripts/{}_data/optional_lockup_claims.json".format(web3.chain_id)
-    )
-    mandatory_lockup_merkle_root = json.load(mandatory_lockup_claims)["merkleRoot"]
-    optional_lockup_merkle_root = json.load(optional_lockup_claims)["merkleRoot"]
+    mandatory_lockup_claims_file = "./scripts/{}_data/mandatory_lockup_claims.json".format(web3.chain_id)
+    optional_lockup_claims_file = "./scripts/{}_data/optional_lockup_claims.json".format(web3.chain_id)
+    mandatory_lockup_merkle_root = json.load(open(mandatory_lockup_claims_file))["merkleRoot"]
+    optional_lockup_merkle_root = json.load(open(optional_lockup_claims_file))["merkleRoot"]
+
+    # Check every proof against its merkle root before anything gets funded
+    for claims_file in [mandatory_lockup_claims_file, optional_lockup_claims_file]:
+        result = verify_claims_file(claims_file)
+        result.report()
+        if not result.ok:
+            sys.exit("Invalid claims in {}".format(claims_file))
 
     if web3.chain_id == 1:
         accounts.default = accounts.load("deployer")
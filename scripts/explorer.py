@@ -0,0 +1,112 @@
+import json
+import os
+import threading
+import time
+import urllib.parse
+import urllib.request
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+EXPLORER_APIS = {
+    1: "https://api.etherscan.io/api",
+    5: "https://api-goerli.etherscan.io/api",
+}
+# Addresses verified by earlier runs, per chain
+VERIFIED_FILE = "build/deployments/verified.json"
+
+VerificationStatus = namedtuple("VerificationStatus", ["name", "address", "status", "error"])
+
+
+class Explorer:
+    """Etherscan compatible API client, only used to look up whether a
+    contract's source is already verified."""
+
+    def __init__(self, api_url, api_key=None, timeout=30):
+        self.api_url = api_url
+        self.api_key = api_key if api_key is not None else os.getenv("ETHERSCAN_TOKEN")
+        self.timeout = timeout
+
+    @classmethod
+    def for_chain(cls, chain_id):
+        return cls(EXPLORER_APIS[int(chain_id)])
+
+    def is_verified(self, address):
+        params = {"module": "contract", "action": "getsourcecode", "address": address}
+        if self.api_key:
+            params["apikey"] = self.api_key
+        url = "{}?{}".format(self.api_url, urllib.parse.urlencode(params))
+        with urllib.request.urlopen(url, timeout=self.timeout) as response:
+            result = json.load(response).get("result")
+        return isinstance(result, list) and bool(result) and bool(result[0].get("SourceCode"))
+
+
+class VerifiedCache:
+    """Addresses known to be verified, kept on disk between runs."""
+
+    def __init__(self, path=VERIFIED_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._verified = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._verified = {chain_id: set(addresses) for chain_id, addresses in json.load(f).items()}
+
+    def __contains__(self, deployment):
+        return deployment.address in self._verified.get(str(deployment.chain_id), ())
+
+    def add(self, deployment):
+        with self._lock:
+            self._verified.setdefault(str(deployment.chain_id), set()).add(deployment.address)
+
+    def save(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({chain_id: sorted(addresses) for chain_id, addresses in self._verified.items()}, f, indent=2)
+
+
+def _verify(deployment, publish, explorer, cache, retries, backoff):
+    try:
+        already_verified = explorer is not None and explorer.is_verified(deployment.address)
+    except (OSError, ValueError):
+        # Can't tell, publishing again is harmless
+        already_verified = False
+    if already_verified:
+        cache.add(deployment)
+        return VerificationStatus(deployment.name, deployment.address, "already verified", None)
+    error = None
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(backoff * 2 ** (attempt - 1))
+        try:
+            if publish(deployment) is not False:
+                cache.add(deployment)
+                return VerificationStatus(deployment.name, deployment.address, "verified", None)
+            error = "explorer rejected the source"
+        except Exception as e:
+            error = str(e)
+    return VerificationStatus(deployment.name, deployment.address, "failed", error)
+
+
+def verify_deployments(deployments, publish, explorer=None, cache=None, workers=4, retries=2, backoff=5.0):
+    """Publishes the source of every deployment that isn't verified yet.
+
+    Deployments in the cache are skipped without any request. The rest are
+    checked against the explorer first and only published when needed, with
+    at most `workers` verifications in flight and `retries` more attempts
+    for each failure. `publish` takes a Deployment and returns False or
+    raises when verification fails, like ContractContainer.publish_source.
+    """
+    cache = cache if cache is not None else VerifiedCache()
+    statuses = []
+    pending = []
+    for deployment in deployments:
+        if deployment in cache:
+            statuses.append(VerificationStatus(deployment.name, deployment.address, "skipped", None))
+        else:
+            pending.append(deployment)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        statuses.extend(
+            executor.map(lambda deployment: _verify(deployment, publish, explorer, cache, retries, backoff), pending)
+        )
+    cache.save()
+    return statuses
@@ -0,0 +1,128 @@
+import glob
+import json
+import os
+import sys
+from collections import namedtuple
+
+# Relative gas change above which a benchmark counts as a regression
+TOLERANCE = 0.01
+REPORT_FILE = "build/gas-report.json"
+BASELINE_FILE = "tests/benchmarks/gas_baseline.json"
+
+GasEntry = namedtuple("GasEntry", ["path", "parameter", "size", "gas"])
+GasChange = namedtuple("GasChange", ["name", "before", "after", "status"])
+
+
+def entry_name(path, parameter, size):
+    return "{} {}={}".format(path, parameter, size)
+
+
+class GasReport:
+    """Gas used by each benchmarked call, keyed by call path and the size of
+    the state it ran against (e.g. `OgvStaking.unstake lockups=50`)."""
+
+    def __init__(self, entries=()):
+        self.entries = {}
+        for entry in entries:
+            self.record(*entry)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def record(self, path, parameter, size, gas):
+        entry = GasEntry(path, parameter, size, int(gas))
+        self.entries[entry_name(path, parameter, size)] = entry
+        return entry
+
+    def gas(self, name):
+        return self.entries[name].gas
+
+    def save(self, path=REPORT_FILE):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        entries = sorted(self.entries.values(), key=lambda entry: (entry.path, entry.parameter, entry.size))
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"entries": [entry._asdict() for entry in entries]}, f, indent=2)
+            f.write("\n")
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls(GasEntry(**entry) for entry in json.load(f)["entries"])
+
+    @classmethod
+    def merge(cls, paths):
+        """One report from the reports at `paths`, e.g. one per xdist worker."""
+        report = cls()
+        for path in paths:
+            report.entries.update(cls.load(path).entries)
+        return report
+
+
+def worker_report_file(path, worker):
+    """`build/gas-report.json` becomes `build/gas-report-gw0.json` for worker gw0."""
+    root, extension = os.path.splitext(path)
+    return "{}-{}{}".format(root, worker, extension)
+
+
+def compare(baseline, current, tolerance=TOLERANCE):
+    """GasChange for every benchmark in either report, sorted by name."""
+    changes = []
+    for name in sorted(set(baseline.entries) | set(current.entries)):
+        before = baseline.entries[name].gas if name in baseline.entries else None
+        after = current.entries[name].gas if name in current.entries else None
+        if before is None:
+            status = "new"
+        elif after is None:
+            status = "removed"
+        elif after > before * (1 + tolerance):
+            status = "regression"
+        elif after < before * (1 - tolerance):
+            status = "improvement"
+        else:
+            status = "unchanged"
+        changes.append(GasChange(name, before, after, status))
+    return changes
+
+
+def print_changes(changes):
+    for change in changes:
+        if change.before and change.after:
+            delta = "{:+.2%}".format(change.after / change.before - 1)
+        else:
+            delta = ""
+        print(
+            "{:<52} {:>10} {:>10} {:>8}  {}".format(
+                change.name,
+                "-" if change.before is None else "{:,}".format(change.before),
+                "-" if change.after is None else "{:,}".format(change.after),
+                delta,
+                change.status,
+            )
+        )
+
+
+# Compares a gas report with the stored baseline, or only prints it when there
+# is no baseline yet, run with
+# `python -m scripts.gas_report build/gas-report.json`. A glob like
+# "build/gas-report-*.json" merges the reports of xdist workers first.
+def main(report_file=REPORT_FILE, baseline_file=BASELINE_FILE, tolerance=TOLERANCE):
+    report_files = sorted(glob.glob(report_file))
+    if not report_files:
+        sys.exit("No gas report at {}".format(report_file))
+    current = GasReport.merge(report_files)
+    if not os.path.exists(baseline_file):
+        # Nothing to regress against yet, so only report what was measured
+        print("No gas baseline at {}, reporting only".format(baseline_file))
+        print_changes(compare(GasReport(), current))
+        return
+    changes = compare(GasReport.load(baseline_file), current, float(tolerance))
+    print_changes(changes)
+    regressions = [change for change in changes if change.status == "regression"]
+    if regressions:
+        sys.exit("{} benchmarks use more gas than the baseline".format(len(regressions)))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
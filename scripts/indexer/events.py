@@ -0,0 +1,103 @@
+from collections import namedtuple
+
+from eth_utils import to_checksum_address
+
+from scripts.retroactive.contracts import event_topic
+from scripts.retroactive.events import data_words, log_block, log_data, log_topic, topic_address
+
+try:
+    from eth_abi import decode
+except ImportError:  # eth-abi < 4
+    from eth_abi import decode_abi as decode
+
+# OgvStaking and ExponentialStaking
+STAKE_TOPIC = event_topic("Stake(address,uint256,uint256,uint256,uint256)")
+UNSTAKE_TOPIC = event_topic("Unstake(address,uint256,uint256,uint256,uint256)")
+# ERC20Votes
+DELEGATE_CHANGED_TOPIC = event_topic("DelegateChanged(address,address,address)")
+DELEGATE_VOTES_CHANGED_TOPIC = event_topic("DelegateVotesChanged(address,uint256,uint256)")
+# Governance
+PROPOSAL_CREATED_TYPES = [
+    "uint256",
+    "address",
+    "address[]",
+    "uint256[]",
+    "string[]",
+    "bytes[]",
+    "uint256",
+    "uint256",
+    "string",
+]
+PROPOSAL_CREATED_TOPIC = event_topic("ProposalCreated({})".format(",".join(PROPOSAL_CREATED_TYPES)))
+VOTE_CAST_TYPES = ["uint256", "uint8", "uint256", "string"]
+VOTE_CAST_TOPIC = event_topic("VoteCast(address,uint256,uint8,uint256,string)")
+# Emitted instead of VoteCast by castVoteWithReasonAndParams
+VOTE_CAST_WITH_PARAMS_TYPES = VOTE_CAST_TYPES + ["bytes"]
+VOTE_CAST_WITH_PARAMS_TOPIC = event_topic("VoteCastWithParams(address,uint256,uint8,uint256,string,bytes)")
+PROPOSAL_QUEUED_TOPIC = event_topic("ProposalQueued(uint256,uint256)")
+PROPOSAL_EXECUTED_TOPIC = event_topic("ProposalExecuted(uint256)")
+PROPOSAL_CANCELED_TOPIC = event_topic("ProposalCanceled(uint256)")
+PROPOSAL_EXTENDED_TOPIC = event_topic("ProposalExtended(uint256,uint64)")
+QUORUM_NUMERATOR_UPDATED_TOPIC = event_topic("QuorumNumeratorUpdated(uint256,uint256)")
+LATE_QUORUM_VOTE_EXTENSION_SET_TOPIC = event_topic("LateQuorumVoteExtensionSet(uint64,uint64)")
+
+LockupEvent = namedtuple("LockupEvent", ["block_number", "user", "lockup_id", "amount", "end", "points"])
+DelegateChanged = namedtuple("DelegateChanged", ["block_number", "delegator", "from_delegate", "to_delegate"])
+DelegateVotesChanged = namedtuple(
+    "DelegateVotesChanged", ["block_number", "delegate", "previous_balance", "new_balance"]
+)
+ProposalCreated = namedtuple(
+    "ProposalCreated",
+    [
+        "block_number",
+        "proposal_id",
+        "proposer",
+        "targets",
+        "values",
+        "signatures",
+        "calldatas",
+        "start_block",
+        "end_block",
+        "description",
+    ],
+)
+VoteCast = namedtuple("VoteCast", ["block_number", "voter", "proposal_id", "support", "weight", "reason"])
+
+
+def decode_lockup(log):
+    """Decodes a Stake or Unstake log."""
+    return LockupEvent(log_block(log), topic_address(log, 1), *data_words(log)[:4])
+
+
+def decode_delegate_changed(log):
+    return DelegateChanged(log_block(log), topic_address(log, 1), topic_address(log, 2), topic_address(log, 3))
+
+
+def decode_delegate_votes_changed(log):
+    return DelegateVotesChanged(log_block(log), topic_address(log, 1), *data_words(log)[:2])
+
+
+def decode_proposal_created(log):
+    (proposal_id, proposer, targets, values, signatures, calldatas, start_block, end_block, description) = decode(
+        PROPOSAL_CREATED_TYPES, log_data(log)
+    )
+    return ProposalCreated(
+        log_block(log),
+        proposal_id,
+        to_checksum_address(proposer),
+        [to_checksum_address(target) for target in targets],
+        list(values),
+        list(signatures),
+        ["0x" + calldata.hex() for calldata in calldatas],
+        start_block,
+        end_block,
+        description,
+    )
+
+
+def decode_vote_cast(log):
+    """Decodes a VoteCast or VoteCastWithParams log, without the params."""
+    types = VOTE_CAST_WITH_PARAMS_TYPES if log_topic(log) == VOTE_CAST_WITH_PARAMS_TOPIC else VOTE_CAST_TYPES
+    proposal_id, support, weight, reason = decode(types, log_data(log))[:4]
+    return VoteCast(log_block(log), topic_address(log, 1), proposal_id, support, weight, reason)
+
@@ -0,0 +1,128 @@
+import os
+import sys
+import time
+from collections import namedtuple
+
+from eth_utils import to_checksum_address
+
+from scripts.indexer.events import STAKE_TOPIC, UNSTAKE_TOPIC, decode_lockup
+from scripts.indexer.log_index import LogIndex
+from scripts.retroactive.events import log_topic
+from scripts.retroactive.logs import LogFetcher
+from scripts.staking_points import PointsCurve
+
+Lockup = namedtuple("Lockup", ["lockup_id", "amount", "end", "points"])
+
+
+class Portfolio(
+    namedtuple("Portfolio", ["user", "timestamp", "lockups", "withdrawals", "amount", "points", "withdraw_value"])
+):
+    def report(self):
+        print("{} at {}".format(self.user, self.timestamp))
+        for lockup, withdrawal in zip(self.lockups, self.withdrawals):
+            print(
+                "  #{}\tamount {}\tpoints {}\tend {}\twithdraw {}".format(
+                    lockup.lockup_id, lockup.amount, lockup.points, lockup.end, withdrawal
+                )
+            )
+        print("  total\tamount {}\tpoints {}\twithdraw {}".format(self.amount, self.points, self.withdraw_value))
+
+
+class LockupIndex(LogIndex):
+    """Every user's open lockups, rebuilt from staking contract logs.
+
+    A Stake log opens or replaces lockup `lockupId` and an Unstake log closes
+    it. ExponentialStaking logs an extension as an Unstake of the old lockup
+    followed by a Stake of the new one under the same id, so both contracts
+    are handled alike. Closed lockups are dropped, so a portfolio costs one
+    lookup however many lockups the user has opened over time.
+
+    With a PointsCurve, withdraw values are ExponentialStaking.previewWithdraw
+    including the early unstake penalty. Without one they are the staked
+    amounts, as OgvStaking has no penalty.
+    """
+
+    topics = [STAKE_TOPIC, UNSTAKE_TOPIC]
+
+    def __init__(self, curve=None):
+        super().__init__()
+        self.curve = curve
+        self._lockups = {}
+        self._counts = {}
+
+    def __len__(self):
+        return len(self._lockups)
+
+    def __contains__(self, user):
+        return to_checksum_address(user) in self._lockups
+
+    def apply_log(self, log):
+        topic = log_topic(log)
+        if topic not in (STAKE_TOPIC, UNSTAKE_TOPIC):
+            return
+        event = decode_lockup(log)
+        user_lockups = self._lockups.setdefault(event.user, {})
+        if topic == STAKE_TOPIC:
+            user_lockups[event.lockup_id] = Lockup(event.lockup_id, event.amount, event.end, event.points)
+            self._counts[event.user] = max(self._counts.get(event.user, 0), event.lockup_id + 1)
+        else:
+            user_lockups.pop(event.lockup_id, None)
+            if not user_lockups:
+                del self._lockups[event.user]
+
+    def lockups(self, user):
+        """Open lockups of `user`, by id."""
+        user_lockups = self._lockups.get(to_checksum_address(user), {})
+        return [user_lockups[lockup_id] for lockup_id in sorted(user_lockups)]
+
+    def lockups_count(self, user):
+        """Lockups ever opened by `user`, like lockupsCount."""
+        return self._counts.get(to_checksum_address(user), 0)
+
+    def withdrawals(self, lockups, timestamp):
+        if self.curve is None:
+            return [lockup.amount for lockup in lockups]
+        amounts = [lockup.amount for lockup in lockups]
+        return self.curve.withdrawals(amounts, [lockup.end for lockup in lockups], timestamp)
+
+    def portfolio(self, user, timestamp):
+        """Open lockups of `user` with their withdraw values at `timestamp`."""
+        lockups = self.lockups(user)
+        withdrawals = self.withdrawals(lockups, timestamp)
+        return Portfolio(
+            to_checksum_address(user),
+            timestamp,
+            lockups,
+            withdrawals,
+            sum(lockup.amount for lockup in lockups),
+            sum(lockup.points for lockup in lockups),
+            sum(withdrawals),
+        )
+
+    def expiring(self, start, end):
+        """(user, lockup) for every open lockup ending in [start, end)."""
+        return sorted(
+            (
+                (user, lockup)
+                for user, user_lockups in self._lockups.items()
+                for lockup in user_lockups.values()
+                if start <= lockup.end < end
+            ),
+            key=lambda entry: (entry[1].end, entry[0], entry[1].lockup_id),
+        )
+
+
+# Prints the open lockups of users, run with `python -m scripts.indexer.lockups
+# <staking address> <deploy block> <block> <user> ...`. Set STAKING_EPOCH to
+# price early withdrawals like ExponentialStaking.
+def main(address, from_block, block_number, *users):
+    epoch = os.getenv("STAKING_EPOCH")
+    index = LockupIndex(PointsCurve(int(epoch)) if epoch else None)
+    index.index(LogFetcher(os.environ["PROVIDER_URL"]), address, int(from_block), int(block_number))
+    timestamp = int(time.time())
+    for user in users:
+        index.portfolio(user, timestamp).report()
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,45 @@
+import asyncio
+from abc import ABC, abstractmethod
+
+from scripts.retroactive.events import log_position
+
+
+class LogIndex(ABC):
+    """State folded from one contract's logs, fetched incrementally.
+
+    Subclasses list the event topics they need in `topics` and apply one
+    decoded log at a time in `apply_log`. `block_number` is the last block
+    whose logs have all been applied, and indexing continues after it.
+    """
+
+    topics = []
+
+    def __init__(self):
+        self.block_number = None
+
+    @abstractmethod
+    def apply_log(self, log):
+        """Folds one decoded log into the index."""
+
+    def apply_logs(self, logs, block_number=None):
+        """Applies logs in chain order. `block_number` marks every block up to
+        it as indexed, even when the last blocks had no logs."""
+        for log in sorted(logs, key=log_position):
+            self.apply_log(log)
+        if block_number is not None:
+            self.block_number = block_number
+
+    def index(self, fetcher, address, from_block, to_block):
+        """Fetches and applies the logs of the contract at `address` up to
+        `to_block`, continuing after the last indexed block."""
+        if self.block_number is not None:
+            from_block = self.block_number + 1
+        if from_block > to_block:
+            return
+
+        async def run():
+            log_filter = {"address": address, "topics": [self.topics]}
+            async for block_number, logs in fetcher.batches(log_filter, from_block, to_block):
+                self.apply_logs(logs, block_number)
+
+        asyncio.run(run())
@@ -0,0 +1,254 @@
+import os
+import sys
+
+from eth_utils import to_checksum_address
+
+from scripts.indexer.events import (
+    LATE_QUORUM_VOTE_EXTENSION_SET_TOPIC,
+    PROPOSAL_CANCELED_TOPIC,
+    PROPOSAL_CREATED_TOPIC,
+    PROPOSAL_EXECUTED_TOPIC,
+    PROPOSAL_EXTENDED_TOPIC,
+    PROPOSAL_QUEUED_TOPIC,
+    QUORUM_NUMERATOR_UPDATED_TOPIC,
+    VOTE_CAST_TOPIC,
+    VOTE_CAST_WITH_PARAMS_TOPIC,
+    decode_proposal_created,
+    decode_vote_cast,
+)
+from scripts.indexer.log_index import LogIndex
+from scripts.indexer.votes import VotingPowerIndex
+from scripts.retroactive.events import data_words, log_block, log_topic, topic_int
+from scripts.retroactive.logs import LogFetcher
+
+PROPOSAL_STATES = [
+    "Pending",
+    "Active",
+    "Canceled",
+    "Defeated",
+    "Succeeded",
+    "Queued",
+    "Expired",
+    "Executed",
+]
+PENDING, ACTIVE, CANCELED, DEFEATED, SUCCEEDED, QUEUED, EXPIRED, EXECUTED = range(len(PROPOSAL_STATES))
+# GovernorCompatibilityBravo VoteType
+AGAINST, FOR, ABSTAIN = range(3)
+
+# Governance constructor settings
+QUORUM_NUMERATOR = 20
+QUORUM_DENOMINATOR = 100
+LATE_QUORUM_VOTE_EXTENSION = 7208
+
+
+class TrackedProposal:
+    """A proposal's creation details, vote tallies and lifecycle blocks."""
+
+    def __init__(self, created):
+        self.id = created.proposal_id
+        self.proposer = created.proposer
+        self.targets = created.targets
+        self.values = created.values
+        self.signatures = created.signatures
+        self.calldatas = created.calldatas
+        self.description = created.description
+        self.created_block = created.block_number
+        self.snapshot = created.start_block
+        self.vote_end = created.end_block
+        # Set once by the first vote that reaches quorum, like
+        # GovernorPreventLateQuorum._extendedDeadlines
+        self.extended_deadline = None
+        self.votes = [0, 0, 0]
+        self.receipts = {}
+        self.eta = None
+        self.queued_block = None
+        self.executed_block = None
+        self.canceled_block = None
+
+    @property
+    def against_votes(self):
+        return self.votes[AGAINST]
+
+    @property
+    def for_votes(self):
+        return self.votes[FOR]
+
+    @property
+    def abstain_votes(self):
+        return self.votes[ABSTAIN]
+
+    @property
+    def deadline(self):
+        """proposalDeadline, including any late quorum extension."""
+        return max(self.vote_end, self.extended_deadline or 0)
+
+
+class ProposalTracker(LogIndex):
+    """Governance proposal states rebuilt from the governor's logs.
+
+    Logs are ingested incrementally from the last indexed block. Tallies
+    follow GovernorCompatibilityBravo, where only for votes count toward
+    quorum and a proposal passes with more for than against votes. The late
+    quorum extension is applied the way GovernorPreventLateQuorum does: the
+    first vote to reach quorum pushes the deadline to its block plus the
+    vote extension. Quorum needs the staking contract's past total supply,
+    which comes from `voting_power`, a VotingPowerIndex kept up to date
+    alongside the tracker.
+
+    Timelock operations are only seen through the governor's own events, so
+    a queued proposal cancelled directly on the timelock stays Queued.
+    """
+
+    topics = [
+        PROPOSAL_CREATED_TOPIC,
+        VOTE_CAST_TOPIC,
+        VOTE_CAST_WITH_PARAMS_TOPIC,
+        PROPOSAL_QUEUED_TOPIC,
+        PROPOSAL_EXECUTED_TOPIC,
+        PROPOSAL_CANCELED_TOPIC,
+        PROPOSAL_EXTENDED_TOPIC,
+        QUORUM_NUMERATOR_UPDATED_TOPIC,
+        LATE_QUORUM_VOTE_EXTENSION_SET_TOPIC,
+    ]
+
+    def __init__(
+        self,
+        voting_power,
+        quorum_numerator=QUORUM_NUMERATOR,
+        late_quorum_vote_extension=LATE_QUORUM_VOTE_EXTENSION,
+    ):
+        super().__init__()
+        self.voting_power = voting_power
+        self.quorum_numerator = quorum_numerator
+        self.late_quorum_vote_extension = late_quorum_vote_extension
+        self.proposals = {}
+
+    def __len__(self):
+        return len(self.proposals)
+
+    def __contains__(self, proposal_id):
+        return proposal_id in self.proposals
+
+    def apply_log(self, log):
+        topic = log_topic(log)
+        if topic == PROPOSAL_CREATED_TOPIC:
+            created = decode_proposal_created(log)
+            self.proposals[created.proposal_id] = TrackedProposal(created)
+        elif topic in (VOTE_CAST_TOPIC, VOTE_CAST_WITH_PARAMS_TOPIC):
+            self._count_vote(decode_vote_cast(log))
+        elif topic == PROPOSAL_QUEUED_TOPIC:
+            proposal_id, eta = data_words(log)[:2]
+            proposal = self.proposals[proposal_id]
+            proposal.queued_block, proposal.eta = log_block(log), eta
+        elif topic == PROPOSAL_EXECUTED_TOPIC:
+            self.proposals[data_words(log)[0]].executed_block = log_block(log)
+        elif topic == PROPOSAL_CANCELED_TOPIC:
+            self.proposals[data_words(log)[0]].canceled_block = log_block(log)
+        elif topic == PROPOSAL_EXTENDED_TOPIC:
+            # Already derived from the votes, kept in case a vote was missed
+            self.proposals[topic_int(log, 1)].extended_deadline = data_words(log)[0]
+        elif topic == QUORUM_NUMERATOR_UPDATED_TOPIC:
+            self.quorum_numerator = data_words(log)[1]
+        elif topic == LATE_QUORUM_VOTE_EXTENSION_SET_TOPIC:
+            self.late_quorum_vote_extension = data_words(log)[1]
+
+    def _count_vote(self, vote):
+        proposal = self.proposals[vote.proposal_id]
+        proposal.votes[vote.support] += vote.weight
+        proposal.receipts[vote.voter] = (vote.support, vote.weight)
+        if proposal.extended_deadline is None and self.quorum_reached(vote.proposal_id):
+            proposal.extended_deadline = vote.block_number + self.late_quorum_vote_extension
+
+    def proposal(self, proposal_id):
+        if proposal_id not in self.proposals:
+            raise KeyError("Governor: unknown proposal id")
+        return self.proposals[proposal_id]
+
+    def quorum(self, proposal_id):
+        """Quorum at the proposal's snapshot block."""
+        snapshot = self.proposal(proposal_id).snapshot
+        return self.voting_power.get_past_total_supply(snapshot) * self.quorum_numerator // QUORUM_DENOMINATOR
+
+    def quorum_reached(self, proposal_id):
+        return self.quorum(proposal_id) <= self.proposal(proposal_id).for_votes
+
+    def vote_succeeded(self, proposal_id):
+        proposal = self.proposal(proposal_id)
+        return proposal.for_votes > proposal.against_votes
+
+    def state(self, proposal_id, block_number=None):
+        """Governance.state as seen by a call in `block_number`, by default
+        the last indexed block."""
+        block_number = self.block_number if block_number is None else block_number
+        proposal = self.proposal(proposal_id)
+        if proposal.executed_block is not None and proposal.executed_block <= block_number:
+            return EXECUTED
+        if proposal.canceled_block is not None and proposal.canceled_block <= block_number:
+            return CANCELED
+        if proposal.snapshot >= block_number:
+            return PENDING
+        if proposal.deadline >= block_number:
+            return ACTIVE
+        if not (self.quorum_reached(proposal_id) and self.vote_succeeded(proposal_id)):
+            return DEFEATED
+        if proposal.queued_block is not None and proposal.queued_block <= block_number:
+            return QUEUED
+        return SUCCEEDED
+
+    def get_receipt(self, proposal_id, voter):
+        """(has voted, support, votes) like the Bravo getReceipt."""
+        receipt = self.proposal(proposal_id).receipts.get(to_checksum_address(voter))
+        return (True,) + receipt if receipt else (False, 0, 0)
+
+    def by_state(self, state, block_number=None):
+        """Ids of the proposals in `state` at `block_number`, newest first."""
+        return [
+            proposal.id
+            for proposal in sorted(self.proposals.values(), key=lambda proposal: -proposal.created_block)
+            if self.state(proposal.id, block_number) == state
+        ]
+
+    def summary(self, proposal_id, block_number=None):
+        """Everything the governance page shows for a proposal, as JSON
+        serialisable values."""
+        proposal = self.proposal(proposal_id)
+        return {
+            "id": str(proposal.id),
+            "proposer": proposal.proposer,
+            "description": proposal.description,
+            "state": PROPOSAL_STATES[self.state(proposal_id, block_number)],
+            "forVotes": str(proposal.for_votes),
+            "againstVotes": str(proposal.against_votes),
+            "abstainVotes": str(proposal.abstain_votes),
+            "quorum": str(self.quorum(proposal_id)),
+            "voters": len(proposal.receipts),
+            "startBlock": proposal.snapshot,
+            "endBlock": proposal.deadline,
+            "eta": proposal.eta,
+        }
+
+
+# Prints the state and tallies of every proposal, run with
+# `python -m scripts.indexer.proposals <governance> <staking> <deploy block> <block>`
+def main(governance, staking, from_block, block_number):
+    fetcher = LogFetcher(os.environ["PROVIDER_URL"])
+    voting_power = VotingPowerIndex()
+    voting_power.index(fetcher, staking, int(from_block), int(block_number))
+    tracker = ProposalTracker(voting_power)
+    tracker.index(fetcher, governance, int(from_block), int(block_number))
+    for proposal in sorted(tracker.proposals.values(), key=lambda proposal: proposal.created_block):
+        summary = tracker.summary(proposal.id)
+        print(
+            "{}\t{}\tfor {}\tagainst {}\tquorum {}\t{}".format(
+                summary["id"][:10],
+                summary["state"],
+                summary["forVotes"],
+                summary["againstVotes"],
+                summary["quorum"],
+                summary["description"].splitlines()[0] if summary["description"] else "",
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,101 @@
+import heapq
+import os
+import sys
+from array import array
+from bisect import bisect_right
+
+from eth_utils import to_checksum_address
+
+from scripts.indexer.events import (
+    DELEGATE_CHANGED_TOPIC,
+    DELEGATE_VOTES_CHANGED_TOPIC,
+    STAKE_TOPIC,
+    UNSTAKE_TOPIC,
+    decode_delegate_changed,
+    decode_delegate_votes_changed,
+    decode_lockup,
+)
+from scripts.indexer.log_index import LogIndex
+from scripts.retroactive.contracts import ZERO_ADDRESS
+from scripts.retroactive.events import log_topic
+from scripts.retroactive.history import TokenHistory
+from scripts.retroactive.logs import LogFetcher
+
+
+class VotingPowerIndex(LogIndex):
+    """veOGV voting power checkpoints rebuilt from staking contract logs.
+
+    DelegateVotesChanged carries each delegate's new vote count, which is
+    kept as a per-delegate TokenHistory column. Total supply only changes
+    when points are minted or burnt, so it is rebuilt from the points of
+    Stake (+) and Unstake (-) logs. Lookups are binary searches over those
+    columns and answer like ERC20Votes.getPastVotes and getPastTotalSupply,
+    without an eth_call per address and block.
+    """
+
+    topics = [STAKE_TOPIC, UNSTAKE_TOPIC, DELEGATE_CHANGED_TOPIC, DELEGATE_VOTES_CHANGED_TOPIC]
+
+    def __init__(self):
+        super().__init__()
+        self.votes = TokenHistory()
+        self.delegations = {}
+        self.supply_blocks = array("Q")
+        self.supply = []
+
+    def _record_supply(self, block_number, delta):
+        total = (self.supply[-1] if self.supply else 0) + delta
+        if self.supply_blocks and self.supply_blocks[-1] == block_number:
+            self.supply[-1] = total
+        else:
+            self.supply_blocks.append(block_number)
+            self.supply.append(total)
+
+    def apply_log(self, log):
+        topic = log_topic(log)
+        if topic == STAKE_TOPIC:
+            event = decode_lockup(log)
+            self._record_supply(event.block_number, event.points)
+        elif topic == UNSTAKE_TOPIC:
+            event = decode_lockup(log)
+            self._record_supply(event.block_number, -event.points)
+        elif topic == DELEGATE_CHANGED_TOPIC:
+            event = decode_delegate_changed(log)
+            self.delegations[event.delegator] = event.to_delegate
+        elif topic == DELEGATE_VOTES_CHANGED_TOPIC:
+            event = decode_delegate_votes_changed(log)
+            current = self.votes.balance(event.delegate)
+            self.votes.record(event.delegate, event.block_number, event.new_balance - current)
+
+    def get_past_votes(self, account, block_number):
+        return self.votes.balance_at(to_checksum_address(account), block_number)
+
+    def get_past_total_supply(self, block_number):
+        index = bisect_right(self.supply_blocks, block_number)
+        return self.supply[index - 1] if index else 0
+
+    def delegates(self, account):
+        """Current delegate of `account`, the zero address when none is set."""
+        return self.delegations.get(to_checksum_address(account), ZERO_ADDRESS)
+
+    def top_delegates(self, block_number, n=10):
+        """The `n` delegates with the most votes at `block_number` as
+        (delegate, votes), most votes first."""
+        votes = (
+            (address, self.votes.balance_at(address, block_number)) for address in self.votes.addresses
+        )
+        return heapq.nlargest(n, (entry for entry in votes if entry[1] > 0), key=lambda entry: entry[1])
+
+
+# Prints the top delegates of a staking contract at a block, run with
+# `python -m scripts.indexer.votes <staking address> <deploy block> <block> [count]`
+def main(address, from_block, block_number, count=10):
+    index = VotingPowerIndex()
+    index.index(LogFetcher(os.environ["PROVIDER_URL"]), address, int(from_block), int(block_number))
+    total = index.get_past_total_supply(int(block_number))
+    print("Total supply {}".format(total))
+    for delegate, votes in index.top_delegates(int(block_number), int(count)):
+        print("{}\t{}\t{:.2%}".format(delegate, votes, votes / total if total else 0))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
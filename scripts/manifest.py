@@ -0,0 +1,91 @@
+import json
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+from eth_utils import to_checksum_address
+
+BUILD_PATH = "build"
+
+Deployment = namedtuple("Deployment", ["chain_id", "name", "address"])
+
+
+@lru_cache(maxsize=None)
+def _read_map(build_path):
+    path = os.path.join(build_path, "deployments", "map.json")
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class DeploymentManifest:
+    """Addresses and ABIs of the contracts brownie deployed to one chain.
+
+    Reads build/deployments/map.json, where every contract name maps to its
+    deployed addresses with the latest first. ABIs are read from the
+    per-address artifacts the first time they are asked for and kept, so
+    scripts that look at the same contracts don't reload any file.
+    """
+
+    def __init__(self, chain_id, build_path=BUILD_PATH):
+        self.chain_id = int(chain_id)
+        self.build_path = build_path
+        self._addresses = {
+            name: [to_checksum_address(address) for address in addresses]
+            for name, addresses in _read_map(build_path).get(str(self.chain_id), {}).items()
+        }
+        self._names = {
+            address: name for name, addresses in self._addresses.items() for address in addresses
+        }
+        self._abis = {}
+
+    def __bool__(self):
+        return bool(self._addresses)
+
+    def __contains__(self, name):
+        return name in self._addresses
+
+    def __iter__(self):
+        return iter(self.latest())
+
+    def names(self):
+        return sorted(self._addresses)
+
+    def addresses(self, name):
+        """Every address `name` was deployed to, latest first."""
+        return list(self._addresses.get(name, []))
+
+    def address(self, name):
+        """Latest address of `name`."""
+        if name not in self._addresses:
+            raise KeyError("{} is not deployed on chain {}".format(name, self.chain_id))
+        return self._addresses[name][0]
+
+    def name(self, address):
+        return self._names[to_checksum_address(address)]
+
+    def deployment(self, name):
+        return Deployment(self.chain_id, name, self.address(name))
+
+    def latest(self):
+        """The latest Deployment of every contract."""
+        return [self.deployment(name) for name in self.names()]
+
+    def abi(self, name_or_address):
+        """ABI of a deployment, by contract name (latest) or address."""
+        if name_or_address.startswith("0x"):
+            address = to_checksum_address(name_or_address)
+        else:
+            address = self.address(name_or_address)
+        if address not in self._abis:
+            path = os.path.join(self.build_path, "deployments", str(self.chain_id), address + ".json")
+            with open(path, encoding="utf-8") as f:
+                self._abis[address] = json.load(f)["abi"]
+        return self._abis[address]
+
+
+@lru_cache(maxsize=None)
+def load_manifest(chain_id, build_path=BUILD_PATH):
+    """The DeploymentManifest of `chain_id`, shared by every caller."""
+    return DeploymentManifest(chain_id, build_path)
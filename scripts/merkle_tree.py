@@ -0,0 +1,193 @@
+import json
+import os
+
+from eth_utils import keccak
+
+# Size in bytes of every node in the tree
+NODE_SIZE = 32
+
+PREFIXES = ["mandatory_lockup", "optional_lockup"]
+
+
+def parse_amount(amount):
+    """Converts an amount as found in the accounts files to an int.
+
+    Amounts are usually serialised ethers BigNumbers ({"type": "BigNumber",
+    "hex": "0x.."}) but plain hex strings and ints are accepted as well.
+    """
+    if isinstance(amount, dict):
+        amount = amount["hex"]
+    if isinstance(amount, str):
+        return int(amount, 16) if amount.startswith("0x") else int(amount)
+    return int(amount)
+
+
+def format_amount(amount):
+    """Serialises an int like an ethers BigNumber, the inverse of parse_amount."""
+    digits = "{:x}".format(amount)
+    return {"type": "BigNumber", "hex": "0x" + "0" * (len(digits) % 2) + digits}
+
+
+def leaf_hash(index, account, amount):
+    """keccak256(abi.encodePacked(index, account, amount)), the leaf checked by
+    AbstractLockupDistributor.isProofValid."""
+    return keccak(
+        index.to_bytes(32, "big") + bytes.fromhex(account[2:]) + amount.to_bytes(32, "big")
+    )
+
+
+def hash_pair(left, right):
+    # OpenZeppelin's MerkleProof sorts every pair before hashing
+    return keccak(left + right) if left <= right else keccak(right + left)
+
+
+def verify_proof(proof, root, leaf):
+    """Off-chain equivalent of OpenZeppelin's MerkleProof.verify."""
+    node = leaf
+    for sibling in proof:
+        node = hash_pair(node, sibling)
+    return node == root
+
+
+class MerkleTree:
+    """Merkle tree with sorted pairs, matching merkletreejs with `sortPairs: true`.
+
+    Every level is stored as one contiguous bytes object holding 32 byte
+    nodes, so memory use is roughly 64 bytes per leaf. A node without a
+    sibling is promoted to the next level unchanged.
+    """
+
+    def __init__(self, leaves):
+        leaves = bytes(leaves)
+        if not leaves or len(leaves) % NODE_SIZE:
+            raise ValueError("Leaves must be a non-empty sequence of 32 byte hashes")
+
+        self.levels = [leaves]
+        level = leaves
+        while len(level) > NODE_SIZE:
+            parent = bytearray()
+            for offset in range(0, len(level), 2 * NODE_SIZE):
+                left = level[offset : offset + NODE_SIZE]
+                right = level[offset + NODE_SIZE : offset + 2 * NODE_SIZE]
+                parent += hash_pair(left, right) if right else left
+            level = bytes(parent)
+            self.levels.append(level)
+
+    @classmethod
+    def from_claims(cls, claims):
+        """Builds the tree from (index, account, amount) tuples, hashing each leaf once."""
+        leaves = bytearray()
+        for index, account, amount in claims:
+            leaves += leaf_hash(index, account, amount)
+        return cls(leaves)
+
+    def __len__(self):
+        return len(self.levels[0]) // NODE_SIZE
+
+    @property
+    def root(self):
+        return self.levels[-1]
+
+    def leaf(self, index):
+        return self.levels[0][index * NODE_SIZE : (index + 1) * NODE_SIZE]
+
+    def proof(self, index):
+        """Returns the sibling hashes from the leaf at `index` up to the root."""
+        if not 0 <= index < len(self):
+            raise IndexError("Leaf index {} out of range".format(index))
+        proof = []
+        for level in self.levels[:-1]:
+            sibling = (index ^ 1) * NODE_SIZE
+            if sibling < len(level):
+                proof.append(level[sibling : sibling + NODE_SIZE])
+            index //= 2
+        return proof
+
+    def hex_proof(self, index):
+        return ["0x" + node.hex() for node in self.proof(index)]
+
+
+def _items(accounts):
+    return accounts.items() if hasattr(accounts, "items") else accounts
+
+
+def iter_accounts(path):
+    """Yields (address, data) from an accounts file in file order.
+
+    Files written one account per line, like scripts.retroactive.outputs
+    does, are read a line at a time. Anything else is loaded whole.
+    """
+    with open(path, encoding="utf-8") as f:
+        first = _account_line(f.readline()) if f.readline() == "{\n" else None
+        if first is None:
+            f.seek(0)
+            yield from json.load(f).items()
+            return
+        yield first
+        for line in f:
+            if line.strip() == "}":
+                return
+            yield _account_line(line)
+
+
+def _account_line(line):
+    # `"0x..": {...},` as one line, or None for a line holding anything else
+    try:
+        (item,) = json.loads("{" + line.strip().rstrip(",") + "}").items()
+    except ValueError:
+        return None
+    return item if isinstance(item[1], dict) else None
+
+
+def build_tree(accounts):
+    """Builds the tree for an accounts mapping of address -> {"amount": ..},
+    or an iterable of (address, data) pairs.
+
+    Leaf indexes follow the order of the mapping, like generate-merkle-tree.ts.
+    """
+    return MerkleTree.from_claims(
+        (index, account, parse_amount(data["amount"]))
+        for index, (account, data) in enumerate(_items(accounts))
+    )
+
+
+def write_claims(path, accounts, tree):
+    """Streams the claims file one account at a time instead of building the
+    whole document in memory first."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{\n  "merkleRoot": "0x%s",\n  "claims": {' % tree.root.hex())
+        for index, (account, data) in enumerate(_items(accounts)):
+            claim = {"index": index, "amount": data["amount"]}
+            if "split" in data:
+                claim["split"] = data["split"]
+            claim["proof"] = tree.hex_proof(index)
+            f.write("%s\n    %s: %s" % ("," if index else "", json.dumps(account), json.dumps(claim)))
+        f.write("\n  }\n}\n")
+
+
+def generate(accounts_file, claims_file):
+    # Two passes over the file, so only the tree is held in memory
+    tree = build_tree(iter_accounts(accounts_file))
+    write_claims(claims_file, iter_accounts(accounts_file), tree)
+    return tree
+
+
+# Python replacement for generate-merkle-tree.ts, run with
+# `CHAIN_ID=1 python -m scripts.merkle_tree`
+def main(chain_id=None):
+    chain_id = chain_id or os.environ.get("CHAIN_ID")
+    if not chain_id:
+        raise ValueError("Set CHAIN_ID environment variable")
+
+    for prefix in PREFIXES:
+        data_dir = "./scripts/{}_data".format(chain_id)
+        accounts_file = "{}/{}_accounts.json".format(data_dir, prefix)
+        if not os.path.exists(accounts_file):
+            print("No {} accounts for chain {}, skipping".format(prefix, chain_id))
+            continue
+        tree = generate(accounts_file, "{}/{}_claims.json".format(data_dir, prefix))
+        print("{}: {} claims, merkle root 0x{}".format(prefix, len(tree), tree.root.hex()))
+
+
+if __name__ == "__main__":
+    main()
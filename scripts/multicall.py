@@ -0,0 +1,187 @@
+import itertools
+import json
+import os
+import sys
+import urllib.request
+from collections import namedtuple
+
+from eth_utils import to_checksum_address
+
+from scripts.proposal_builder import abi_functions, argument_types, encode_arguments, load_abi, selector
+from scripts.retroactive.logs import RpcError
+
+try:
+    from eth_abi import decode, encode
+except ImportError:  # eth-abi < 4
+    from eth_abi import decode_abi as decode
+    from eth_abi import encode_abi as encode
+
+# Deployed at the same address on mainnet and most other chains
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+AGGREGATE3_SIGNATURE = "aggregate3((address,bool,bytes)[])"
+AGGREGATE3_RESULT_TYPES = ["(bool,bytes)[]"]
+BATCH_SIZE = 500
+
+Read = namedtuple("Read", ["target", "signature", "args", "output_types", "allow_failure"])
+
+
+class JsonRpc:
+    """Blocking JSON-RPC client with just what the batched readers need."""
+
+    def __init__(self, provider_url, timeout=60):
+        self.provider_url = provider_url
+        self.timeout = timeout
+        self.requests = 0
+        self._ids = itertools.count(1)
+
+    def _post(self, payload):
+        request = urllib.request.Request(
+            self.provider_url,
+            data=json.dumps(payload).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.load(response)
+
+    def _payload(self, method, params):
+        return {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+
+    def request(self, method, params):
+        self.requests += 1
+        return _result(self._post(self._payload(method, params)))
+
+    def batch(self, calls):
+        """Sends (method, params) calls as one JSON-RPC batch and returns
+        their results in order."""
+        self.requests += 1
+        payload = [self._payload(method, params) for method, params in calls]
+        responses = {response["id"]: response for response in self._post(payload)}
+        return [_result(responses[call["id"]]) for call in payload]
+
+    def block_number(self):
+        return int(self.request("eth_blockNumber", []), 16)
+
+    def eth_call(self, tx, block_number):
+        return bytes.fromhex(self.request("eth_call", [tx, hex(block_number)])[2:])
+
+
+def _result(body):
+    if "error" in body:
+        raise RpcError(body["error"].get("code"), body["error"].get("message"))
+    return body["result"]
+
+
+def split_signature(function):
+    """Splits `name(inputs)(outputs)` into the call signature and its output
+    types. Outputs are None when the signature doesn't give them."""
+    depth = 0
+    for i, char in enumerate(function):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0 and i + 1 < len(function):
+                return function[: i + 1], argument_types(function[i + 1 :])
+    return function, None
+
+
+class MulticallReader:
+    """Reads contract state in Multicall3 aggregate3 batches.
+
+    Every read runs against `block_number`, so a snapshot of many contracts
+    and holders is consistent even while the chain moves on. Reads are
+    queued with `read` and sent `batch_size` at a time by `execute`.
+
+    Output types come from the signature when it is written like
+    `balanceOf(address)(uint256)`, otherwise from the target's ABI: a
+    brownie Contract's own, or the build artifacts found by load_abi. ABIs
+    are only turned into function tables once per target.
+
+    `eth_call` takes a transaction dict and a block number and returns the
+    raw result, e.g. JsonRpc.eth_call, or web3.eth.call from brownie.
+    """
+
+    def __init__(self, eth_call, block_number, batch_size=BATCH_SIZE, multicall=MULTICALL3_ADDRESS):
+        self.eth_call = eth_call
+        self.block_number = block_number
+        self.batch_size = batch_size
+        self.multicall = to_checksum_address(multicall)
+        self.calls = 0
+        self._functions = {}
+        self._pending = []
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _function(self, target, address, function, abi):
+        signature, output_types = split_signature(function)
+        if output_types is not None:
+            return signature, output_types
+        functions = self._functions.get(address)
+        if functions is None:
+            if abi is None:
+                abi = getattr(target, "abi", None) or load_abi(address)
+            functions = self._functions[address] = abi_functions(abi)
+        if function not in functions:
+            raise ValueError("{} has no function {}".format(address, function))
+        if "(" in function:
+            return function, functions[function]
+        return functions[function]
+
+    def read(self, target, function, *args, abi=None, allow_failure=False):
+        """Queues a call of `function` on `target`. Returns the position of
+        its result in the list `execute` returns."""
+        address = to_checksum_address(getattr(target, "address", target))
+        signature, output_types = self._function(target, address, function, abi)
+        self._pending.append(Read(address, signature, args, output_types, allow_failure))
+        return len(self._pending) - 1
+
+    def read_many(self, target, function, args_list, abi=None, allow_failure=False):
+        """Queues `function` on `target` once for every argument tuple."""
+        return [self.read(target, function, *args, abi=abi, allow_failure=allow_failure) for args in args_list]
+
+    def call_batch(self, reads):
+        """Results of `reads` from a single aggregate3 call."""
+        calls = [
+            (read.target, True, selector(read.signature) + encode_arguments(read.signature, read.args))
+            for read in reads
+        ]
+        data = selector(AGGREGATE3_SIGNATURE) + encode(["(address,bool,bytes)[]"], [calls])
+        self.calls += 1
+        returned = self.eth_call({"to": self.multicall, "data": "0x" + data.hex()}, self.block_number)
+        (results,) = decode(AGGREGATE3_RESULT_TYPES, bytes(returned))
+        return [_decode_result(read, success, output) for read, (success, output) in zip(reads, results)]
+
+    def batches(self, reads=None):
+        reads = self._pending if reads is None else reads
+        return [reads[i : i + self.batch_size] for i in range(0, len(reads), self.batch_size)]
+
+    def execute(self):
+        """Sends every queued read and returns their results in order."""
+        reads, self._pending = self._pending, []
+        return [result for batch in self.batches(reads) for result in self.call_batch(batch)]
+
+
+def _decode_result(read, success, output):
+    # A call to an address without code succeeds with no data
+    if success and (output or not read.output_types):
+        values = decode(list(read.output_types), output)
+        return values[0] if len(values) == 1 else tuple(values)
+    if read.allow_failure:
+        return None
+    raise ValueError("{} on {} reverted".format(read.signature, read.target))
+
+
+# Prints the balances of holders at a block, run with
+# `python -m scripts.multicall <token> <block> <holder> ...`
+def main(token, block_number, *holders):
+    rpc = JsonRpc(os.environ["PROVIDER_URL"])
+    reader = MulticallReader(rpc.eth_call, int(block_number))
+    reader.read_many(token, "balanceOf(address)(uint256)", [(holder,) for holder in holders])
+    for holder, balance in zip(holders, reader.execute()):
+        print("{}\t{}".format(holder, balance))
+    print("{} reads in {} RPC calls".format(len(holders), rpc.requests))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
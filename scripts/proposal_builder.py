@@ -0,0 +1,210 @@
+import glob
+import json
+import os
+import sys
+from collections import namedtuple
+from functools import lru_cache
+
+from eth_utils import keccak, to_checksum_address
+
+try:
+    from eth_abi import encode
+except ImportError:  # eth-abi < 4
+    from eth_abi import encode_abi as encode
+
+BUILD_PATH = "build"
+PROPOSE_SIGNATURE = "propose(address[],uint256[],string[],bytes[],string)"
+PROPOSE_TYPES = ["address[]", "uint256[]", "string[]", "bytes[]", "string"]
+
+Proposal = namedtuple(
+    "Proposal",
+    ["targets", "values", "signatures", "calldatas", "description", "proposal_id", "data"],
+)
+
+
+@lru_cache(maxsize=None)
+def selector(signature):
+    """First four bytes of keccak256 of a function signature."""
+    return keccak(text=signature)[:4]
+
+
+@lru_cache(maxsize=None)
+def argument_types(signature):
+    """Splits `name(type1,type2,...)` into its top level argument types."""
+    inner = signature[signature.index("(") + 1 : signature.rindex(")")]
+    types, depth, start = [], 0, 0
+    for i, char in enumerate(inner):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            types.append(inner[start:i])
+            start = i + 1
+    if inner:
+        types.append(inner[start:])
+    return tuple(types)
+
+
+def _canonical_type(param):
+    if param["type"].startswith("tuple"):
+        components = ",".join(_canonical_type(component) for component in param["components"])
+        return "({}){}".format(components, param["type"][len("tuple") :])
+    return param["type"]
+
+
+def abi_signatures(abi):
+    """Signatures of every function in `abi`."""
+    return {
+        "{}({})".format(item["name"], ",".join(_canonical_type(param) for param in item["inputs"]))
+        for item in abi
+        if item.get("type") == "function"
+    }
+
+
+def abi_functions(abi):
+    """{signature: output types} of every function in `abi`. Functions that
+    aren't overloaded can also be looked up by name, which gives
+    (signature, output types)."""
+    functions, names = {}, {}
+    for item in abi:
+        if item.get("type") != "function":
+            continue
+        signature = "{}({})".format(item["name"], ",".join(_canonical_type(param) for param in item["inputs"]))
+        functions[signature] = tuple(_canonical_type(param) for param in item.get("outputs", []))
+        names.setdefault(item["name"], []).append(signature)
+    for name, signatures in names.items():
+        if len(signatures) == 1:
+            functions[name] = (signatures[0], functions[signatures[0]])
+    return functions
+
+
+@lru_cache(maxsize=None)
+def load_abi(name_or_address, build_path=BUILD_PATH):
+    """ABI of a compiled contract or interface by name, or of a deployed
+    contract by address, read from brownie's build artifacts."""
+    if name_or_address.startswith("0x"):
+        address = to_checksum_address(name_or_address)
+        paths = glob.glob(os.path.join(build_path, "deployments", "*", address + ".json"))
+    else:
+        paths = [
+            os.path.join(build_path, folder, name_or_address + ".json")
+            for folder in ("contracts", "interfaces")
+        ]
+    for path in paths:
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)["abi"]
+    raise LookupError("No build artifact found for {}".format(name_or_address))
+
+
+def _normalize(abi_type, value):
+    # Accepts the loosely typed values deployment scripts pass to brownie,
+    # e.g. BLOCKS_PER_DAY * 2 is a float
+    if abi_type.endswith("]"):
+        item_type = abi_type[: abi_type.rindex("[")]
+        return [_normalize(item_type, item) for item in value]
+    if abi_type.startswith(("uint", "int")):
+        if isinstance(value, float) and not value.is_integer():
+            raise ValueError("{} is not a whole number".format(value))
+        return int(value)
+    if abi_type == "address":
+        return to_checksum_address(getattr(value, "address", value))
+    if abi_type.startswith("bytes"):
+        if isinstance(value, str) and value.startswith(("0x", "0X")):
+            digits = value[2:]
+            value = bytes.fromhex("0" * (len(digits) % 2) + digits)
+        # Like brownie, a short bytesN value is padded as a number
+        if abi_type != "bytes" and isinstance(value, bytes):
+            value = value.rjust(int(abi_type[len("bytes") :]), b"\0")
+    return value
+
+
+def encode_arguments(signature, args):
+    """ABI encoded arguments of a call to `signature`, without the selector."""
+    types = argument_types(signature)
+    if len(types) != len(args):
+        raise ValueError("{} takes {} arguments, got {}".format(signature, len(types), len(args)))
+    return encode(list(types), [_normalize(abi_type, arg) for abi_type, arg in zip(types, args)])
+
+
+def hash_proposal(targets, values, calldatas, description):
+    """Governor.hashProposal, the id a proposal gets on chain. `calldatas` must
+    include the function selectors."""
+    encoded = encode(
+        ["address[]", "uint256[]", "bytes[]", "bytes32"],
+        [targets, values, calldatas, keccak(text=description)],
+    )
+    return int.from_bytes(keccak(encoded), "big")
+
+
+class ProposalBuilder:
+    """Encodes governance proposals offline.
+
+    Signatures are checked against each target's ABI when the target carries
+    one (brownie Contract objects do). The set of known signatures is built
+    once per target address and selectors are cached per signature, so a
+    proposal with many actions costs one pass over them and no explorer
+    lookups. Actions use the `{contract, signature, args}` format returned by
+    the deploy_00x scripts.
+    """
+
+    def __init__(self):
+        self._signatures = {}
+
+    def _check_signature(self, contract, address, signature):
+        abi = getattr(contract, "abi", None)
+        if abi is None:
+            return
+        known = self._signatures.get(address)
+        if known is None:
+            known = self._signatures[address] = abi_signatures(abi)
+        if signature not in known:
+            raise ValueError("{} has no function {}".format(address, signature))
+
+    def build(self, actions, description):
+        targets, values, signatures, calldatas, full_calldatas = [], [], [], [], []
+        for action in actions:
+            contract, signature = action["contract"], action["signature"]
+            address = to_checksum_address(getattr(contract, "address", contract))
+            self._check_signature(contract, address, signature)
+            calldata = encode_arguments(signature, action.get("args", []))
+            targets.append(address)
+            values.append(int(action.get("value", 0)))
+            signatures.append(signature)
+            # GovernorCompatibilityBravo takes the arguments and the signature
+            # separately and prepends the selector itself
+            calldatas.append(calldata)
+            full_calldatas.append(selector(signature) + calldata)
+
+        args = [targets, values, signatures, calldatas, description]
+        return Proposal(
+            targets,
+            values,
+            signatures,
+            calldatas,
+            description,
+            hash_proposal(targets, values, full_calldatas, description),
+            "0x" + (selector(PROPOSE_SIGNATURE) + encode(PROPOSE_TYPES, args)).hex(),
+        )
+
+
+_builder = ProposalBuilder()
+
+
+def build_proposal(actions, description):
+    return _builder.build(actions, description)
+
+
+# Encodes a proposal from a JSON list of {contract, signature, args} actions,
+# run with `python -m scripts.proposal_builder actions.json "Description"`
+def main(actions_file, description):
+    with open(actions_file, encoding="utf-8") as f:
+        actions = json.load(f)
+    proposal = build_proposal(actions, description)
+    print("Proposal ID: {}".format(proposal.proposal_id))
+    print("Data: {}".format(proposal.data))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
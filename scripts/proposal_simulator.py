@@ -0,0 +1,156 @@
+import importlib
+import os
+import time
+from collections import namedtuple
+
+from brownie import Contract, accounts, chain, web3
+
+from common import GOV_MULTISIG, GOVERNOR_FIVE, SECONDS_PER_BLOCK, advance_chain
+from scripts.indexer.proposals import PROPOSAL_STATES
+from scripts.proposal_builder import build_proposal, load_abi
+
+# ERC-1967 storage slots, read for every proposal target so upgrades show up
+# in the state diff without any per-contract configuration
+IMPLEMENTATION_SLOT = 0x360894A13BA1A3210667C828492DB98DCA3E2076CC3735A920A3CA505D382BBC
+ADMIN_SLOT = 0xB53127684A568B3173AE13B9F8A6016E243E63B6E8EE1178D6A717850B5D6103
+
+
+class SimulationResult(
+    namedtuple("SimulationResult", ["name", "proposal_id", "state", "gas", "diffs", "elapsed"])
+):
+    @property
+    def ok(self):
+        return self.state == "Executed"
+
+    def report(self):
+        print("{}: {} in {:.2f}s".format(self.name, self.state, self.elapsed))
+        print("Proposal ID: {}".format(self.proposal_id))
+        for step, gas_used in self.gas.items():
+            print("  {:<8} {:>10,} gas".format(step, gas_used))
+        for label, (before, after) in self.diffs.items():
+            print("  {}: {} -> {}".format(label, before, after))
+
+
+class ProposalSimulator:
+    """Runs proposals through propose, vote, queue and execute on a fork.
+
+    The fork is warmed once: the governor, its timelock and the proposer are
+    loaded and a snapshot is taken. Every simulation starts from that
+    snapshot and reverts to it afterwards, so candidates can be dry-run one
+    after another without restarting the node or refetching the state the
+    fork has already pulled from upstream. Voting and timelock delays are
+    skipped with a single advance_chain call each.
+
+    The snapshot is brownie's chain.snapshot, so reverting also rolls back
+    brownie's transaction history and time offset. Brownie only holds one
+    snapshot, so the simulator's replaces any snapshot the caller took.
+
+    `governor` is an address with a build artifact or a Contract.
+    `watch` takes (label, callable) pairs evaluated before and after each
+    proposal. Changed values are reported with the ERC-1967 implementation
+    and admin slots of every target.
+    """
+
+    def __init__(self, governor=GOVERNOR_FIVE, proposer=GOV_MULTISIG, voters=None):
+        started = time.perf_counter()
+        if isinstance(governor, str):
+            governor = Contract.from_abi("Governance", governor, load_abi(governor))
+        self.governor = governor
+        self.timelock = Contract.from_abi("Timelock", self.governor.timelock(), load_abi("Timelock"))
+        self.proposer = accounts.at(proposer, force=True)
+        self.voters = [accounts.at(voter, force=True) for voter in voters or [proposer]]
+        self.voting_delay = self.governor.votingDelay()
+        self.timelock_delay = self.timelock.getMinDelay()
+        chain.snapshot()
+        self.warmup = time.perf_counter() - started
+        print("Warmed fork at block {} in {:.2f}s".format(chain.height, self.warmup))
+
+    def restore(self):
+        """Reverts the fork to the warm snapshot."""
+        chain.revert()
+
+    def _state(self, targets, watch):
+        state = {}
+        for target in sorted(set(targets)):
+            state["{} implementation".format(target)] = web3.eth.get_storage_at(target, IMPLEMENTATION_SLOT).hex()
+            state["{} admin".format(target)] = web3.eth.get_storage_at(target, ADMIN_SLOT).hex()
+        for label, read in watch:
+            state[label] = read()
+        return state
+
+    def simulate(self, proposal, name=None, watch=(), keep=False):
+        """Takes a proposal from the proposal builder through to execution and
+        returns its SimulationResult. The fork is reverted to the warm
+        snapshot afterwards unless `keep` is set."""
+        started = time.perf_counter()
+        gas = {}
+        try:
+            before = self._state(proposal.targets, watch)
+            tx = self.governor.propose(
+                proposal.targets,
+                proposal.values,
+                proposal.signatures,
+                proposal.calldatas,
+                proposal.description,
+                {"from": self.proposer},
+            )
+            gas["propose"] = tx.gas_used
+            proposal_id = tx.events["ProposalCreated"]["proposalId"]
+            if proposal_id != proposal.proposal_id:
+                raise ValueError("Governor assigned id {}, expected {}".format(proposal_id, proposal.proposal_id))
+
+            advance_chain(self.voting_delay + 1, silent=True)
+            gas["vote"] = sum(
+                self.governor.castVote(proposal_id, 1, {"from": voter}).gas_used for voter in self.voters
+            )
+            # The late quorum extension can move the deadline, so read it back
+            blocks_left = self.governor.proposalDeadline(proposal_id) - chain.height
+            advance_chain(max(1, blocks_left + 1), silent=True)
+
+            gas["queue"] = self.governor.queue(proposal_id, {"from": self.proposer}).gas_used
+            advance_chain(max(1, self.timelock_delay // SECONDS_PER_BLOCK), self.timelock_delay + 1, silent=True)
+            gas["execute"] = self.governor.execute(proposal_id, {"from": self.proposer}).gas_used
+
+            after = self._state(proposal.targets, watch)
+            diffs = {label: (before[label], after[label]) for label in before if before[label] != after[label]}
+            state = PROPOSAL_STATES[self.governor.state(proposal_id)]
+        finally:
+            if not keep:
+                self.restore()
+
+        return SimulationResult(
+            name or proposal.description,
+            proposal_id,
+            state,
+            gas,
+            diffs,
+            time.perf_counter() - started,
+        )
+
+    def simulate_actions(self, actions, description, **kwargs):
+        return self.simulate(build_proposal(actions, description), **kwargs)
+
+
+_simulator = None
+
+
+def proposal_simulator():
+    """The simulator shared by every proposal built in this process."""
+    global _simulator
+    if _simulator is None:
+        _simulator = ProposalSimulator()
+    return _simulator
+
+
+# Dry-runs deployment scripts against one warm fork, reverting between them,
+# run with `brownie run proposal_simulator main deploy_004_upgrade_ogv_staking
+# deploy_005_rebranding --network mainnet-fork`
+def main(*deploy_scripts):
+    os.environ["MODE"] = "build_ogv_gov_proposal"
+    simulator = proposal_simulator()
+    for name in deploy_scripts:
+        print("\n{}".format(name))
+        importlib.import_module("scripts." + name).main()
+        # Also drops anything a script deployed without proposing
+        simulator.restore()
+    print("\nReused the warm fork for {} scripts, warmup took {:.2f}s".format(len(deploy_scripts), simulator.warmup))
@@ -0,0 +1,110 @@
+import sys
+import time
+from collections import namedtuple
+from itertools import groupby
+from operator import itemgetter
+
+from scripts.retroactive.exclusions import EXCLUDED_POOLS, Exclusions
+from scripts.retroactive.ousd import PROGRESS_FILE, SNAPSHOT_BLOCK, load_progress, reward_scores
+from scripts.retroactive.outputs import CHUNK_SIZE, external_sort, write_outputs
+
+# retroactive/src/ousd.ts
+OUSD_AIRDROP_AMOUNT = 400000000 * 10**18
+# retroactive/src/ogn.ts
+OGN_AIRDROP_AMOUNT = 1000000000 * 10**18
+LM_AIRDROP_AMOUNT = 50000000 * 10**18
+
+MANDATORY_LOCKUP_ACCOUNTS_FILE = "scripts/1_data/mandatory_lockup_accounts.json"
+MANDATORY_LOCKUP_REWARDS_FILE = "scripts/1_data/mandatory_lockup_rewards.csv"
+
+# A budget shared by the scores of one or more sources, e.g. OGN holders and
+# OGN stakers splitting OGN_AIRDROP_AMOUNT by one total score
+Pool = namedtuple("Pool", ["budget", "sources"])
+
+
+def shares(scores, budget):
+    """Splits `budget` in proportion to `scores`, exactly.
+
+    Everyone gets the floor of score * budget / total. The units this leaves
+    over, fewer than there are scores, go one each to the largest
+    remainders with ties to the earliest score, so the shares always sum
+    to `budget` and the result doesn't depend on anything but the input.
+    """
+    total = sum(scores)
+    if total <= 0:
+        if budget:
+            raise ValueError("Can't allocate {} to a total score of {}".format(budget, total))
+        return [0] * len(scores)
+    divisions = [divmod(score * budget, total) for score in scores]
+    allocated = [quotient for quotient, _ in divisions]
+    remainders = [remainder for _, remainder in divisions]
+    dust = budget - sum(allocated)
+    if dust:
+        # A reversed sort is still stable, so equal remainders keep their order
+        for position in sorted(range(len(scores)), key=remainders.__getitem__, reverse=True)[:dust]:
+            allocated[position] += 1
+    return allocated
+
+
+def allocations(pools):
+    """(address, source, amount) for every score in `pools`, unsorted.
+
+    Pools are allocated one at a time and nothing is kept between them, so an
+    address scored in several sources or pools gets a record for each.
+    """
+    for pool in pools:
+        amounts = iter(shares([score for scores in pool.sources.values() for score in scores.values()], pool.budget))
+        for source, scores in pool.sources.items():
+            for address in scores:
+                yield address, source, next(amounts)
+
+
+def allocated_accounts(pools, skip_empty=False, chunk_size=CHUNK_SIZE):
+    """(address, {"amount", "split"}) for every address in `pools`, sorted by
+    address.
+
+    The allocations are sorted on disk and grouped by address as they are
+    merged, so memory holds one pool's shares and `chunk_size` records
+    rather than every account.
+    Every source gets a key in each account's split, zero when the address
+    has no score there. With `skip_empty` accounts allocated nothing are left
+    out like ogn.ts does.
+    """
+    names = [source for pool in pools for source in pool.sources]
+    records = external_sort(allocations(pools), chunk_size=chunk_size)
+    for address, group in groupby(records, key=itemgetter(0)):
+        split = dict.fromkeys(names, 0)
+        for _, source, amount in group:
+            split[source] += amount
+        amount = sum(split.values())
+        if amount or not skip_empty:
+            yield address, {"amount": amount, "split": split}
+
+
+def allocate(pools, skip_empty=False):
+    """Accounts file content for `pools`, sorted by address like the airdrop
+    scripts write them."""
+    return dict(allocated_accounts(pools, skip_empty))
+
+
+# Allocates the OUSD airdrop from a retroactive/src/ousd.ts progress file, run with
+# `python -m scripts.retroactive.allocation [progress file] [accounts file] [rewards file]`
+def main(
+    progress_file=PROGRESS_FILE,
+    accounts_file=MANDATORY_LOCKUP_ACCOUNTS_FILE,
+    rewards_file=MANDATORY_LOCKUP_REWARDS_FILE,
+):
+    _, ousd_holders, wousd_holders = load_progress(progress_file)
+    exclusions = Exclusions([EXCLUDED_POOLS])
+    ousd_scores, wousd_scores = reward_scores(ousd_holders, wousd_holders, SNAPSHOT_BLOCK, exclusions)
+    exclusions.report()
+
+    started = time.perf_counter()
+    pools = [Pool(OUSD_AIRDROP_AMOUNT, {"ousd": ousd_scores, "wousd": wousd_scores})]
+    count = write_outputs(allocated_accounts(pools), accounts_file, rewards_file, ["ousd", "wousd"])
+    print("Allocated {} accounts in {:.2f}s".format(count, time.perf_counter() - started))
+    print("Total OGV airdropped: {}".format(sum(pool.budget for pool in pools)))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
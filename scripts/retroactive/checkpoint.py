@@ -0,0 +1,118 @@
+import json
+import os
+
+# Number of committed ranges after which the log is folded into the snapshot
+COMPACT_EVERY = 25
+
+
+def _write_atomic(path, write):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class Checkpoint:
+    """Crash-safe progress for TokenHistory indexing.
+
+    Progress lives in two files. `<path>.snapshot` is a compacted copy of
+    every history up to a block. `<path>.log` is an append-only log holding
+    one JSON line per committed block range with the balance changes applied
+    in that range. A commit only writes the changes made since the previous
+    commit. Every `compact_every` commits the log is folded into a new
+    snapshot, which is written to a temporary file and renamed into place.
+    Resuming loads the snapshot and replays the log lines after it. A line
+    cut short by a crash is dropped, so at most the range being written is
+    lost.
+
+    Replaces the whole-state JSON progress files of retroactive/src.
+    """
+
+    def __init__(self, path, histories, compact_every=COMPACT_EVERY):
+        self.snapshot_path = path + ".snapshot"
+        self.log_path = path + ".log"
+        self.histories = histories
+        self.compact_every = compact_every
+        self.block_number = None
+        self._pending_commits = 0
+        for history in histories.values():
+            history.journal = []
+
+    def _apply(self, changes):
+        for name, entries in changes.items():
+            history = self.histories[name]
+            for address, block_number, delta in entries:
+                history.record(address, block_number, delta)
+
+    def load(self):
+        """Restores the histories and returns the last checkpointed block, or
+        None when there is nothing to resume from."""
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            for name, holders in snapshot["tokens"].items():
+                self._apply({name: ((address, block, delta) for address, block, delta in holders)})
+            self.block_number = snapshot["blockNumber"]
+
+        if os.path.exists(self.log_path):
+            valid_length = 0
+            with open(self.log_path, "rb") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    if not line.endswith(b"\n"):
+                        break
+                    valid_length += len(line)
+                    # Ranges already folded into the snapshot are skipped
+                    if self.block_number is None or record["to"] > self.block_number:
+                        self._apply(record["tokens"])
+                        self.block_number = record["to"]
+                        self._pending_commits += 1
+            if valid_length != os.path.getsize(self.log_path):
+                # Drop the partial record of an interrupted commit
+                with open(self.log_path, "rb+") as f:
+                    f.truncate(valid_length)
+
+        for history in self.histories.values():
+            history.journal = []
+        return self.block_number
+
+    def commit(self, block_number):
+        """Appends every change since the last commit, up to `block_number`."""
+        record = {
+            "from": self.block_number,
+            "to": block_number,
+            "tokens": {name: history.journal for name, history in self.histories.items()},
+        }
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        for history in self.histories.values():
+            history.journal = []
+        self.block_number = block_number
+        self._pending_commits += 1
+        if self._pending_commits >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """Folds the log into a fresh snapshot and starts an empty log."""
+
+        def write_snapshot(f):
+            tokens = {
+                name: [
+                    [address, block, delta]
+                    for address, blocks, deltas in zip(history.addresses, history.blocks, history.deltas)
+                    for block, delta in zip(blocks, deltas)
+                ]
+                for name, history in self.histories.items()
+            }
+            json.dump({"blockNumber": self.block_number, "tokens": tokens}, f, separators=(",", ":"))
+
+        _write_atomic(self.snapshot_path, write_snapshot)
+        _write_atomic(self.log_path, lambda f: None)
+        self._pending_commits = 0
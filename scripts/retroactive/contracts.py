@@ -0,0 +1,45 @@
+from eth_utils import keccak
+
+# Contract definitions, mirrors retroactive/src/contracts.ts
+
+
+def event_topic(signature):
+    return "0x" + keccak(text=signature).hex()
+
+
+TRANSFER_TOPIC = event_topic("Transfer(address,address,uint256)")
+# ConvexRewards
+CONVEX_STAKED_TOPIC = event_topic("Staked(address,uint256)")
+CONVEX_WITHDRAWN_TOPIC = event_topic("Withdrawn(address,uint256)")
+# OGNStaking
+OGN_STAKED_TOPIC = event_topic("Staked(address,uint256,uint256,uint256)")
+# Spelled as in SingleAssetStaking
+OGN_STAKES_TRANSFERRED_TOPIC = event_topic("StakesTransfered(address,address,uint256)")
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+OGN_ADDRESS = "0x8207c1FfC5B6804F6024322CcF34F29c3541Ae26"
+OGN_DEPLOY_BLOCK = 6436154
+
+OUSD3CRV_ADDRESS = "0x87650D7bbfC3A9F10587d7778206671719d9910D"
+OUSD3CRVGAUGE_ADDRESS = "0x25f0cE4E2F8dbA112D9b115710AC297F816087CD"
+CONVEX_POOL_ADDRESS = "0x7D536a737C13561e0D2Decf1152a653B4e615158"
+
+OUSD_ADDRESS = "0x2A8e1E676Ec238d8A992307B495b45B3fEAa5e86"
+OUSD_DEPLOY_BLOCK = 11596940
+
+WOUSD_ADDRESS = "0xD2af830E8CBdFed6CC11Bab697bB25496ed6FA62"
+WOUSD_DEPLOY_BLOCK = 14566204
+
+OGN_STAKING_ADDRESS = "0x501804B374EF06fa9C427476147ac09F1551B9A0"
+OGN_STAKING_DEPLOY_BLOCK = 11469389
+
+CONVEX_VOTER_PROXY_ADDRESS = "0x989AEb4d175e16225E39E87d0D97A3360524AD80"
+
+# Pools holding OUSD on behalf of their liquidity providers
+EXCLUDED_CONTRACTS = [
+    "0x87650D7bbfC3A9F10587d7778206671719d9910D",  # Curve.fi
+    "0xCC01d9D54d06b6a0b6D09A9f79c3A6438e505f71",  # Uni v2
+    "0xcecaD69d7D4Ed6D52eFcFA028aF8732F27e08F70",  # Flipper
+    "0x129360c964e2E13910d603043F6287E5e9383374",  # Uni v3
+]
@@ -0,0 +1,82 @@
+from functools import lru_cache
+
+from eth_utils import to_checksum_address
+
+from scripts.retroactive.contracts import TRANSFER_TOPIC
+
+
+def _hex(value):
+    # Logs come back as hex strings from raw RPC and as HexBytes from web3
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    return value if value.startswith("0x") else "0x" + value
+
+
+def _int(value):
+    return value if isinstance(value, int) else int(_hex(value), 16)
+
+
+@lru_cache(maxsize=None)
+def _topic_address(topic):
+    return to_checksum_address("0x" + topic[-40:])
+
+
+def log_position(log):
+    """Sort key that orders logs the way they were emitted on chain."""
+    return (_int(log["blockNumber"]), _int(log["logIndex"]))
+
+
+def log_topic(log):
+    return _hex(log["topics"][0]).lower()
+
+
+def log_block(log):
+    return _int(log["blockNumber"])
+
+
+def topic_address(log, index):
+    """The address in indexed topic `index` of `log`."""
+    return _topic_address(_hex(log["topics"][index]))
+
+
+def topic_int(log, index):
+    return _int(log["topics"][index])
+
+
+def log_data(log):
+    return bytes.fromhex(_hex(log["data"])[2:])
+
+
+def data_words(log):
+    """The non-indexed arguments of `log` as 32 byte unsigned ints."""
+    data = _hex(log["data"])[2:]
+    return [int(data[i : i + 64], 16) for i in range(0, len(data), 64)]
+
+
+def data_address(log, index):
+    """The address in non-indexed argument `index` of `log`."""
+    return to_checksum_address("0x{:040x}".format(data_words(log)[index]))
+
+
+def decode_transfer(log):
+    """Decodes an ERC20 Transfer log into (block number, from, to, value)."""
+    topics = [_hex(topic) for topic in log["topics"]]
+    if topics[0].lower() != TRANSFER_TOPIC:
+        raise ValueError("Not a Transfer log")
+    return (
+        _int(log["blockNumber"]),
+        _topic_address(topics[1]),
+        _topic_address(topics[2]),
+        _int(log["data"]),
+    )
+
+
+def decode_user_amount(log):
+    """Decodes logs shaped like `Event(address indexed user, uint256 amount, ..)`
+    into (block number, user, amount)."""
+    data = _hex(log["data"])
+    return (
+        _int(log["blockNumber"]),
+        _topic_address(_hex(log["topics"][1])),
+        int(data[2:66], 16),
+    )
@@ -0,0 +1,111 @@
+import json
+import sys
+from collections import namedtuple
+
+from eth_utils import to_checksum_address
+
+from scripts.retroactive.contracts import (
+    CONVEX_VOTER_PROXY_ADDRESS,
+    EXCLUDED_CONTRACTS,
+    OUSD3CRVGAUGE_ADDRESS,
+)
+
+EXCLUSIONS_FILE = "retroactive/exclusions.csv"
+
+# Which holders each reward source leaves out, mirroring the filters spread
+# through retroactive/src/ogn.ts and ousd.ts
+Rule = namedtuple("Rule", ["name", "sources", "addresses"])
+Excluded = namedtuple("Excluded", ["source", "rule", "address", "score"])
+
+EXCLUDED_POOLS = Rule("excluded pools", ["ousd"], EXCLUDED_CONTRACTS)
+
+
+def load_addresses(path=EXCLUSIONS_FILE):
+    """Checksummed addresses from a file with one address per line."""
+    with open(path, encoding="utf-8") as f:
+        return [to_checksum_address(line.strip().split(",")[0]) for line in f if line.strip()]
+
+
+def default_rules(path=EXCLUSIONS_FILE):
+    return [
+        EXCLUDED_POOLS,
+        Rule("exclusions.csv", ["ogn", "ognStaking"], load_addresses(path)),
+        Rule("OUSD3CRV gauge", ["ousd3Crv"], [OUSD3CRVGAUGE_ADDRESS]),
+        Rule("Convex voter proxy", ["ousd3CrvGauge"], [CONVEX_VOTER_PROXY_ADDRESS]),
+    ]
+
+
+class Exclusions:
+    """Every rule's addresses in one hashed set per reward source.
+
+    Addresses are normalized to lowercase once when the rules are loaded,
+    so a lookup is a single set membership test whatever the casing of the
+    holder table or the list the rule came from. Each excluded holder is
+    recorded with the rule that matched it.
+    """
+
+    def __init__(self, rules):
+        self._rules = {}
+        for rule in rules:
+            for source in rule.sources:
+                source_rules = self._rules.setdefault(source, {})
+                for address in rule.addresses:
+                    source_rules.setdefault(address.lower(), rule.name)
+        self.excluded = []
+
+    def addresses(self, source):
+        """Every address excluded from `source`, checksummed."""
+        return {to_checksum_address(address) for address in self._rules.get(source, ())}
+
+    def mask(self, source, addresses):
+        """True for each of `addresses` that is kept for `source`."""
+        excluded = self._rules.get(source, {})
+        return [address.lower() not in excluded for address in addresses]
+
+    def apply(self, source, scores):
+        """`scores` without the holders excluded from `source`."""
+        excluded = self._rules.get(source, {})
+        if not excluded:
+            return dict(scores)
+        kept = {}
+        for address, score in scores.items():
+            rule = excluded.get(address.lower())
+            if rule is None:
+                kept[address] = score
+            else:
+                self.excluded.append(Excluded(source, rule, address, score))
+        return kept
+
+    def missing(self, source, scores):
+        """Addresses excluded from `source` that aren't among `scores`."""
+        present = {address.lower() for address in scores}
+        return sorted(
+            to_checksum_address(address) for address in self._rules.get(source, {}) if address not in present
+        )
+
+    def report(self):
+        totals = {}
+        for excluded in self.excluded:
+            count, score = totals.get((excluded.source, excluded.rule), (0, 0))
+            totals[(excluded.source, excluded.rule)] = (count + 1, score + excluded.score)
+        for (source, rule), (count, score) in totals.items():
+            print("{}\t{}\t{} holders\tscore {}".format(source, rule, count, score))
+
+
+# Lists the addresses each exclusion rule removes from a scores JSON, run with
+# `python -m scripts.retroactive.exclusions <source> <scores.json>`
+def main(source, scores_file):
+    with open(scores_file, encoding="utf-8") as f:
+        scores = {address: int(score) for address, score in json.load(f).items()}
+    exclusions = Exclusions(default_rules())
+    kept = exclusions.apply(source, scores)
+    for excluded in exclusions.excluded:
+        print("{}\t{}\t{}".format(excluded.address, excluded.rule, excluded.score))
+    exclusions.report()
+    print("Kept {} of {} holders".format(len(kept), len(scores)))
+    for address in exclusions.missing(source, scores):
+        print("{} not found in {} scores".format(address, source))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
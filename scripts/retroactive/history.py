@@ -0,0 +1,147 @@
+from array import array
+from bisect import bisect_right
+from operator import mul
+
+from scripts.merkle_tree import parse_amount
+from scripts.retroactive.contracts import ZERO_ADDRESS
+from scripts.retroactive.events import decode_transfer
+
+
+class TokenHistory:
+    """Balance history of every holder of a token, stored column by column.
+
+    Each holder gets three parallel columns: the blocks their balance changed
+    in, the signed change and the running balance after it. Changes that land
+    in the same block are merged into one entry since a balance held for zero
+    blocks never contributes to a reward score.
+
+    Port of the BlockHistory[] handling in retroactive/src/utils.ts.
+    """
+
+    def __init__(self):
+        # When set to a list, every applied change is appended to it as
+        # (address, block number, delta) so it can be checkpointed
+        self.journal = None
+        self._positions = {}
+        self.addresses = []
+        self.blocks = []
+        self.deltas = []
+        self.balances = []
+
+    def __len__(self):
+        return len(self.addresses)
+
+    def __contains__(self, address):
+        return address in self._positions
+
+    def __iter__(self):
+        return iter(self.addresses)
+
+    def _position(self, address):
+        position = self._positions.get(address)
+        if position is None:
+            position = self._positions[address] = len(self.addresses)
+            self.addresses.append(address)
+            self.blocks.append(array("Q"))
+            self.deltas.append([])
+            self.balances.append([])
+        return position
+
+    def record(self, address, block_number, delta, clamp=False):
+        """Adds `delta` to the balance of `address` at `block_number`.
+
+        With `clamp` the balance never drops below zero. OUSD rebasing yield
+        isn't tracked, so holders can send more than they were sent.
+        """
+        position = self._position(address)
+        blocks, deltas, balances = self.blocks[position], self.deltas[position], self.balances[position]
+        previous = balances[-1] if balances else 0
+        balance = previous + delta
+        if clamp and balance < 0:
+            balance = 0
+        if self.journal is not None:
+            self.journal.append((address, block_number, balance - previous))
+        if blocks and blocks[-1] == block_number:
+            deltas[-1] += balance - previous
+            balances[-1] = balance
+        else:
+            blocks.append(block_number)
+            deltas.append(balance - previous)
+            balances.append(balance)
+
+    def apply_transfer(self, block_number, sender, receiver, value):
+        """Mirrors handleERC20Transfer: debits the sender (never below zero) and
+        credits the receiver, ignoring mints, burns and zero value transfers."""
+        if value == 0:
+            return
+        if sender != ZERO_ADDRESS:
+            self.record(sender, block_number, -value, clamp=True)
+        if receiver != ZERO_ADDRESS:
+            self.record(receiver, block_number, value)
+
+    def apply_transfer_logs(self, logs):
+        """Applies raw Transfer logs, which must already be in chain order."""
+        for log in logs:
+            self.apply_transfer(*decode_transfer(log))
+
+    def balance(self, address):
+        position = self._positions.get(address)
+        if position is None or not self.balances[position]:
+            return 0
+        return self.balances[position][-1]
+
+    def balance_at(self, address, block_number):
+        """Balance of `address` at the end of `block_number`."""
+        position = self._positions.get(address)
+        if position is None:
+            return 0
+        index = bisect_right(self.blocks[position], block_number)
+        return self.balances[position][index - 1] if index else 0
+
+    def score(self, address, snapshot_block, reward_from_block=0):
+        position = self._positions.get(address)
+        if position is None:
+            return 0
+        return _score(self.blocks[position], self.balances[position], snapshot_block, reward_from_block)
+
+    def scores(self, snapshot_block, reward_from_block=0):
+        """amount x blocks held between `reward_from_block` and `snapshot_block`
+        for every holder, like cumulativeRewardScore. Negative balances are
+        ignored."""
+        return {
+            address: _score(blocks, balances, snapshot_block, reward_from_block)
+            for address, blocks, balances in zip(self.addresses, self.blocks, self.balances)
+        }
+
+    def balance_scores(self):
+        """Last recorded balance of every holder, like balanceRewardScore."""
+        return {
+            address: balances[-1] if balances else 0
+            for address, balances in zip(self.addresses, self.balances)
+        }
+
+    @classmethod
+    def from_progress(cls, holders):
+        """Loads the `{address: [{blockNumber, amount}]}` histories stored in
+        the TypeScript indexer's progress files."""
+        history = cls()
+        for address, entries in holders.items():
+            for entry in entries:
+                balance = parse_amount(entry["amount"])
+                history.record(address, entry["blockNumber"], balance - history.balance(address))
+        return history
+
+
+def _score(blocks, balances, snapshot_block, reward_from_block):
+    # Each balance is held from its own block until the next change, the last
+    # one until the snapshot. Holding periods are clipped to the reward window
+    # and the products are summed in one pass over the columns.
+    if not blocks:
+        return 0
+    ends = blocks[1:]
+    ends.append(snapshot_block)
+    durations = [
+        max(0, min(end, snapshot_block) - max(start, reward_from_block))
+        for start, end in zip(blocks, ends)
+    ]
+    return sum(product for product in map(mul, balances, durations) if product > 0)
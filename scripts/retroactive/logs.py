@@ -0,0 +1,121 @@
+import asyncio
+import itertools
+
+import aiohttp
+
+from scripts.retroactive.events import log_position
+
+# Messages providers use when an eth_getLogs range returns too many results
+RANGE_ERROR_MESSAGES = [
+    "query returned more than",
+    "block range",
+    "response size",
+    "too many",
+    "limit exceeded",
+    "range is too large",
+]
+# Infura and Alchemy use this code for oversized log queries
+RANGE_ERROR_CODES = [-32005]
+
+
+class RpcError(Exception):
+    def __init__(self, code, message):
+        super().__init__("RPC error {}: {}".format(code, message))
+        self.code = code
+        self.message = message
+
+    @property
+    def is_range_error(self):
+        message = str(self.message).lower()
+        return self.code in RANGE_ERROR_CODES or any(text in message for text in RANGE_ERROR_MESSAGES)
+
+
+class LogFetcher:
+    """Fetches logs over a block range with concurrent eth_getLogs calls.
+
+    The range is split into `chunk_size` block chunks, at most `concurrency`
+    of which are in flight at once. A chunk the provider rejects as too large
+    is bisected until it goes through. Logs are always handed back sorted by
+    (block number, log index), however the requests happened to finish.
+    Replaces the ethereum-events settings in retroactive/src/config.ts.
+    """
+
+    def __init__(self, provider_url, chunk_size=10000, concurrency=10, retries=5, backoff=1.0):
+        self.provider_url = provider_url
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.requests = 0
+        self.splits = 0
+        self._ids = itertools.count(1)
+
+    async def _request(self, session, method, params):
+        for attempt in range(self.retries + 1):
+            try:
+                self.requests += 1
+                payload = {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+                async with session.post(self.provider_url, json=payload) as response:
+                    body = await response.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == self.retries:
+                    raise
+                await asyncio.sleep(self.backoff * 2**attempt)
+                continue
+            if "error" in body:
+                error = RpcError(body["error"].get("code"), body["error"].get("message"))
+                if error.is_range_error or attempt == self.retries:
+                    raise error
+                await asyncio.sleep(self.backoff * 2**attempt)
+                continue
+            return body["result"]
+
+    async def _get_logs(self, session, semaphore, log_filter, start, end):
+        params = dict(log_filter, fromBlock=hex(start), toBlock=hex(end))
+        try:
+            async with semaphore:
+                return await self._request(session, "eth_getLogs", [params])
+        except RpcError as e:
+            if not e.is_range_error or start == end:
+                raise
+        # Too many results, split the range in two and try each half
+        self.splits += 1
+        middle = (start + end) // 2
+        left, right = await asyncio.gather(
+            self._get_logs(session, semaphore, log_filter, start, middle),
+            self._get_logs(session, semaphore, log_filter, middle + 1, end),
+        )
+        return left + right
+
+    def _ranges(self, from_block, to_block):
+        for start in range(from_block, to_block + 1, self.chunk_size):
+            yield start, min(start + self.chunk_size - 1, to_block)
+
+    async def batches(self, log_filter, from_block, to_block, window=None):
+        """Yields (last block, sorted logs) for consecutive windows of chunks.
+
+        Every window is fetched concurrently and released in block order, so a
+        caller can fold logs into state without holding the whole range.
+        """
+        window = window or self.concurrency * 4
+        semaphore = asyncio.Semaphore(self.concurrency)
+        ranges = list(self._ranges(from_block, to_block))
+        async with aiohttp.ClientSession() as session:
+            for offset in range(0, len(ranges), window):
+                group = ranges[offset : offset + window]
+                results = await asyncio.gather(
+                    *(self._get_logs(session, semaphore, log_filter, start, end) for start, end in group)
+                )
+                logs = [log for result in results for log in result]
+                logs.sort(key=log_position)
+                yield group[-1][1], logs
+
+    async def fetch(self, log_filter, from_block, to_block):
+        logs = []
+        async for _, batch in self.batches(log_filter, from_block, to_block):
+            logs.extend(batch)
+        return logs
+
+    def get_logs(self, log_filter, from_block, to_block):
+        """Blocking wrapper around `fetch`."""
+        return asyncio.run(self.fetch(log_filter, from_block, to_block))
@@ -0,0 +1,121 @@
+import asyncio
+import json
+import os
+import sys
+import time
+
+from scripts.retroactive.checkpoint import Checkpoint
+from scripts.retroactive.contracts import (
+    OUSD_ADDRESS,
+    OUSD_DEPLOY_BLOCK,
+    TRANSFER_TOPIC,
+    WOUSD_ADDRESS,
+    WOUSD_DEPLOY_BLOCK,
+)
+from scripts.retroactive.events import decode_transfer
+from scripts.retroactive.exclusions import EXCLUDED_POOLS, Exclusions
+from scripts.retroactive.history import TokenHistory
+from scripts.retroactive.logs import LogFetcher
+
+# https://etherscan.io/block/15087759
+SNAPSHOT_BLOCK = 15087759
+PROGRESS_FILE = "retroactive/ousd-progress.json"
+CHECKPOINT = "retroactive/ousd-checkpoint"
+
+
+def load_progress(path=PROGRESS_FILE):
+    """Loads the OUSD and wOUSD histories from a retroactive/src/ousd.ts progress file."""
+    with open(path, encoding="utf-8") as f:
+        progress = json.load(f)
+    return (
+        progress["blockNumber"],
+        TokenHistory.from_progress(progress["ousdHolders"]),
+        TokenHistory.from_progress(progress["wousdHolders"]),
+    )
+
+
+def index_transfers(
+    fetcher,
+    from_block=min(OUSD_DEPLOY_BLOCK, WOUSD_DEPLOY_BLOCK),
+    to_block=SNAPSHOT_BLOCK,
+    checkpoint_path=None,
+):
+    """Builds the OUSD and wOUSD histories from Transfer logs fetched by `fetcher`.
+
+    With `checkpoint_path` progress is committed after every batch of logs and
+    a later run resumes from the last committed block.
+    """
+    ousd_holders, wousd_holders = TokenHistory(), TokenHistory()
+    histories = {OUSD_ADDRESS.lower(): ousd_holders, WOUSD_ADDRESS.lower(): wousd_holders}
+    log_filter = {"address": [OUSD_ADDRESS, WOUSD_ADDRESS], "topics": [TRANSFER_TOPIC]}
+
+    checkpoint = None
+    if checkpoint_path:
+        checkpoint = Checkpoint(checkpoint_path, {"ousd": ousd_holders, "wousd": wousd_holders})
+        resumed_block = checkpoint.load()
+        if resumed_block is not None:
+            print("Resuming from checkpoint at block {}".format(resumed_block))
+            from_block = resumed_block + 1
+
+    async def run():
+        async for block_number, logs in fetcher.batches(log_filter, from_block, to_block):
+            for log in logs:
+                histories[log["address"].lower()].apply_transfer(*decode_transfer(log))
+            if checkpoint:
+                checkpoint.commit(block_number)
+            print(
+                "{} - {} OUSD holders, {} wOUSD holders".format(
+                    block_number, len(ousd_holders), len(wousd_holders)
+                ),
+                end="\r",
+            )
+
+    if from_block <= to_block:
+        asyncio.run(run())
+        print()
+    return ousd_holders, wousd_holders
+
+
+def reward_scores(ousd_holders, wousd_holders, snapshot_block=SNAPSHOT_BLOCK, exclusions=None):
+    """Holding scores for OUSD (minus the excluded pools) and wOUSD holders."""
+    if exclusions is None:
+        exclusions = Exclusions([EXCLUDED_POOLS])
+    return (
+        exclusions.apply("ousd", ousd_holders.scores(snapshot_block)),
+        exclusions.apply("wousd", wousd_holders.scores(snapshot_block)),
+    )
+
+
+# Computes the OUSD airdrop scores, run with
+# `python -m scripts.retroactive.ousd [progress file]`. Without a progress file
+# the transfers are indexed from PROVIDER_URL, resuming from the last checkpoint.
+def main(progress_file=None):
+    started = time.perf_counter()
+    if progress_file:
+        block_number, ousd_holders, wousd_holders = load_progress(progress_file)
+    else:
+        block_number = SNAPSHOT_BLOCK
+        ousd_holders, wousd_holders = index_transfers(
+            LogFetcher(os.environ["PROVIDER_URL"]), checkpoint_path=CHECKPOINT
+        )
+    print(
+        "Loaded {} OUSD and {} wOUSD holders up to block {} in {:.2f}s".format(
+            len(ousd_holders), len(wousd_holders), block_number, time.perf_counter() - started
+        )
+    )
+
+    started = time.perf_counter()
+    exclusions = Exclusions([EXCLUDED_POOLS])
+    ousd_scores, wousd_scores = reward_scores(ousd_holders, wousd_holders, exclusions=exclusions)
+    exclusions.report()
+    ousd_score = sum(ousd_scores.values())
+    wousd_score = sum(wousd_scores.values())
+    total_score = ousd_score + wousd_score
+    print("Scored holders in {:.2f}s".format(time.perf_counter() - started))
+    print("OUSD rewards {}%".format(ousd_score * 100 // total_score))
+    print("wOUSD rewards {}%".format(wousd_score * 100 // total_score))
+    return ousd_scores, wousd_scores
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
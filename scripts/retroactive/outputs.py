@@ -0,0 +1,84 @@
+import heapq
+import json
+import os
+import tempfile
+from contextlib import ExitStack
+from itertools import islice
+from operator import itemgetter
+
+from scripts.merkle_tree import format_amount
+
+# Records sorted in memory at a time before they are spilled to disk
+CHUNK_SIZE = 100000
+
+
+def external_sort(records, key=itemgetter(0), chunk_size=CHUNK_SIZE):
+    """Yields JSON serialisable `records` sorted by `key`.
+
+    Records are sorted `chunk_size` at a time. When there is more than one
+    chunk, each sorted run is spilled to a temporary file and the runs are
+    merged lazily, so memory holds one chunk while sorting and one record
+    per run while merging. Spilled records come back as decoded JSON, so
+    tuples become lists.
+    """
+    records = iter(records)
+    chunk = sorted(islice(records, chunk_size), key=key)
+    if len(chunk) < chunk_size:
+        yield from chunk
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        while chunk:
+            path = os.path.join(directory, "{}.jsonl".format(len(paths)))
+            with open(path, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(record, separators=(",", ":")) + "\n" for record in chunk)
+            paths.append(path)
+            chunk = sorted(islice(records, chunk_size), key=key)
+
+        runs = [open(path, encoding="utf-8") for path in paths]
+        try:
+            yield from heapq.merge(*(map(json.loads, run) for run in runs), key=key)
+        finally:
+            for run in runs:
+                run.close()
+
+
+def _account_json(account):
+    return json.dumps(
+        {
+            "amount": format_amount(account["amount"]),
+            "split": {source: format_amount(amount) for source, amount in account["split"].items()},
+        }
+    )
+
+
+def _rewards_row(address, account, sources):
+    split = account["split"]
+    return ",".join([address] + [str(split.get(source, 0)) for source in sources] + [str(account["amount"])])
+
+
+def write_outputs(accounts, accounts_file, rewards_file=None, sources=()):
+    """Streams `accounts` to the accounts file and, with `rewards_file`, to
+    the rewards CSV the airdrop scripts write for verification, in one pass.
+
+    `accounts` is an {address: {"amount", "split"}} mapping or an iterable of
+    (address, account) pairs, e.g. from external_sort. The accounts file has
+    one account per line so scripts.merkle_tree can read it back the same
+    way. Returns the number of accounts written.
+    """
+    items = accounts.items() if hasattr(accounts, "items") else accounts
+    count = 0
+    with ExitStack() as stack:
+        accounts_f = stack.enter_context(open(accounts_file, "w", encoding="utf-8"))
+        rewards_f = stack.enter_context(open(rewards_file, "w", encoding="utf-8")) if rewards_file else None
+        accounts_f.write("{")
+        for address, account in items:
+            separator = "\n" if count else ""
+            accounts_f.write("%s\n  %s: %s" % ("," if count else "", json.dumps(address), _account_json(account)))
+            if rewards_f:
+                rewards_f.write(separator + _rewards_row(address, account, sources))
+            count += 1
+        accounts_f.write("\n}\n")
+    return count
+
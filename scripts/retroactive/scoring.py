@@ -0,0 +1,101 @@
+import sys
+import time
+from bisect import bisect_right
+from itertools import accumulate
+from operator import mul
+
+from scripts.retroactive.contracts import EXCLUDED_CONTRACTS
+from scripts.retroactive.ousd import PROGRESS_FILE, load_progress
+
+
+class CumulativeScores:
+    """Answers amount x blocks reward scores for any window of blocks.
+
+    For every holder the running total of balance x blocks held is
+    precomputed at each balance change. The score between two blocks is then
+    the difference of two totals, each found with a binary search over the
+    holder's blocks. Evaluating many candidate snapshot windows costs
+    O(log n) per holder per window instead of a walk over every history.
+    Negative balances count as zero, like cumulativeRewardScore.
+    """
+
+    def __init__(self, history, exclude=()):
+        exclude = set(exclude)
+        self.addresses = []
+        self._blocks = []
+        self._balances = []
+        self._totals = []
+        for address, blocks, balances in zip(history.addresses, history.blocks, history.balances):
+            if address in exclude or not blocks:
+                continue
+            held = [max(0, balance) for balance in balances]
+            durations = [end - start for start, end in zip(blocks, blocks[1:])]
+            self.addresses.append(address)
+            self._blocks.append(blocks)
+            self._balances.append(held)
+            self._totals.append(list(accumulate(map(mul, held, durations), initial=0)))
+
+    def __len__(self):
+        return len(self.addresses)
+
+    def _total(self, position, block_number):
+        # Score accumulated from the first balance change up to `block_number`
+        blocks = self._blocks[position]
+        index = bisect_right(blocks, block_number) - 1
+        if index < 0:
+            return 0
+        return self._totals[position][index] + self._balances[position][index] * (block_number - blocks[index])
+
+    def _score(self, position, snapshot_block, reward_from_block):
+        if snapshot_block <= reward_from_block:
+            return 0
+        return self._total(position, snapshot_block) - self._total(position, reward_from_block)
+
+    def scores(self, snapshot_block, reward_from_block=0):
+        """Score of every holder between `reward_from_block` and `snapshot_block`."""
+        return {
+            address: self._score(position, snapshot_block, reward_from_block)
+            for position, address in enumerate(self.addresses)
+        }
+
+    def table(self, windows):
+        """Scores of every holder for each (reward from block, snapshot block)
+        window, as {address: [score per window]}."""
+        return {
+            address: [self._score(position, snapshot, start) for start, snapshot in windows]
+            for position, address in enumerate(self.addresses)
+        }
+
+    def totals(self, windows):
+        """Sum of all holder scores for each (reward from block, snapshot block) window."""
+        totals = [0] * len(windows)
+        for position in range(len(self.addresses)):
+            for i, (start, snapshot) in enumerate(windows):
+                totals[i] += self._score(position, snapshot, start)
+        return totals
+
+
+# Prints how the OUSD/wOUSD split of the airdrop moves with the snapshot block,
+# run with `python -m scripts.retroactive.scoring 15000000 15087759 ...`
+def main(*snapshot_blocks):
+    started = time.perf_counter()
+    _, ousd_holders, wousd_holders = load_progress(PROGRESS_FILE)
+    ousd = CumulativeScores(ousd_holders, exclude=EXCLUDED_CONTRACTS)
+    wousd = CumulativeScores(wousd_holders)
+    print("Indexed {} holders in {:.2f}s".format(len(ousd) + len(wousd), time.perf_counter() - started))
+
+    windows = [(0, int(block)) for block in snapshot_blocks]
+    started = time.perf_counter()
+    ousd_totals, wousd_totals = ousd.totals(windows), wousd.totals(windows)
+    print("Scored {} windows in {:.2f}s".format(len(windows), time.perf_counter() - started))
+    for (_, snapshot), ousd_score, wousd_score in zip(windows, ousd_totals, wousd_totals):
+        total = ousd_score + wousd_score
+        print(
+            "{}\tOUSD {:.4f}%\twOUSD {:.4f}%".format(
+                snapshot, ousd_score * 100 / total if total else 0, wousd_score * 100 / total if total else 0
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
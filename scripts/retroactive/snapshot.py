@@ -0,0 +1,160 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from scripts.merkle_tree import format_amount
+from scripts.multicall import BATCH_SIZE, MULTICALL3_ADDRESS, JsonRpc, MulticallReader
+from scripts.retroactive.contracts import (
+    OGN_ADDRESS,
+    OGN_STAKED_TOPIC,
+    OGN_STAKES_TRANSFERRED_TOPIC,
+    OGN_STAKING_ADDRESS,
+    OGN_STAKING_DEPLOY_BLOCK,
+)
+from scripts.retroactive.events import data_address, log_topic, topic_address
+from scripts.retroactive.logs import LogFetcher, RpcError
+from scripts.retroactive.ousd import SNAPSHOT_BLOCK
+
+STORE_FILE = "retroactive/{}-snapshot.jsonl".format(SNAPSHOT_BLOCK)
+# Read by retroactive/src/ogn.ts, which skips every staker already in it
+STAKING_REWARDS_FILE = "retroactive/{}-staking-rewards.json".format(SNAPSHOT_BLOCK)
+TOTAL_CURRENT_HOLDINGS = "totalCurrentHoldings(address)(uint256)"
+
+SnapshotRequest = namedtuple("SnapshotRequest", ["contract", "method", "addresses", "block_number"])
+
+
+def request_key(request):
+    return "{}:{}:{}".format(request.contract, request.method, request.block_number)
+
+
+class SnapshotStore:
+    """Append-only store of snapshotted values.
+
+    Each line holds the values of one batch of addresses for a (contract,
+    method, block). Batches are appended as they complete, so an interrupted
+    run resumes with only the addresses that are missing. A line cut short
+    by a crash is dropped when the store is loaded.
+    """
+
+    def __init__(self, path=STORE_FILE):
+        self.path = path
+        self._values = {}
+        self._lock = threading.Lock()
+        if not os.path.exists(path):
+            return
+        valid_length = 0
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                valid_length += len(line)
+                self._values.setdefault(record["key"], {}).update(record["values"])
+        if valid_length != os.path.getsize(path):
+            with open(path, "rb+") as f:
+                f.truncate(valid_length)
+
+    def values(self, request):
+        return self._values.get(request_key(request), {})
+
+    def append(self, request, values):
+        key = request_key(request)
+        line = json.dumps({"key": key, "values": values}, separators=(",", ":")) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._values.setdefault(key, {}).update(values)
+
+
+def _call_batch(reader, reads, retries, backoff):
+    for attempt in range(retries + 1):
+        try:
+            return reader.call_batch(reads)
+        except (OSError, RpcError):
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2**attempt)
+
+
+def snapshot(
+    eth_call,
+    requests,
+    store,
+    batch_size=BATCH_SIZE,
+    concurrency=8,
+    retries=3,
+    backoff=1.0,
+    multicall=MULTICALL3_ADDRESS,
+):
+    """Values of every request's method for each of its addresses at its block.
+
+    Addresses already in `store` are skipped. The rest are read in
+    Multicall3 batches with at most `concurrency` batches in flight, and
+    every batch is appended to the store as soon as it completes. Returns
+    `{request key: {address: value}}`.
+    """
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {}
+        for request in requests:
+            done = store.values(request)
+            addresses = [address for address in dict.fromkeys(request.addresses) if address not in done]
+            reader = MulticallReader(eth_call, request.block_number, batch_size, multicall)
+            reader.read_many(request.contract, request.method, [(address,) for address in addresses])
+            for offset, reads in zip(range(0, len(addresses), batch_size), reader.batches()):
+                future = executor.submit(_call_batch, reader, reads, retries, backoff)
+                futures[future] = (request, addresses[offset : offset + batch_size])
+        for future in as_completed(futures):
+            request, addresses = futures[future]
+            store.append(request, dict(zip(addresses, future.result())))
+    return {request_key(request): store.values(request) for request in requests}
+
+
+def ogn_stakers(fetcher, to_block=SNAPSHOT_BLOCK):
+    """Everyone who staked OGN or was transferred stakes, in first seen
+    order, like handleStakingEvent."""
+    log_filter = {"address": OGN_STAKING_ADDRESS, "topics": [[OGN_STAKED_TOPIC, OGN_STAKES_TRANSFERRED_TOPIC]]}
+    stakers = {}
+    for log in fetcher.get_logs(log_filter, OGN_STAKING_DEPLOY_BLOCK, to_block):
+        if log_topic(log) == OGN_STAKED_TOPIC:
+            stakers[topic_address(log, 1)] = True
+        else:
+            stakers[data_address(log, 0)] = True
+    return list(stakers)
+
+
+def write_staking_rewards(holdings, path=STAKING_REWARDS_FILE):
+    """Writes holdings in the ethers BigNumber JSON that ogn.ts resumes from."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({address: format_amount(value) for address, value in holdings.items()}, f)
+
+
+# Snapshots OGN staking holdings at SNAPSHOT_BLOCK for retroactive/src/ogn.ts,
+# run with `python -m scripts.retroactive.snapshot`
+def main(store_file=STORE_FILE, concurrency=8):
+    started = time.perf_counter()
+    stakers = ogn_stakers(LogFetcher(os.environ["PROVIDER_URL"]))
+    print("Found {} OGN stakers in {:.2f}s".format(len(stakers), time.perf_counter() - started))
+
+    started = time.perf_counter()
+    rpc = JsonRpc(os.environ["PROVIDER_URL"])
+    holdings = SnapshotRequest(OGN_STAKING_ADDRESS, TOTAL_CURRENT_HOLDINGS, stakers, SNAPSHOT_BLOCK)
+    balance = SnapshotRequest(OGN_ADDRESS, "balanceOf(address)(uint256)", [OGN_STAKING_ADDRESS], SNAPSHOT_BLOCK)
+    results = snapshot(rpc.eth_call, [holdings, balance], SnapshotStore(store_file), concurrency=int(concurrency))
+    staked = results[request_key(holdings)]
+    write_staking_rewards({address: staked[address] for address in stakers})
+    print("Snapshotted in {:.2f}s with {} RPC calls".format(time.perf_counter() - started, rpc.requests))
+    print("Total OGN staked (sum) {}".format(sum(staked.values())))
+    print("Total OGN staked (balanceOf) {}".format(results[request_key(balance)][OGN_STAKING_ADDRESS]))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
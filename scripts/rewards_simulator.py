@@ -0,0 +1,216 @@
+import json
+import sys
+from bisect import bisect_right
+from collections import namedtuple
+from itertools import accumulate
+
+DAY = 86400
+YEAR = 365 * DAY
+UINT64_MAX = 2**64 - 1
+# RewardsSource limits
+MAX_KNEES = 48
+MAX_INFLATION_PER_DAY = 5 * 10**6 * 10**18
+# Precision of accRewardPerShare in the staking contracts
+SHARE_PRECISION = 10**12
+
+Slope = namedtuple("Slope", ["start", "end", "rate_per_day"])
+
+
+class InflationSchedule:
+    """Off-chain RewardsSource inflation.
+
+    Slopes are normalised the way setInflation stores them: each ends where
+    the next one starts and the last one runs forever. Rewards for a range
+    match _calculateInflation for a collection at the end of the range whose
+    previous collection was at its start, including the rounding down of
+    every slope's share. Fully covered slopes come from prefix sums, so a
+    range costs two binary searches whatever the number of slopes.
+    """
+
+    def __init__(self, slopes, validate=True):
+        slopes = [(int(start), int(rate_per_day)) for start, rate_per_day in slopes]
+        if validate:
+            if len(slopes) > MAX_KNEES:
+                raise ValueError("Rewards: Too many slopes")
+            previous = 0
+            for start, rate_per_day in slopes:
+                if rate_per_day > MAX_INFLATION_PER_DAY:
+                    raise ValueError("Rewards: RatePerDay too high")
+                if start <= previous:
+                    raise ValueError("Rewards: Start times must increase")
+                previous = start
+        ends = [start for start, _ in slopes[1:]] + [UINT64_MAX]
+        self.slopes = [Slope(start, end, rate) for (start, rate), end in zip(slopes, ends)]
+        self.starts = [slope.start for slope in self.slopes]
+        self._totals = list(
+            accumulate(((slope.end - slope.start) * slope.rate_per_day // DAY for slope in self.slopes), initial=0)
+        )
+
+    def __len__(self):
+        return len(self.slopes)
+
+    def _partial(self, index, start, end):
+        slope = self.slopes[index]
+        duration = max(0, min(end, slope.end) - max(start, slope.start))
+        return duration * slope.rate_per_day // DAY
+
+    def rewards(self, start, end):
+        """Inflation collected at `end` when the last collection was at `start`."""
+        if end <= start or not self.slopes:
+            return 0
+        first = max(0, bisect_right(self.starts, start) - 1)
+        last = bisect_right(self.starts, end) - 1
+        if last < first:
+            return 0
+        if first == last:
+            return self._partial(first, start, end)
+        return (
+            self._partial(first, start, end)
+            + self._totals[last] - self._totals[first + 1]
+            + self._partial(last, start, end)
+        )
+
+    def collect(self, start, end):
+        return self.rewards(start, end)
+
+    @classmethod
+    def from_contract(cls, rewards_source):
+        """Reads inflationSlopes from a deployed RewardsSource."""
+        # Imported here so the rest of the module works without brownie
+        from brownie.exceptions import VirtualMachineError
+
+        slopes = []
+        for i in range(MAX_KNEES):
+            try:
+                start, _, rate_per_day = rewards_source.inflationSlopes(i)
+            except VirtualMachineError:
+                # Reading past the end of the array reverts
+                break
+            slopes.append((start, rate_per_day))
+        return cls(slopes, validate=False)
+
+    @classmethod
+    def from_file(cls, path):
+        """Loads a `[{"start": ..., "ratePerDay": ...}]` JSON schedule, as
+        passed to setInflation."""
+        with open(path, encoding="utf-8") as f:
+            return cls((slope["start"], int(slope["ratePerDay"])) for slope in json.load(f))
+
+
+class FixedRate:
+    """Off-chain FixedRateRewardsSource: `rewards_per_second` since the last
+    collection, capped by the contract's balance when one is given."""
+
+    def __init__(self, rewards_per_second, balance=None):
+        self.rewards_per_second = rewards_per_second
+        self.balance = balance
+
+    def rewards(self, start, end):
+        amount = max(0, end - start) * self.rewards_per_second
+        if self.balance is not None and amount > self.balance:
+            amount = self.balance
+        return amount
+
+    def collect(self, start, end):
+        amount = self.rewards(start, end)
+        if self.balance is not None:
+            self.balance -= amount
+        return amount
+
+
+class StakingRewards:
+    """accRewardPerShare accounting of ExponentialStaking (and OgvStaking
+    while it still collected from its RewardsSource) driven by a timeline of
+    stake, unstake and collect events instead of a fork.
+
+    Like _collectRewards, the source is only collected from while there are
+    points, so rewards accrued with no stakers are paid to the first
+    collection after someone stakes.
+    """
+
+    def __init__(self, source, start, acc_reward_per_share=0):
+        self.source = source
+        self.last_collect = start
+        self.acc_reward_per_share = acc_reward_per_share
+        self.supply = 0
+        self.balances = {}
+        self.debts = {}
+        self.history = [(start, acc_reward_per_share)]
+
+    def _collect_from_source(self, timestamp):
+        if self.supply > 0 and timestamp > self.last_collect:
+            collected = self.source.collect(self.last_collect, timestamp)
+            self.last_collect = timestamp
+            self.acc_reward_per_share += collected * SHARE_PRECISION // self.supply
+            self.history.append((timestamp, self.acc_reward_per_share))
+
+    def _settle(self, user):
+        net = self.acc_reward_per_share - self.debts.get(user, 0)
+        self.debts[user] = self.acc_reward_per_share
+        return self.balances.get(user, 0) * net // SHARE_PRECISION
+
+    def collect(self, timestamp, user):
+        """Rewards paid to `user` collecting at `timestamp`."""
+        self._collect_from_source(timestamp)
+        return self._settle(user)
+
+    def stake(self, timestamp, user, points):
+        rewards = self.collect(timestamp, user)
+        self.balances[user] = self.balances.get(user, 0) + points
+        self.supply += points
+        return rewards
+
+    def unstake(self, timestamp, user, points):
+        rewards = self.collect(timestamp, user)
+        self.balances[user] -= points
+        self.supply -= points
+        return rewards
+
+    def preview(self, timestamp, user):
+        """previewRewards of `user` at `timestamp`, without collecting."""
+        acc = self.acc_reward_per_share
+        if self.supply > 0:
+            acc += self.source.rewards(self.last_collect, timestamp) * SHARE_PRECISION // self.supply
+        return self.balances.get(user, 0) * (acc - self.debts.get(user, 0)) // SHARE_PRECISION
+
+    def run(self, events):
+        """Applies (timestamp, action, user, points) events in order, where
+        action is "stake", "unstake" or "collect". Returns the rewards paid
+        by each event."""
+        paid = []
+        for timestamp, action, user, points in events:
+            if action == "collect":
+                paid.append(self.collect(timestamp, user))
+            else:
+                paid.append(getattr(self, action)(timestamp, user, points))
+        return paid
+
+    def project(self, timestamps):
+        """accRewardPerShare after a collection at each of `timestamps`."""
+        projection = []
+        for timestamp in timestamps:
+            self._collect_from_source(timestamp)
+            projection.append(self.acc_reward_per_share)
+        return projection
+
+
+def annual_rate(source, start, staked):
+    """Rewards over the year from `start` as a fraction of `staked`."""
+    return source.rewards(start, start + YEAR) / staked if staked else 0.0
+
+
+# Compares setInflation schedules over a period, run with
+# `python -m scripts.rewards_simulator <start> <end> <staked> schedule.json ...`
+def main(start, end, staked, *schedule_files):
+    start, end, staked = int(start), int(end), int(staked)
+    for path in schedule_files:
+        schedule = InflationSchedule.from_file(path)
+        print(
+            "{}\t{} slopes\trewards {}\tAPY {:.2%}".format(
+                path, len(schedule), schedule.rewards(start, end), annual_rate(schedule, start, staked)
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,163 @@
+import sys
+
+# PRBMathUD60x18 (prb-math 2.5.0) unsigned 60.18-decimal fixed point
+SCALE = 10**18
+HALF_SCALE = 5 * 10**17
+
+YEAR = 365 * 86400
+# ExponentialStaking constants
+YEAR_BASE = 14 * 10**17
+MAX_STAKE_DURATION = 365 * 86400
+
+# root(2, 2^-i) as 64.64 fixed point numbers for i in 1..64, the factors
+# PRBMath.exp2 multiplies by for each set fractional bit, highest bit first
+EXP2_FACTORS = [
+    0x16A09E667F3BCC909, 0x1306FE0A31B7152DF, 0x1172B83C7D517ADCE, 0x10B5586CF9890F62A,
+    0x1059B0D31585743AE, 0x102C9A3E778060EE7, 0x10163DA9FB33356D8, 0x100B1AFA5ABCBED61,
+    0x10058C86DA1C09EA2, 0x1002C605E2E8CEC50, 0x100162F3904051FA1, 0x1000B175EFFDC76BA,
+    0x100058BA01FB9F96D, 0x10002C5CC37DA9492, 0x1000162E525EE0547, 0x10000B17255775C04,
+    0x1000058B91B5BC9AE, 0x100002C5C89D5EC6D, 0x10000162E43F4F831, 0x100000B1721BCFC9A,
+    0x10000058B90CF1E6E, 0x1000002C5C863B73F, 0x100000162E430E5A2, 0x1000000B172183551,
+    0x100000058B90C0B49, 0x10000002C5C8601CC, 0x1000000162E42FFF0, 0x10000000B17217FBB,
+    0x1000000058B90BFCE, 0x100000002C5C85FE3, 0x10000000162E42FF1, 0x100000000B17217F8,
+    0x10000000058B90BFC, 0x1000000002C5C85FE, 0x100000000162E42FF, 0x1000000000B17217F,
+    0x100000000058B90C0, 0x10000000002C5C860, 0x1000000000162E430, 0x10000000000B17218,
+    0x1000000000058B90C, 0x100000000002C5C86, 0x10000000000162E43, 0x100000000000B1721,
+    0x10000000000058B91, 0x1000000000002C5C8, 0x100000000000162E4, 0x1000000000000B172,
+    0x100000000000058B9, 0x10000000000002C5D, 0x1000000000000162E, 0x10000000000000B17,
+    0x1000000000000058C, 0x100000000000002C6, 0x10000000000000163, 0x100000000000000B1,
+    0x10000000000000059, 0x1000000000000002C, 0x10000000000000016, 0x1000000000000000B,
+    0x10000000000000006, 0x10000000000000003, 0x10000000000000001, 0x10000000000000001,
+]
+
+
+def prb_mul(x, y):
+    """PRBMathUD60x18.mul, x * y / 1e18 rounded half up."""
+    product = x * y
+    if product >> 256 >= SCALE:
+        raise OverflowError("PRBMath__MulDivFixedPointOverflow")
+    return product // SCALE + (1 if product % SCALE >= HALF_SCALE else 0)
+
+
+def prb_log2(x):
+    """PRBMathUD60x18.log2, the binary logarithm of x >= 1e18."""
+    if x < SCALE:
+        raise ValueError("PRBMathUD60x18__LogInputTooSmall")
+    n = (x // SCALE).bit_length() - 1
+    result = n * SCALE
+    y = x >> n
+    if y == SCALE:
+        return result
+    delta = HALF_SCALE
+    while delta > 0:
+        y = y * y // SCALE
+        if y >= 2 * SCALE:
+            result += delta
+            y >>= 1
+        delta >>= 1
+    return result
+
+
+def prb_exp2(x):
+    """PRBMathUD60x18.exp2, 2^x computed in 192.64 fixed point."""
+    if x >= 192 * SCALE:
+        raise ValueError("PRBMathUD60x18__Exp2InputTooBig")
+    x192x64 = (x << 64) // SCALE
+    # Starts from 0.5, which the final shift by 191 instead of 192 undoes
+    result = 1 << 191
+    for bit, factor in zip(range(63, -1, -1), EXP2_FACTORS):
+        if x192x64 >> bit & 1:
+            result = result * factor >> 64
+    return result * SCALE >> (191 - (x192x64 >> 64))
+
+
+def prb_pow(x, y):
+    """PRBMathUD60x18.pow, x^y as 2^(log2(x) * y)."""
+    if x == 0:
+        return SCALE if y == 0 else 0
+    return prb_exp2(prb_mul(prb_log2(x), y))
+
+
+def _columns(*values):
+    # Broadcasts scalars against the sequences among `values`
+    length = max((len(value) for value in values if isinstance(value, (list, tuple))), default=1)
+    columns = []
+    for value in values:
+        if isinstance(value, (list, tuple)):
+            if len(value) != length:
+                raise ValueError("Columns must have the same length")
+            columns.append(value)
+        else:
+            columns.append([value] * length)
+    return columns
+
+
+class PointsCurve:
+    """Off-chain ExponentialStaking.previewPoints and previewWithdraw.
+
+    Results are bit exact with the contract: the PRBMath fixed point steps
+    are reproduced with integer arithmetic. log2(YEAR_BASE) is computed once
+    and each multiplier is kept per end date, so evaluating many users and
+    durations only runs exp2 once for every distinct lockup end.
+    """
+
+    def __init__(self, epoch, year_base=YEAR_BASE, max_stake_duration=MAX_STAKE_DURATION):
+        self.epoch = epoch
+        self.max_stake_duration = max_stake_duration
+        self._log2_base = prb_log2(year_base)
+        self._multipliers = {}
+
+    def multiplier(self, end):
+        """Points per 1e18 staked for a lockup ending at `end`."""
+        multiplier = self._multipliers.get(end)
+        if multiplier is None:
+            end_year_poc = (end - self.epoch) * SCALE // YEAR
+            multiplier = self._multipliers[end] = prb_exp2(prb_mul(self._log2_base, end_year_poc))
+        return multiplier
+
+    def preview_points(self, amount, duration, timestamp):
+        """(points, end) for staking `amount` for `duration` at `timestamp`."""
+        if duration > self.max_stake_duration:
+            raise ValueError("Staking: Too long")
+        end = max(timestamp, self.epoch) + duration
+        return amount * self.multiplier(end) // SCALE, end
+
+    def preview_withdraw(self, amount, end, timestamp):
+        """Amount returned when unstaking a lockup ending at `end` at
+        `timestamp`, after the early withdrawal penalty."""
+        if timestamp >= end:
+            return amount
+        full_points, _ = self.preview_points(SCALE, end - timestamp, timestamp)
+        current_points, _ = self.preview_points(SCALE, 0, timestamp)
+        return amount * current_points // full_points
+
+    def points(self, amounts, durations, timestamps):
+        """previewPoints over whole columns of amounts, durations and
+        timestamps. Any of them can be a single value shared by every row."""
+        return [
+            self.preview_points(amount, duration, timestamp)[0]
+            for amount, duration, timestamp in zip(*_columns(amounts, durations, timestamps))
+        ]
+
+    def ends(self, durations, timestamps):
+        return [max(timestamp, self.epoch) + duration for duration, timestamp in zip(*_columns(durations, timestamps))]
+
+    def withdrawals(self, amounts, ends, timestamps):
+        """previewWithdraw over whole columns of amounts, ends and timestamps."""
+        return [
+            self.preview_withdraw(amount, end, timestamp)
+            for amount, end, timestamp in zip(*_columns(amounts, ends, timestamps))
+        ]
+
+
+# Prints the points curve for 1 OGN staked now for each duration in days, run
+# with `python -m scripts.staking_points <epoch> <timestamp> 30 90 180 365`
+def main(epoch, timestamp, *days):
+    curve = PointsCurve(int(epoch))
+    durations = [int(day) * 86400 for day in days]
+    for day, points in zip(days, curve.points(SCALE, durations, int(timestamp))):
+        print("{}\t{}".format(day, points))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -2,31 +2,37 @@ from brownie import *
 import json
 import sys
 
+from scripts.manifest import load_manifest
+
+OUTPUT_FILES = {
+    1: "client/networks/governance.mainnet.json",
+    5: "client/networks/governance.goerli.json",
+}
+
 # Update governance contracts list
 def main():
-    map = json.load(open("./build/deployments/map.json"))
-
-    if map:
-        if web3.chain_id == 1:
-            contracts = map["1"]
-            output_file = "client/networks/governance.mainnet.json"
-        elif web3.chain_id == 5:
-            contracts = map["5"]
-            output_file = "client/networks/governance.goerli.json"
-        else:
-            sys.exit("Script not needed when running a local node.")
-
-        timelock = Timelock.at(contracts["Timelock"][0])
-        governance = Governance.at(contracts["Governance"][0])
-
-        output = json.load(open(output_file))
-
-        output["TimelockController"] = dict(address=timelock.address, abi=timelock.abi)
-        output["Governance"] = dict(address=governance.address, abi=governance.abi)
-
-        with open(output_file, "w+") as f:
-            json.dump(output, f, indent=2)
-        
-        sys.exit("Governance contracts list updated.")
-    else:
-        sys.exit("No map file found.")
\ No newline at end of file
+    if web3.chain_id not in OUTPUT_FILES:
+        sys.exit("Script not needed when running a local node.")
+
+    manifest = load_manifest(web3.chain_id)
+    if not manifest:
+        sys.exit("No map file found.")
+
+    output_file = OUTPUT_FILES[web3.chain_id]
+    output = json.load(open(output_file))
+
+    # Entries are only rewritten when the deployment changed
+    updated = False
+    for key, name in [("TimelockController", "Timelock"), ("Governance", "Governance")]:
+        entry = dict(address=manifest.address(name), abi=manifest.abi(name))
+        if output.get(key) != entry:
+            output[key] = entry
+            updated = True
+
+    if not updated:
+        sys.exit("Governance contracts list already up to date.")
+
+    with open(output_file, "w+") as f:
+        json.dump(output, f, indent=2)
+
+    sys.exit("Governance contracts list updated.")
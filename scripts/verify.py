@@ -1,65 +1,25 @@
 from brownie import *
-import json
 import sys
 
-# Script to verify contracts post-deployment
-def main():
-    map = json.load(open("./build/deployments/map.json"))
+from scripts.explorer import Explorer, verify_deployments
+from scripts.manifest import load_manifest
 
-    if map:
-        if web3.chain_id == 1:
-            contracts = map["1"]
-        elif web3.chain_id == 5:
-            contracts = map["5"]
-        else:
-            sys.exit("You do not have to verify using a local node.")
+# Script to verify contracts post-deployment. Contracts verified by an earlier
+# run are skipped and the rest are published concurrently.
+def main(workers=4):
+    if web3.chain_id not in (1, 5):
+        sys.exit("You do not have to verify using a local node.")
 
-        try:
-            contract_1 = ERC1967Proxy.at(contracts["ERC1967Proxy"][0])
-            ERC1967Proxy.publish_source(contract_1)
-        except Exception as e:
-            print(e)
+    manifest = load_manifest(web3.chain_id)
+    if not manifest:
+        sys.exit("No contracts deployed to verify.")
 
-        try:
-            contract_2 = Governance.at(contracts["Governance"][0])
-            Governance.publish_source(contract_2)
-        except Exception as e:
-            print(e)
+    def publish(deployment):
+        container = globals()[deployment.name]
+        return container.publish_source(container.at(deployment.address), silent=True)
 
-        try:
-            contract_3 = MandatoryLockupDistributor.at(contracts["MandatoryLockupDistributor"][0])
-            MandatoryLockupDistributor.publish_source(contract_3)
-        except Exception as e:
-            print(e)
-
-        try:
-            contract_4 = OgvStaking.at(contracts["OgvStaking"][0])
-            OgvStaking.publish_source(contract_4)
-        except Exception as e:
-            print(e)
-
-        try:
-            contract_5 = OptionalLockupDistributor.at(contracts["OptionalLockupDistributor"][0])
-            OptionalLockupDistributor.publish_source(contract_5)
-        except Exception as e:
-            print(e)
-
-        try:
-            contract_6 = OriginDollarGovernance.at(contracts["OriginDollarGovernance"][0])
-            OriginDollarGovernance.publish_source(contract_6)
-        except Exception as e:
-            print(e)
-
-        try:
-            contract_7 = RewardsSource.at(contracts["RewardsSource"][0])
-            RewardsSource.publish_source(contract_7)
-        except Exception as e:
-            print(e)
-
-        try:
-            contract_8 = Timelock.at(contracts["Timelock"][0])
-            Timelock.publish_source(contract_8)
-        except Exception as e:
-            print(e)
-    else:
-        sys.exit("No contracts deployed to verify.")
\ No newline at end of file
+    statuses = verify_deployments(manifest, publish, Explorer.for_chain(web3.chain_id), workers=int(workers))
+    for status in statuses:
+        print("{:<28} {} {}".format(status.name, status.address, status.status))
+        if status.error:
+            print("    {}".format(status.error))
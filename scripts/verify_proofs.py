@@ -0,0 +1,127 @@
+import json
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from scripts.claims_store import ClaimsStore
+from scripts.merkle_tree import leaf_hash, parse_amount, verify_proof
+
+# Below this many claims the process pool costs more than it saves
+MIN_PARALLEL_CLAIMS = 10000
+CHUNK_SIZE = 5000
+
+Failure = namedtuple("Failure", ["account", "index", "reason"])
+
+
+class VerificationResult(
+    namedtuple("VerificationResult", ["merkle_root", "total", "amount", "failures", "elapsed"])
+):
+    @property
+    def ok(self):
+        return not self.failures
+
+    @property
+    def rate(self):
+        return self.total / self.elapsed if self.elapsed else float("inf")
+
+    def report(self):
+        print(
+            "Verified {} proofs against {} in {:.2f}s ({:,.0f} proofs/s)".format(
+                self.total, self.merkle_root, self.elapsed, self.rate
+            )
+        )
+        print("Total claimable amount: {}".format(self.amount))
+        for failure in self.failures:
+            print("FAILED {} (index {}): {}".format(failure.account, failure.index, failure.reason))
+
+
+def _verify_chunk(args):
+    root, claims = args
+    failures = []
+    for account, index, amount, proof in claims:
+        try:
+            leaf = leaf_hash(index, account, amount)
+            valid = verify_proof([bytes.fromhex(node[2:]) for node in proof], root, leaf)
+        except (TypeError, ValueError, OverflowError) as e:
+            failures.append(Failure(account, index, "malformed claim: {}".format(e)))
+            continue
+        if not valid:
+            failures.append(Failure(account, index, "proof does not match merkle root"))
+    return failures
+
+
+def _chunks(claims, size):
+    for start in range(0, len(claims), size):
+        yield claims[start : start + size]
+
+
+def verify_claims(merkle_root, claims, processes=None):
+    """Checks every (account, index, amount, proof) claim against `merkle_root`
+    the same way AbstractLockupDistributor.isProofValid does.
+
+    Claims are verified in chunks across a process pool. Duplicate indexes are
+    reported as failures too, since they would share a claimed bit on chain.
+    """
+    started = time.perf_counter()
+    root = bytes.fromhex(merkle_root[2:]) if isinstance(merkle_root, str) else merkle_root
+    claims = list(claims)
+
+    failures = []
+    seen = set()
+    for account, index, _, _ in claims:
+        if index in seen:
+            failures.append(Failure(account, index, "duplicate claim index"))
+        seen.add(index)
+
+    jobs = [(root, chunk) for chunk in _chunks(claims, CHUNK_SIZE)]
+    if processes == 1 or (processes is None and len(claims) < MIN_PARALLEL_CLAIMS):
+        results = map(_verify_chunk, jobs)
+    else:
+        with ProcessPoolExecutor(processes) as executor:
+            results = list(executor.map(_verify_chunk, jobs))
+    for chunk_failures in results:
+        failures.extend(chunk_failures)
+
+    return VerificationResult(
+        "0x" + root.hex(),
+        len(claims),
+        sum(claim[2] for claim in claims),
+        failures,
+        time.perf_counter() - started,
+    )
+
+
+def load_claims(path):
+    """Returns the merkle root and claims of a `*_claims.json` file or a binary
+    claims store."""
+    if str(path).endswith(".bin"):
+        with ClaimsStore(path) as store:
+            return "0x" + store.merkle_root.hex(), [claim[:4] for claim in store]
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data["merkleRoot"], [
+        (account, claim["index"], parse_amount(claim["amount"]), claim["proof"])
+        for account, claim in data["claims"].items()
+    ]
+
+
+def verify_claims_file(path, processes=None):
+    return verify_claims(*load_claims(path), processes=processes)
+
+
+# Verifies claims files before the distributors are funded, run with
+# `python -m scripts.verify_proofs scripts/1_data/mandatory_lockup_claims.json`
+def main(*paths):
+    failed = False
+    for path in paths:
+        print(path)
+        result = verify_claims_file(path)
+        result.report()
+        failed = failed or not result.ok
+    if failed:
+        sys.exit("Some claims failed verification")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
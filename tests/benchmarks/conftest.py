@@ -0,0 +1,37 @@
+import os
+
+import pytest
+from scripts.gas_report import (
+    BASELINE_FILE,
+    REPORT_FILE,
+    GasReport,
+    compare,
+    print_changes,
+    worker_report_file,
+)
+
+
+# Collects the gas used by every benchmark in the session. The report is
+# written to build/gas-report.json (or $GAS_REPORT) and compared with the
+# stored baseline, which UPDATE_GAS_BASELINE=1 replaces instead. Each xdist
+# worker only sees part of the benchmarks, so it writes its own report for
+# scripts.gas_report to merge and never touches the baseline.
+@pytest.fixture(scope="session")
+def gas_report():
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    if worker and os.getenv("UPDATE_GAS_BASELINE"):
+        raise pytest.UsageError("Record the gas baseline in a single process, without -n")
+    report = GasReport()
+    yield report
+    if not report:
+        return
+    report_file = os.getenv("GAS_REPORT", REPORT_FILE)
+    if worker:
+        report.save(worker_report_file(report_file, worker))
+        return
+    report.save(report_file)
+    if os.getenv("UPDATE_GAS_BASELINE"):
+        report.save(BASELINE_FILE)
+    elif os.path.exists(BASELINE_FILE):
+        print()
+        print_changes(compare(GasReport.load(BASELINE_FILE), report))
@@ -0,0 +1,131 @@
+import os
+
+import pytest
+from brownie import ExponentialStaking, OptionalLockupDistributor, RewardsSource, accounts, chain
+from scripts.merkle_tree import MerkleTree, leaf_hash
+
+from ..helpers import DAY, WEEK, advance_blocks
+
+# Deploys fresh contracts for every size, so only run on request with
+# `GAS_BENCHMARK=1 brownie test tests/benchmarks -s`
+pytestmark = pytest.mark.skipif(not os.getenv("GAS_BENCHMARK"), reason="set GAS_BENCHMARK=1 to run")
+
+LOCKUP_COUNTS = [1, 10, 50]
+SLOPE_COUNTS = [1, 12, 48]
+PROOF_DEPTHS = [1, 8, 16]
+CHECKPOINT_COUNTS = [1, 10, 100]
+
+AMOUNT = 1000 * 10**18
+
+
+@pytest.fixture
+def staker(token, staking):
+    user = accounts[1]
+    token.transfer(user, AMOUNT * 1000, {"from": accounts[0]})
+    token.approve(staking, AMOUNT * 1000, {"from": user})
+    return user
+
+
+@pytest.fixture
+def exponential(token):
+    """ExponentialStaking with its own RewardsSource, funded by inflation."""
+    source = RewardsSource.deploy(token, {"from": accounts[0]})
+    xogn = ExponentialStaking.deploy(token, DAY, DAY, source, {"from": accounts[0]})
+    token.grantMinterRole(source, {"from": accounts[0]})
+    source.setRewardsTarget(xogn, {"from": accounts[0]})
+    user = accounts[2]
+    token.transfer(user, AMOUNT * 1000, {"from": accounts[0]})
+    token.approve(xogn, AMOUNT * 1000, {"from": user})
+    return xogn, source, user
+
+
+def _stake_lockups(staking, user, count):
+    for _ in range(count):
+        staking.mockStake(AMOUNT, WEEK, user, {"from": user})
+
+
+@pytest.mark.parametrize("lockups", LOCKUP_COUNTS)
+def test_ogv_staking(gas_report, staking, token, staker, lockups):
+    _stake_lockups(staking, staker, lockups)
+    # OgvStaking.stake and extend revert with StakingDisabled, mockStake is
+    # the remaining path that creates lockups
+    tx = staking.mockStake(AMOUNT, WEEK, staker, {"from": staker})
+    gas_report.record("OgvStaking.mockStake", "lockups", lockups, tx.gas_used)
+
+    # Pay out about half of AMOUNT as rewards
+    token.transfer(staking, AMOUNT, {"from": accounts[0]})
+    staking.setRewardShare(AMOUNT * 10**12 // staking.balanceOf(staker) // 2, {"from": accounts[0]})
+    tx = staking.collectRewards({"from": staker})
+    gas_report.record("OgvStaking.collectRewards", "lockups", lockups, tx.gas_used)
+
+    chain.sleep(WEEK + 1)
+    chain.mine()
+    tx = staking.unstake["uint256"](lockups, {"from": staker})
+    gas_report.record("OgvStaking.unstake", "lockups", lockups, tx.gas_used)
+    tx = staking.unstake["uint256[]"](list(range(lockups)), {"from": staker})
+    gas_report.record("OgvStaking.unstake(uint256[])", "lockups", lockups, tx.gas_used)
+
+
+@pytest.mark.parametrize("lockups", LOCKUP_COUNTS)
+def test_exponential_staking(gas_report, exponential, lockups):
+    xogn, _, user = exponential
+    for _ in range(lockups):
+        xogn.stake(AMOUNT, 30 * DAY, user, False, -1, {"from": user})
+
+    tx = xogn.stake(AMOUNT, 30 * DAY, user, False, -1, {"from": user})
+    gas_report.record("ExponentialStaking.stake", "lockups", lockups, tx.gas_used)
+    tx = xogn.stake(AMOUNT, 60 * DAY, user, False, lockups - 1, {"from": user})
+    gas_report.record("ExponentialStaking.stake(extend)", "lockups", lockups, tx.gas_used)
+    tx = xogn.unstake(lockups - 1, {"from": user})
+    gas_report.record("ExponentialStaking.unstake", "lockups", lockups, tx.gas_used)
+
+
+@pytest.mark.parametrize("slopes", SLOPE_COUNTS)
+def test_rewards_source(gas_report, exponential, slopes):
+    xogn, source, user = exponential
+    xogn.stake(AMOUNT, 30 * DAY, user, False, -1, {"from": user})
+    start = chain.time() + 10
+    source.setInflation(
+        [(start + i * DAY, 0, 1000 * 10**18) for i in range(slopes)], {"from": accounts[0]}
+    )
+    # Every slope has to be walked on the next collection
+    chain.sleep(slopes * DAY + 10)
+    chain.mine()
+    tx = xogn.collectRewards({"from": user})
+    gas_report.record("RewardsSource.collectRewards", "slopes", slopes, tx.gas_used)
+
+
+@pytest.mark.parametrize("checkpoints", CHECKPOINT_COUNTS)
+def test_governance(gas_report, governance, staking, staker, checkpoints):
+    # Each stake lands in its own block and adds a vote checkpoint
+    _stake_lockups(staking, staker, checkpoints)
+    tx = governance.propose(
+        [governance.address],
+        [0],
+        ["setVotingDelay(uint256)"],
+        ["0x" + "{:064x}".format(100)],
+        "Set voting delay",
+        {"from": staker},
+    )
+    gas_report.record("Governance.propose", "checkpoints", checkpoints, tx.gas_used)
+    advance_blocks(governance.votingDelay() + 1)
+    tx = governance.castVote(tx.return_value, 1, {"from": staker})
+    gas_report.record("Governance.castVote", "checkpoints", checkpoints, tx.gas_used)
+
+
+@pytest.mark.parametrize("depth", PROOF_DEPTHS)
+def test_optional_lockup_claim(gas_report, token, staking, depth):
+    claimer = accounts[4]
+    leaves = [leaf_hash(0, claimer.address, AMOUNT)]
+    leaves += [leaf_hash(i, "0x{:040x}".format(i), AMOUNT) for i in range(1, 2**depth)]
+    tree = MerkleTree(leaves)
+    distributor = OptionalLockupDistributor.deploy(
+        token, "0x" + tree.root.hex(), staking, chain.height + 1000, {"from": accounts[0]}
+    )
+    token.transfer(distributor, AMOUNT, {"from": accounts[0]})
+    proof = tree.hex_proof(0)
+    assert len(proof) == depth
+    # Claims that stake revert while OgvStaking.stake is disabled, so this is
+    # the only distributor path that can still be measured
+    tx = distributor.claim(0, AMOUNT, proof, 0, {"from": claimer})
+    gas_report.record("OptionalLockupDistributor.claim", "depth", depth, tx.gas_used)
@@ -0,0 +1,51 @@
+import pytest
+from scripts.gas_report import GasReport, compare, main, worker_report_file
+
+
+def _report(gas):
+    report = GasReport()
+    for size, used in gas.items():
+        report.record("OgvStaking.unstake", "lockups", size, used)
+    return report
+
+
+def test_round_trips_through_json(tmp_path):
+    report = _report({1: 50000, 10: 52000})
+    path = str(tmp_path / "gas.json")
+    report.save(path)
+    loaded = GasReport.load(path)
+    assert loaded.entries == report.entries
+    assert loaded.gas("OgvStaking.unstake lockups=10") == 52000
+
+
+def test_compare_flags_changes_beyond_tolerance():
+    baseline = _report({1: 50000, 10: 52000, 50: 60000, 100: 70000})
+    current = _report({1: 50100, 10: 54000, 50: 50000, 200: 80000})
+    statuses = {change.name: change.status for change in compare(baseline, current, tolerance=0.01)}
+    assert statuses == {
+        "OgvStaking.unstake lockups=1": "unchanged",
+        "OgvStaking.unstake lockups=10": "regression",
+        "OgvStaking.unstake lockups=50": "improvement",
+        "OgvStaking.unstake lockups=100": "removed",
+        "OgvStaking.unstake lockups=200": "new",
+    }
+
+
+def test_merges_worker_reports_and_reports_without_baseline(tmp_path, capsys):
+    report_file = str(tmp_path / "gas-report.json")
+    _report({1: 50000}).save(worker_report_file(report_file, "gw0"))
+    _report({10: 52000}).save(worker_report_file(report_file, "gw1"))
+    _report({1: 50000, 10: 52000}).save(str(tmp_path / "baseline.json"))
+    main(str(tmp_path / "gas-report-*.json"), str(tmp_path / "baseline.json"))
+
+    _report({10: 60000}).save(worker_report_file(report_file, "gw1"))
+    with pytest.raises(SystemExit, match="1 benchmarks use more gas"):
+        main(str(tmp_path / "gas-report-*.json"), str(tmp_path / "baseline.json"))
+
+    capsys.readouterr()
+    main(str(tmp_path / "gas-report-*.json"), str(tmp_path / "missing.json"))
+    output = capsys.readouterr().out
+    assert "No gas baseline" in output
+    assert output.count(" new\n") == 2
+    with pytest.raises(SystemExit, match="No gas report"):
+        main(report_file)
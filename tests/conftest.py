@@ -0,0 +1,99 @@
+import pytest
+from brownie import Governance, Timelock, accounts, run, web3
+
+from .fixtures import test_merkle_data
+from .helpers import DAY, WEEK
+
+
+@pytest.fixture(scope="module")
+def module_isolation():
+    """Replaces brownie's module_isolation, which resets the chain and would
+    throw away the session deployments.
+
+    Tests only change the chain inside `isolation`, so modules need nothing
+    of their own. Brownie's xdist runner only keeps tests that use this
+    fixture, which every test does through fn_isolation.
+    """
+    yield
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    """Snapshots the chain before each test and reverts it afterwards.
+
+    Session-scoped deployments are set up before this fixture runs, so they
+    are shared by every test while per-test changes are thrown away.
+    """
+
+
+# The contract fixtures below are deployed once per session. They live here
+# rather than in a module the tests import from, since every module importing
+# a fixture gets its own copy of it and would deploy again. Every test runs
+# inside a chain snapshot (see `isolation` above), so any state a test changes
+# is reverted before the next one starts.
+@pytest.fixture(scope="session")
+def token():
+    accounts.default = accounts[0]
+    return run("deploy_token")
+
+
+@pytest.fixture(scope="session")
+def rewards(token):
+    return run("deploy_rewards", "main", (token.address,))
+
+
+@pytest.fixture(scope="session")
+def staking(token, rewards):
+    return run("deploy_staking", "main", (token.address, DAY, rewards.address, True))
+
+@pytest.fixture
+def whale_voter(token, staking):
+    """Creates a user who is staked and ready to vote with more than quorum power."""
+    voter = accounts[3]
+    amount = int(1e9) * int(1e18)
+    token.approve(staking.address, amount) # Uses coins from default address
+    staking.mockStake(amount, WEEK * 52 * 4, voter)
+    return voter
+
+@pytest.fixture(scope="session")
+def timelock_controller():
+    return accounts[0].deploy(Timelock, [accounts[0]], [accounts[0]])
+
+
+@pytest.fixture(scope="session")
+def governance(staking, timelock_controller, web3):
+    governance = accounts[0].deploy(Governance, staking, timelock_controller)
+    timelock_controller.grantRole(web3.keccak(text="PROPOSER_ROLE"), governance)
+    timelock_controller.grantRole(web3.keccak(text="EXECUTOR_ROLE"), governance)
+    timelock_controller.grantRole(web3.keccak(text="CANCELLER_ROLE"), governance)
+    return governance
+
+
+@pytest.fixture(scope="session")
+def optional_lockup_distributor(token, staking, web3):
+    return run(
+        "deploy_optional_lockup_distributor",
+        "main",
+        # web3.eth.block_number + 100 -> set end_block to 100 blocks after the current block
+        (
+            token.address,
+            test_merkle_data["merkle_root"],
+            staking.address,
+            web3.eth.block_number + 100,
+        ),
+    )
+
+
+@pytest.fixture(scope="session")
+def mandatory_lockup_distributor(token, staking):
+    return run(
+        "deploy_mandatory_lockup_distributor",
+        "main",
+        # web3.eth.block_number + 100 -> set end_block to 100 blocks after the current block
+        (
+            token.address,
+            test_merkle_data["merkle_root"],
+            staking.address,
+            web3.eth.block_number + 100,
+        ),
+    )
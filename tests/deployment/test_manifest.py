@@ -0,0 +1,42 @@
+import json
+
+import pytest
+from scripts.manifest import DeploymentManifest, load_manifest
+
+GOVERNANCE = "0x3cdD07c16614059e66344a7b579DAB4f9516C0b6"
+
+
+def test_reads_mainnet_deployments():
+    manifest = DeploymentManifest(1)
+    assert "Governance" in manifest
+    assert manifest.address("Governance") == manifest.addresses("Governance")[0]
+    assert GOVERNANCE in manifest.addresses("Governance")
+    assert manifest.name(GOVERNANCE.lower()) == "Governance"
+    assert [deployment.name for deployment in manifest] == manifest.names()
+
+
+def test_abi_is_loaded_once(tmp_path):
+    deployments = tmp_path / "deployments"
+    (deployments / "1").mkdir(parents=True)
+    address = "0x" + "ab" * 20
+    checksummed = "0xABaBaBaBABabABabAbAbABAbABabababaBaBABaB"
+    (deployments / "map.json").write_text(json.dumps({"1": {"Token": [address]}}))
+    artifact = deployments / "1" / (checksummed + ".json")
+    artifact.write_text(json.dumps({"abi": [{"type": "function", "name": "name"}]}))
+
+    manifest = DeploymentManifest(1, str(tmp_path))
+    assert manifest.address("Token") == checksummed
+    abi = manifest.abi("Token")
+    artifact.unlink()
+    assert manifest.abi(address) is abi
+
+
+def test_unknown_chain_is_empty(tmp_path):
+    manifest = DeploymentManifest(31337, str(tmp_path))
+    assert not manifest
+    with pytest.raises(KeyError):
+        manifest.address("Governance")
+
+
+def test_load_manifest_is_cached():
+    assert load_manifest(1) is load_manifest(1)
@@ -0,0 +1,83 @@
+import threading
+
+from scripts.explorer import Explorer, VerifiedCache, verify_deployments
+from scripts.manifest import Deployment
+
+from ..local_explorer import LocalExplorer
+
+DEPLOYMENTS = [Deployment(1, "Contract{}".format(i), "0x{:040x}".format(i + 1)) for i in range(8)]
+
+
+class Publisher:
+    """Publishes to a LocalExplorer, failing the first `failures` attempts
+    for each address.
+
+    With `wait_for`, calls block until that many are in flight at once, so
+    `concurrent` is only set when the publisher really runs in parallel.
+    """
+
+    def __init__(self, explorer, failures=0, wait_for=None):
+        self.explorer = explorer
+        self.failures = failures
+        self.wait_for = wait_for
+        self.concurrent = threading.Event()
+        self.attempts = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, deployment):
+        with self._lock:
+            self.attempts[deployment.address] = self.attempts.get(deployment.address, 0) + 1
+            attempt = self.attempts[deployment.address]
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            if self.in_flight == self.wait_for:
+                self.concurrent.set()
+        if self.wait_for:
+            self.concurrent.wait(timeout=5)
+        with self._lock:
+            self.in_flight -= 1
+        if attempt <= self.failures:
+            raise RuntimeError("explorer unavailable")
+        self.explorer.verified.add(deployment.address)
+        return True
+
+
+def test_verifies_concurrently_with_bounded_parallelism(tmp_path):
+    with LocalExplorer() as local:
+        publisher = Publisher(local, wait_for=3)
+        cache = VerifiedCache(str(tmp_path / "verified.json"))
+        statuses = verify_deployments(DEPLOYMENTS, publisher, Explorer(local.url), cache, workers=3)
+    assert {status.status for status in statuses} == {"verified"}
+    assert publisher.concurrent.is_set()
+    assert publisher.max_in_flight <= 3
+    assert local.verified == {deployment.address for deployment in DEPLOYMENTS}
+
+
+def test_skips_contracts_verified_before(tmp_path):
+    path = str(tmp_path / "verified.json")
+    with LocalExplorer(verified=[DEPLOYMENTS[0].address]) as local:
+        publisher = Publisher(local)
+        first = verify_deployments(DEPLOYMENTS[:4], publisher, Explorer(local.url), VerifiedCache(path))
+        assert [status.status for status in first] == ["already verified", "verified", "verified", "verified"]
+
+        # A second run only looks at contracts deployed since
+        local.lookups.clear()
+        second = verify_deployments(DEPLOYMENTS, publisher, Explorer(local.url), VerifiedCache(path))
+    assert [status.status for status in second[:4]] == ["skipped"] * 4
+    assert [status.status for status in second[4:]] == ["verified"] * 4
+    assert sorted(local.lookups) == sorted(deployment.address for deployment in DEPLOYMENTS[4:])
+    assert all(publisher.attempts[deployment.address] == 1 for deployment in DEPLOYMENTS[1:])
+
+
+def test_retries_failed_verifications(tmp_path):
+    with LocalExplorer() as local:
+        publisher = Publisher(local, failures=2)
+        cache = VerifiedCache(str(tmp_path / "verified.json"))
+        retried = verify_deployments(DEPLOYMENTS[:2], publisher, Explorer(local.url), cache, retries=2, backoff=0)
+        failed = verify_deployments(DEPLOYMENTS[2:4], Publisher(local, failures=3), None, cache, retries=2, backoff=0)
+    assert [status.status for status in retried] == ["verified", "verified"]
+    assert [status.status for status in failed] == ["failed", "failed"]
+    assert failed[0].error == "explorer unavailable"
+    assert DEPLOYMENTS[2] not in VerifiedCache(str(tmp_path / "verified.json"))
@@ -0,0 +1,69 @@
+from brownie import OptionalLockupDistributor, accounts, web3
+from scripts.claim_status import CLAIMS_PER_WORD, Claim, is_claimed, load_claims, scan, word_slot
+from scripts.merkle_tree import MerkleTree, generate
+from scripts.multicall import JsonRpc
+
+from ..local_rpc import LocalRpc
+
+DISTRIBUTOR = "0x" + "ab" * 20
+CLAIMED = {0, 5, 255, 256, 700, 1199}
+
+
+def _claims(count=1200):
+    return [Claim("0x{:040x}".format(i + 1), i, (i + 1) * 10**18) for i in range(count)]
+
+
+def _storage(claimed):
+    words = {}
+    for index in claimed:
+        slot = word_slot(index // CLAIMS_PER_WORD)
+        words[slot] = words.get(slot, 0) | 1 << (index % CLAIMS_PER_WORD)
+
+    def get_storage_at(address, slot, block):
+        assert address == DISTRIBUTOR and block == hex(100)
+        return "0x{:064x}".format(words.get(slot, 0))
+
+    return LocalRpc({"eth_getStorageAt": get_storage_at})
+
+
+def test_reads_256_claims_per_storage_word():
+    claims = _claims()
+    with _storage(CLAIMED) as local:
+        rpc = JsonRpc(local.url)
+        report = scan(rpc, DISTRIBUTOR, claims, 100, batch_size=2)
+
+    assert {claim.index for claim in report.claimed} == CLAIMED
+    assert len(report.unclaimed) == len(claims) - len(CLAIMED)
+    assert report.claimed_amount == sum((index + 1) * 10**18 for index in CLAIMED)
+    assert report.claimed_amount + report.unclaimed_amount == sum(claim.amount for claim in claims)
+    # 5 words, sent 2 at a time
+    assert len(local.calls) == 5
+    assert rpc.requests == 3
+
+    assert is_claimed({1: 1}, 256) and not is_claimed({1: 1}, 257) and not is_claimed({}, 0)
+
+
+def test_loads_claims_files(tmp_path):
+    claims_file = str(tmp_path / "claims.json")
+    tree = generate("./scripts/31337_data/optional_lockup_accounts.json", claims_file)
+    claims = load_claims(claims_file)
+    assert [claim.index for claim in claims] == list(range(len(tree)))
+
+
+def test_matches_is_claimed(token, staking):
+    amount = 10**18
+    leaves = [(index, accounts[index % 3].address, amount) for index in [3, 300, 301, 512]]
+    tree = MerkleTree.from_claims(leaves)
+    distributor = OptionalLockupDistributor.deploy(
+        token, tree.root, staking, web3.eth.block_number + 100, {"from": accounts[0]}
+    )
+    token.transfer(distributor, amount * len(leaves), {"from": accounts[0]})
+    for position in [1, 3]:
+        index, account, _ = leaves[position]
+        distributor.claim(index, amount, tree.hex_proof(position), 0, {"from": account})
+
+    claims = [Claim(account, index, amount) for index, account, amount in leaves]
+    report = scan(JsonRpc(web3.provider.endpoint_uri), distributor.address, claims, web3.eth.block_number)
+    assert [claim.index for claim in report.claimed] == [index for index, _, _ in leaves if distributor.isClaimed(index)]
+    assert [claim.index for claim in report.claimed] == [300, 512]
+    assert report.unclaimed_amount == token.balanceOf(distributor)
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+from scripts.claims_store import ClaimsStore, write_store_from_claims_file
+from scripts.merkle_tree import generate, parse_amount
+from scripts.retroactive.outputs import write_outputs
+
+CLAIMS_FILE = "./scripts/31337_data/optional_lockup_claims.json"
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / "claims.bin"
+    write_store_from_claims_file(CLAIMS_FILE, path)
+    with ClaimsStore(path) as store:
+        yield store
+
+
+def test_lookup_matches_claims_file(store):
+    expected = json.load(open(CLAIMS_FILE))
+    assert "0x" + store.merkle_root.hex() == expected["merkleRoot"]
+    assert len(store) == len(expected["claims"])
+    for account, data in expected["claims"].items():
+        claim = store[account.lower()]
+        assert claim.account == account
+        assert claim.index == data["index"]
+        assert claim.amount == int(data["amount"]["hex"], 16)
+        assert claim.proof == data["proof"]
+        assert claim.split == {source: parse_amount(amount) for source, amount in data["split"].items()}
+
+
+def test_missing_account(store):
+    missing = "0x000000000000000000000000000000000000dEaD"
+    assert missing not in store
+    assert store.get(missing) is None
+    with pytest.raises(KeyError):
+        store[missing]
+
+
+def test_export_round_trip(store, tmp_path):
+    output = tmp_path / "claims.json"
+    store.export_json(output)
+    exported = json.load(open(output))
+    expected = json.load(open(CLAIMS_FILE))
+    assert exported["merkleRoot"] == expected["merkleRoot"]
+    assert list(exported["claims"]) == list(expected["claims"])
+    for account, data in exported["claims"].items():
+        assert data["proof"] == expected["claims"][account]["proof"]
+        assert int(data["amount"]["hex"], 16) == int(expected["claims"][account]["amount"]["hex"], 16)
+        assert {source: parse_amount(amount) for source, amount in data["split"].items()} == {
+            source: parse_amount(amount) for source, amount in expected["claims"][account]["split"].items()
+        }
+
+
+def test_export_reproduces_generated_claims_file(tmp_path):
+    claims = json.load(open(CLAIMS_FILE))["claims"]
+    accounts = {
+        account: {
+            "amount": parse_amount(claim["amount"]),
+            "split": {source: parse_amount(amount) for source, amount in claim["split"].items()},
+        }
+        for account, claim in claims.items()
+    }
+    write_outputs(accounts, tmp_path / "accounts.json")
+    generate(tmp_path / "accounts.json", tmp_path / "claims.json")
+    write_store_from_claims_file(tmp_path / "claims.json", tmp_path / "claims.bin")
+    with ClaimsStore(tmp_path / "claims.bin") as store:
+        assert store.sources == ["ogn", "ognStaking", "ousd3Crv", "ousd3CrvGauge", "convex"]
+        store.export_json(tmp_path / "exported.json")
+    assert (tmp_path / "exported.json").read_bytes() == (tmp_path / "claims.json").read_bytes()
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+from scripts.merkle_tree import (
+    MerkleTree,
+    build_tree,
+    generate,
+    leaf_hash,
+    parse_amount,
+    verify_proof,
+    write_claims,
+)
+
+DATA_DIR = "./scripts/31337_data"
+
+
+def _accounts(count):
+    return {
+        "0x{:040x}".format(i + 1): {"amount": {"type": "BigNumber", "hex": hex((i + 1) * 10**18)}}
+        for i in range(count)
+    }
+
+
+def test_matches_generated_claims_file(tmp_path):
+    accounts = json.load(open(f"{DATA_DIR}/optional_lockup_accounts.json"))
+    expected = json.load(open(f"{DATA_DIR}/optional_lockup_claims.json"))
+
+    tree = build_tree(accounts)
+    assert "0x" + tree.root.hex() == expected["merkleRoot"]
+
+    output = tmp_path / "claims.json"
+    write_claims(output, accounts, tree)
+    assert json.load(open(output)) == expected
+
+    # The indented accounts file is loaded whole rather than line by line
+    generate(f"{DATA_DIR}/optional_lockup_accounts.json", tmp_path / "generated.json")
+    assert json.load(open(tmp_path / "generated.json")) == expected
+
+
+@pytest.mark.parametrize("count", [1, 2, 5, 8, 33])
+def test_every_proof_verifies(count):
+    accounts = _accounts(count)
+    tree = build_tree(accounts)
+    assert len(tree) == count
+    for index, (account, data) in enumerate(accounts.items()):
+        leaf = leaf_hash(index, account, parse_amount(data["amount"]))
+        assert tree.leaf(index) == leaf
+        assert verify_proof(tree.proof(index), tree.root, leaf)
+        assert not verify_proof(tree.proof(index), tree.root, leaf_hash(index, account, 1))
+
+
+def test_odd_node_is_promoted():
+    # Five leaves: the last one has no sibling on the first two levels
+    tree = build_tree(_accounts(5))
+    assert len(tree.proof(4)) == 1
+    assert len(tree.proof(0)) == 3
+
+
+def test_rejects_empty_tree():
+    with pytest.raises(ValueError):
+        MerkleTree(b"")
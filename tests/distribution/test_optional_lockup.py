@@ -2,12 +2,6 @@ import pytest
 from brownie import *
 import brownie
 from ..helpers import WEEK
-from ..fixtures import (
-    optional_lockup_distributor,
-    token,
-    staking,
-    rewards,
-)
 
 merkle_proof = [
     0xC06E0D1A35007D9401AB64B2EDB9CD0A674EBCCE35ACBF4C93E1193F99DF35D3,
@@ -0,0 +1,50 @@
+from scripts.merkle_tree import build_tree, parse_amount
+from scripts.verify_proofs import verify_claims, verify_claims_file
+
+CLAIMS_FILE = "./scripts/31337_data/optional_lockup_claims.json"
+
+
+def _claims(count):
+    accounts = {
+        "0x{:040x}".format(i + 1): {"amount": hex((i + 1) * 10**18)} for i in range(count)
+    }
+    tree = build_tree(accounts)
+    claims = [
+        (account, index, parse_amount(data["amount"]), tree.hex_proof(index))
+        for index, (account, data) in enumerate(accounts.items())
+    ]
+    return tree.root, claims
+
+
+def test_claims_file_verifies():
+    result = verify_claims_file(CLAIMS_FILE)
+    assert result.ok
+    assert result.total == 2
+
+
+def test_reports_bad_proofs():
+    root, claims = _claims(20)
+    account, index, amount, proof = claims[3]
+    claims[3] = (account, index, amount + 1, proof)
+    account, index, amount, proof = claims[7]
+    claims[7] = (account, 3, amount, proof)
+
+    result = verify_claims(root, claims, processes=1)
+    assert not result.ok
+    assert result.total == 20
+    assert {(f.account, f.reason) for f in result.failures} == {
+        (claims[3][0], "proof does not match merkle root"),
+        (claims[7][0], "duplicate claim index"),
+        (claims[7][0], "proof does not match merkle root"),
+    }
+
+
+def test_process_pool_matches_serial():
+    root, claims = _claims(300)
+    account, index, amount, proof = claims[150]
+    claims[150] = (account, index + 1, amount, proof)
+
+    serial = verify_claims(root, claims, processes=1)
+    parallel = verify_claims(root, claims, processes=2)
+    assert parallel.failures == serial.failures
+    assert parallel.amount == serial.amount
@@ -1,7 +1,3 @@
-import pytest
-from brownie import *
-from .helpers import DAY, WEEK
-
 test_merkle_data = {
     "merkle_root": "0x362525d914142d116c518263e481c6cbe968a44638f9faeffb01c11a84008b96",
     "token_total": "0x0813f3978f89409844000000",
@@ -120,71 +116,3 @@ def show_transfers(tx, token, staking, distributor_contract):
                     ]
                 )
             )
-
-
-@pytest.fixture
-def token():
-    accounts.default = accounts[0]
-    return run("deploy_token")
-
-
-@pytest.fixture
-def rewards(token):
-    return run("deploy_rewards", "main", (token.address,))
-
-
-@pytest.fixture
-def staking(token, rewards):
-    return run("deploy_staking", "main", (token.address, DAY, rewards.address, True))
-
-@pytest.fixture
-def whale_voter(token, staking):
-    """Creates a user who is staked and ready to vote with more than quorum power."""
-    voter = accounts[3]
-    amount = int(1e9) * int(1e18)
-    token.approve(staking.address, amount) # Uses coins from default address
-    staking.mockStake(amount, WEEK * 52 * 4, voter)
-    return voter
-
-@pytest.fixture
-def timelock_controller():
-    return accounts[0].deploy(Timelock, [accounts[0]], [accounts[0]])
-
-
-@pytest.fixture
-def governance(staking, timelock_controller, web3):
-    governance = accounts[0].deploy(Governance, staking, timelock_controller)
-    timelock_controller.grantRole(web3.keccak(text="PROPOSER_ROLE"), governance)
-    timelock_controller.grantRole(web3.keccak(text="EXECUTOR_ROLE"), governance)
-    timelock_controller.grantRole(web3.keccak(text="CANCELLER_ROLE"), governance)
-    return governance
-
-
-@pytest.fixture
-def optional_lockup_distributor(token, staking, web3):
-    return run(
-        "deploy_optional_lockup_distributor",
-        "main",
-        # web3.eth.block_number + 100 -> set end_block to 100 blocks after the current block
-        (
-            token.address,
-            test_merkle_data["merkle_root"],
-            staking.address,
-            web3.eth.block_number + 100,
-        ),
-    )
-
-
-@pytest.fixture
-def mandatory_lockup_distributor(token, staking):
-    return run(
-        "deploy_mandatory_lockup_distributor",
-        "main",
-        # web3.eth.block_number + 100 -> set end_block to 100 blocks after the current block
-        (
-            token.address,
-            test_merkle_data["merkle_root"],
-            staking.address,
-            web3.eth.block_number + 100,
-        ),
-    )
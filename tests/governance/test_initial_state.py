@@ -1,7 +1,5 @@
 from brownie import accounts
 
-from ..fixtures import governance, timelock_controller, token, staking, rewards
-
 
 def test_name(governance):
     assert governance.name() == "Origin DeFi Governance"
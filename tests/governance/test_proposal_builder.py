@@ -0,0 +1,100 @@
+import pytest
+from brownie import web3
+from scripts.proposal_builder import (
+    PROPOSE_SIGNATURE,
+    argument_types,
+    build_proposal,
+    encode_arguments,
+    load_abi,
+    selector,
+)
+
+
+OGV_PROXY = "0x9c354503C38481a7A7a51629142963F98eCC12D0"
+VEOGV_PROXY = "0x0C4576Ca1c365868E162554AF8e385dc3e7C66D9"
+GOVERNANCE = "0x3cdD07c16614059e66344a7b579DAB4f9516C0b6"
+IMPLEMENTATION = "0x16156A06BD1BD2D80134EA1EE7E5FAEBDBFA20AA"
+
+# The four actions of deploy_005_rebranding
+REBRANDING_ACTIONS = [
+    {"contract": VEOGV_PROXY, "signature": "upgradeTo(address)", "args": [IMPLEMENTATION]},
+    {"contract": OGV_PROXY, "signature": "upgradeTo(address)", "args": [IMPLEMENTATION]},
+    {"contract": GOVERNANCE, "signature": "setVotingPeriod(uint256)", "args": [7200.0 * 2]},
+    {"contract": GOVERNANCE, "signature": "setLateQuorumVoteExtension(uint64)", "args": [7200.0]},
+]
+
+
+def test_selectors():
+    assert selector("upgradeTo(address)").hex() == "3659cfe6"
+    assert selector(PROPOSE_SIGNATURE).hex() == "da95691a"
+
+
+def test_argument_types():
+    assert argument_types("upgradeTo(address)") == ("address",)
+    assert argument_types("pause()") == ()
+    assert argument_types("f(uint256,(address,bytes)[],bool)") == (
+        "uint256",
+        "(address,bytes)[]",
+        "bool",
+    )
+
+
+def test_encodes_rebranding_actions():
+    proposal = build_proposal(REBRANDING_ACTIONS, "Rebrand")
+    assert proposal.targets == [VEOGV_PROXY, OGV_PROXY, GOVERNANCE, GOVERNANCE]
+    assert proposal.values == [0, 0, 0, 0]
+    assert proposal.calldatas[0] == bytes(12) + bytes.fromhex(IMPLEMENTATION[2:])
+    assert proposal.calldatas[2] == (14400).to_bytes(32, "big")
+    assert proposal.calldatas[3] == (7200).to_bytes(32, "big")
+    assert proposal.data.startswith("0xda95691a")
+
+
+def test_proposal_id_is_deterministic():
+    first = build_proposal(REBRANDING_ACTIONS, "Rebrand")
+    second = build_proposal(REBRANDING_ACTIONS, "Rebrand")
+    other = build_proposal(REBRANDING_ACTIONS, "Rebrand again")
+    assert first.proposal_id == second.proposal_id
+    assert first.proposal_id != other.proposal_id
+
+
+def test_rejects_unknown_signature():
+    class Target:
+        address = GOVERNANCE
+        abi = load_abi(GOVERNANCE)
+
+    with pytest.raises(ValueError, match="has no function"):
+        build_proposal([{"contract": Target, "signature": "setVotingPeriod(uint64)", "args": [1]}], "")
+
+
+def test_rejects_wrong_argument_count():
+    with pytest.raises(ValueError, match="takes 1 arguments"):
+        build_proposal([{"contract": GOVERNANCE, "signature": "upgradeTo(address)", "args": []}], "")
+
+
+def test_encodes_hex_strings_as_bytes():
+    assert encode_arguments("f(bytes)", ["0x1234"]) == encode_arguments("f(bytes)", [b"\x12\x34"])
+    assert encode_arguments("f(bytes[])", [["0x", "0xabc"]]) == encode_arguments("f(bytes[])", [[b"", b"\x0a\xbc"]])
+    # brownie pads a short bytesN on the left, as a number
+    assert encode_arguments("f(bytes32)", ["0x1234"]) == (0x1234).to_bytes(32, "big")
+    assert encode_arguments("f(bytes4)", [b"\x12"]) == (0x12).to_bytes(4, "big") + b"\0" * 28
+
+
+def test_matches_governor(governance, whale_voter):
+    actions = [
+        {"contract": governance, "signature": "setVotingDelay(uint256)", "args": [100]},
+        {"contract": governance, "signature": "setVotingPeriod(uint256)", "args": [7200.0 * 2]},
+    ]
+    proposal = build_proposal(actions, "Set voting delay and period")
+    full_calldatas = [
+        selector(signature) + calldata
+        for signature, calldata in zip(proposal.signatures, proposal.calldatas)
+    ]
+    assert proposal.proposal_id == governance.hashProposal(
+        proposal.targets,
+        proposal.values,
+        full_calldatas,
+        web3.keccak(text=proposal.description),
+    )
+
+    tx = whale_voter.transfer(governance.address, data=proposal.data)
+    assert tx.events["ProposalCreated"]["proposalId"] == proposal.proposal_id
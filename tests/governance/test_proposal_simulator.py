@@ -0,0 +1,51 @@
+import pytest
+from brownie import chain
+from scripts.proposal_builder import build_proposal
+from scripts.proposal_simulator import ProposalSimulator
+
+
+def _voting_delay_proposal(governance, delay):
+    return build_proposal(
+        [{"contract": governance, "signature": "setVotingDelay(uint256)", "args": [delay]}],
+        "Set voting delay to {}".format(delay),
+    )
+
+
+@pytest.fixture
+def simulator(governance, whale_voter):
+    # Brownie holds one snapshot and the simulator takes it over, so the one
+    # fn_isolation reverts to after the test is put back, or the whale's
+    # stake would outlive the test
+    isolation_snapshot = chain._snapshot_id
+    yield ProposalSimulator(governance, proposer=whale_voter.address)
+    chain._snapshot_id = isolation_snapshot
+
+
+def test_simulates_proposal_and_reverts(governance, simulator):
+    voting_delay = governance.votingDelay()
+    result = simulator.simulate(
+        _voting_delay_proposal(governance, 100),
+        watch=[("votingDelay", governance.votingDelay)],
+    )
+    assert result.ok
+    assert set(result.gas) == {"propose", "vote", "queue", "execute"}
+    assert all(gas_used > 0 for gas_used in result.gas.values())
+    assert result.diffs == {"votingDelay": (voting_delay, 100)}
+    assert governance.votingDelay() == voting_delay
+
+
+def test_reuses_snapshot_for_many_proposals(governance, simulator):
+    results = [
+        simulator.simulate(_voting_delay_proposal(governance, delay)) for delay in (10, 20, 10)
+    ]
+    assert all(result.ok for result in results)
+    # Identical proposals get the same id and gas since each run starts from
+    # the same state
+    assert results[0].proposal_id == results[2].proposal_id
+    assert results[0].gas == results[2].gas
+
+
+def test_keep_leaves_proposal_executed(governance, simulator):
+    result = simulator.simulate(_voting_delay_proposal(governance, 42), keep=True)
+    assert result.ok
+    assert governance.votingDelay() == 42
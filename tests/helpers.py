@@ -1,4 +1,4 @@
-from brownie import chain
+from common import advance_chain
 
 H = 3600
 DAY = 86400
@@ -22,10 +22,14 @@ def floor_week(timestamp):
     return timestamp - (timestamp % WEEK)
 
 
-# Mine `amount` blocks using hardhat_mine, defaults to the length of the governance
+def advance_blocks(blocks, interval=1):
+    """Mines `blocks` blocks `interval` seconds apart in a single RPC jump."""
+    return advance_chain(blocks, blocks * interval, silent=True)
+
+
+# Mine `amount` + 1 blocks in one jump, defaults to the length of the governance
 # voting period (17280 blocks +1 or ~3 days )
 def mine_blocks(web3, amount="0x4381", interval="0x1"):
-    web3.provider.make_request("hardhat_mine", [amount, interval])
-    # Using hardhat_mine seems to break the 0 base fee
-    web3.provider.make_request("hardhat_setNextBlockBaseFeePerGas", ["0x0"])
-    chain.mine()
+    amount = int(amount, 16) if isinstance(amount, str) else amount
+    interval = int(interval, 16) if isinstance(interval, str) else interval
+    return advance_blocks(amount + 1, interval)
@@ -0,0 +1,52 @@
+from scripts.retroactive.contracts import ZERO_ADDRESS, event_topic
+
+ALICE = "0x4370823e0453BAe9F6B6b790daA7D02Fd158719f"
+BOB = "0x8dea6Ef7767e0D6ae7Dd9D144E514D7DFAe75B36"
+CAROL = "0xE8F8B89D408C236f3FbA18898eAd345070252abA"
+
+STAKE = "Stake(address,uint256,uint256,uint256,uint256)"
+UNSTAKE = "Unstake(address,uint256,uint256,uint256,uint256)"
+DELEGATE_CHANGED = "DelegateChanged(address,address,address)"
+DELEGATE_VOTES_CHANGED = "DelegateVotesChanged(address,uint256,uint256)"
+
+
+def topic(value):
+    if isinstance(value, int):
+        return "0x{:064x}".format(value)
+    return "0x" + "0" * 24 + value[2:].lower()
+
+
+def make_log(signature, block_number, log_index, indexed=(), data=(), address=None):
+    """A raw RPC log of `signature` with address or uint topics and data
+    given as uint words or already encoded bytes."""
+    if not isinstance(data, bytes):
+        data = b"".join(word.to_bytes(32, "big") for word in data)
+    log = {
+        "blockNumber": hex(block_number),
+        "logIndex": hex(log_index),
+        "topics": [event_topic(signature)] + [topic(value) for value in indexed],
+        "data": "0x" + data.hex(),
+    }
+    if address is not None:
+        log["address"] = address
+    return log
+
+
+def voting_history():
+    """Alice and Bob stake, Bob delegates to Alice, Alice unstakes."""
+    return [
+        make_log(STAKE, 10, 0, [ALICE], [0, 100, 1000, 300]),
+        make_log(DELEGATE_CHANGED, 10, 1, [ALICE, ZERO_ADDRESS, ALICE]),
+        make_log(DELEGATE_VOTES_CHANGED, 10, 2, [ALICE], [0, 300]),
+        make_log(STAKE, 20, 0, [BOB], [0, 50, 1000, 200]),
+        make_log(DELEGATE_CHANGED, 20, 1, [BOB, ZERO_ADDRESS, BOB]),
+        make_log(DELEGATE_VOTES_CHANGED, 20, 2, [BOB], [0, 200]),
+        make_log(DELEGATE_CHANGED, 30, 0, [BOB, BOB, ALICE]),
+        make_log(DELEGATE_VOTES_CHANGED, 30, 1, [BOB], [200, 0]),
+        make_log(DELEGATE_VOTES_CHANGED, 30, 2, [ALICE], [300, 500]),
+        make_log(STAKE, 40, 0, [CAROL], [0, 10, 1000, 20]),
+        make_log(DELEGATE_CHANGED, 40, 1, [CAROL, ZERO_ADDRESS, CAROL]),
+        make_log(DELEGATE_VOTES_CHANGED, 40, 2, [CAROL], [0, 20]),
+        make_log(UNSTAKE, 50, 0, [ALICE], [0, 100, 1000, 300]),
+        make_log(DELEGATE_VOTES_CHANGED, 50, 1, [ALICE], [500, 200]),
+    ]
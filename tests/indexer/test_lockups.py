@@ -0,0 +1,75 @@
+from brownie import ExponentialStaking, accounts, chain, web3
+from scripts.indexer.lockups import Lockup, LockupIndex
+from scripts.staking_points import PointsCurve
+
+from ..helpers import DAY
+from .logs import ALICE, BOB, STAKE, UNSTAKE, make_log
+
+EPOCH = DAY
+
+
+def _index(curve=None):
+    index = LockupIndex(curve)
+    index.apply_logs(
+        [
+            make_log(STAKE, 10, 0, [ALICE], [0, 100, EPOCH + 100 * DAY, 110]),
+            make_log(STAKE, 11, 0, [ALICE], [1, 10**18, EPOCH + 200 * DAY, 180]),
+            make_log(STAKE, 12, 0, [BOB], [0, 50, EPOCH + 30 * DAY, 55]),
+            # Alice extends lockup 0 and unstakes Bob's
+            make_log(UNSTAKE, 20, 0, [ALICE], [0, 100, EPOCH + 100 * DAY, 110]),
+            make_log(STAKE, 20, 1, [ALICE], [0, 100, EPOCH + 300 * DAY, 300]),
+            make_log(UNSTAKE, 21, 0, [BOB], [0, 50, EPOCH + 30 * DAY, 55]),
+        ],
+        21,
+    )
+    return index
+
+
+def test_keeps_open_lockups():
+    index = _index()
+    assert index.lockups(ALICE.lower()) == [
+        Lockup(0, 100, EPOCH + 300 * DAY, 300),
+        Lockup(1, 10**18, EPOCH + 200 * DAY, 180),
+    ]
+    assert index.lockups_count(ALICE) == 2
+    assert index.lockups(BOB) == []
+    assert index.lockups_count(BOB) == 1
+    assert BOB not in index
+    assert len(index) == 1
+    assert [lockup.lockup_id for _, lockup in index.expiring(EPOCH, EPOCH + 250 * DAY)] == [1]
+
+
+def test_portfolio_prices_early_withdrawals():
+    portfolio = _index(PointsCurve(EPOCH)).portfolio(ALICE, EPOCH + 100 * DAY)
+    # testEarlyUnstake in ExponentialStaking.t.sol
+    assert portfolio.withdrawals[1] == 911937178579591520
+    assert portfolio.amount == 10**18 + 100
+    assert portfolio.points == 480
+    assert portfolio.withdraw_value == sum(portfolio.withdrawals)
+
+    # Without a curve withdrawals are never penalised, like OgvStaking
+    portfolio = _index().portfolio(ALICE, EPOCH + 100 * DAY)
+    assert portfolio.withdrawals == [100, 10**18]
+
+
+def test_matches_exponential_staking(token, rewards):
+    alice = accounts[0]
+    staking = ExponentialStaking.deploy(token, EPOCH, DAY, rewards, {"from": alice})
+    start = chain.height + 1
+    token.approve(staking, 10**24, {"from": alice})
+    for days in [30, 90, 180, 365]:
+        staking.stake(10**20, days * DAY, alice, False, -1, {"from": alice})
+    staking.stake(10**20, 200 * DAY, alice, False, 1, {"from": alice})
+    staking.unstake(2, {"from": alice})
+    chain.mine()
+
+    index = LockupIndex(PointsCurve(EPOCH))
+    index.apply_logs(web3.eth.get_logs({"address": staking.address, "fromBlock": start, "toBlock": chain.height}))
+    lockups = index.lockups(alice)
+    assert [lockup.lockup_id for lockup in lockups] == [0, 1, 3]
+    assert index.lockups_count(alice) == staking.lockupsCount(alice)
+    for lockup in lockups:
+        assert tuple(staking.lockups(alice, lockup.lockup_id)) == (lockup.amount, lockup.end, lockup.points)
+    timestamp = chain[-1].timestamp
+    withdrawals = index.portfolio(alice, timestamp).withdrawals
+    assert withdrawals == [staking.previewWithdraw(lockup.amount, lockup.end) for lockup in lockups]
@@ -0,0 +1,188 @@
+import pytest
+from brownie import chain, web3
+from scripts.indexer.proposals import (
+    ACTIVE,
+    CANCELED,
+    DEFEATED,
+    EXECUTED,
+    PENDING,
+    QUEUED,
+    SUCCEEDED,
+    ProposalTracker,
+)
+from scripts.indexer.votes import VotingPowerIndex
+
+from ..helpers import advance_blocks, mine_blocks
+from .logs import ALICE, BOB, make_log, voting_history
+
+try:
+    from eth_abi import encode
+except ImportError:  # eth-abi < 4
+    from eth_abi import encode_abi as encode
+
+GOVERNANCE = "0x3cdD07c16614059e66344a7b579DAB4f9516C0b6"
+VOTING_DELAY = 7200
+VOTING_PERIOD = 14416
+EXTENSION = 7208
+
+PROPOSAL_CREATED = "ProposalCreated(uint256,address,address[],uint256[],string[],bytes[],uint256,uint256,string)"
+VOTE_CAST = "VoteCast(address,uint256,uint8,uint256,string)"
+VOTE_CAST_WITH_PARAMS = "VoteCastWithParams(address,uint256,uint8,uint256,string,bytes)"
+
+
+def _created(proposal_id, block_number, log_index=0):
+    start = block_number + VOTING_DELAY
+    data = encode(
+        ["uint256", "address", "address[]", "uint256[]", "string[]", "bytes[]", "uint256", "uint256", "string"],
+        [
+            proposal_id,
+            ALICE,
+            [GOVERNANCE],
+            [0],
+            ["setVotingDelay(uint256)"],
+            [(100).to_bytes(32, "big")],
+            start,
+            start + VOTING_PERIOD,
+            "Proposal {}\nSets the voting delay".format(proposal_id),
+        ],
+    )
+    return make_log(PROPOSAL_CREATED, block_number, log_index, data=data)
+
+
+def _vote(proposal_id, block_number, voter, support, weight):
+    data = encode(["uint256", "uint8", "uint256", "string"], [proposal_id, support, weight, ""])
+    return make_log(VOTE_CAST, block_number, 0, [voter], data)
+
+
+def _vote_with_params(proposal_id, block_number, voter, support, weight):
+    data = encode(["uint256", "uint8", "uint256", "string", "bytes"], [proposal_id, support, weight, "", b"\x01"])
+    return make_log(VOTE_CAST_WITH_PARAMS, block_number, 0, [voter], data)
+
+
+def _tracker(logs):
+    # 500 veOGV staked by block 20, so quorum is 100
+    voting_power = VotingPowerIndex()
+    voting_power.apply_logs(voting_history()[:9])
+    tracker = ProposalTracker(voting_power)
+    tracker.apply_logs(logs, 40000)
+    return tracker
+
+
+def test_follows_the_proposal_lifecycle():
+    tracker = _tracker(
+        [
+            _created(1, 100),
+            _vote(1, 21000, ALICE, 1, 300),
+            _vote(1, 21100, BOB, 0, 200),
+            make_log("ProposalQueued(uint256,uint256)", 28300, 0, data=[1, 1700000000]),
+            make_log("ProposalExecuted(uint256)", 30000, 0, data=[1]),
+        ]
+    )
+    states = {block: tracker.state(1, block) for block in [100, 7300, 7301, 21716, 28208, 28209, 28300, 30000]}
+    assert states == {
+        100: PENDING,
+        7300: PENDING,
+        7301: ACTIVE,
+        # Quorum was only reached near the end, so voting was extended
+        21716: ACTIVE,
+        28208: ACTIVE,
+        28209: SUCCEEDED,
+        28300: QUEUED,
+        30000: EXECUTED,
+    }
+    proposal = tracker.proposal(1)
+    assert proposal.deadline == 21000 + EXTENSION
+    assert (proposal.for_votes, proposal.against_votes, proposal.abstain_votes) == (300, 200, 0)
+    assert proposal.eta == 1700000000
+    assert tracker.quorum(1) == 100
+    assert tracker.get_receipt(1, BOB.lower()) == (True, 0, 200)
+    assert tracker.get_receipt(1, GOVERNANCE) == (False, 0, 0)
+    summary = tracker.summary(1)
+    assert summary["state"] == "Executed"
+    assert summary["description"] == "Proposal 1\nSets the voting delay"
+    assert summary["endBlock"] == 28208
+
+
+def test_early_quorum_doesnt_extend_voting():
+    tracker = _tracker([_created(2, 200), _vote(2, 8000, BOB, 1, 200)])
+    assert tracker.proposal(2).deadline == 200 + VOTING_DELAY + VOTING_PERIOD
+    assert tracker.state(2, 21816) == ACTIVE
+    assert tracker.state(2, 21817) == SUCCEEDED
+
+
+def test_defeated_and_canceled_proposals():
+    tracker = _tracker(
+        [
+            _created(3, 300),
+            _created(4, 400),
+            _vote(4, 8000, ALICE, 0, 300),
+            _vote(4, 8001, BOB, 1, 200),
+            _created(5, 500),
+            make_log("ProposalCanceled(uint256)", 600, 0, data=[5]),
+        ]
+    )
+    assert tracker.state(3) == DEFEATED
+    assert tracker.state(4) == DEFEATED
+    assert tracker.state(5, 599) == PENDING
+    assert tracker.state(5) == CANCELED
+    assert tracker.by_state(DEFEATED) == [4, 3]
+    with pytest.raises(KeyError):
+        tracker.state(6)
+
+
+def test_counts_votes_cast_with_params():
+    tracker = _tracker([_created(8, 800), _vote(8, 8000, ALICE, 0, 300), _vote_with_params(8, 8001, BOB, 2, 200)])
+    proposal = tracker.proposal(8)
+    assert (proposal.for_votes, proposal.against_votes, proposal.abstain_votes) == (0, 300, 200)
+    assert tracker.get_receipt(8, BOB) == (True, 2, 200)
+
+
+def test_tracks_quorum_updates():
+    tracker = _tracker(
+        [
+            _created(7, 700),
+            _vote(7, 8000, BOB, 1, 200),
+            make_log("QuorumNumeratorUpdated(uint256,uint256)", 9000, 0, data=[20, 50]),
+        ]
+    )
+    assert tracker.quorum(7) == 250
+    assert tracker.state(7) == DEFEATED
+
+
+def test_matches_governance_state(governance, staking, whale_voter):
+    voting_power = VotingPowerIndex()
+    tracker = ProposalTracker(voting_power)
+
+    def sync():
+        block_number = chain.height
+        for index, contract in [(voting_power, staking), (tracker, governance)]:
+            from_block = 0 if index.block_number is None else index.block_number + 1
+            log_filter = {"address": contract.address, "fromBlock": from_block, "toBlock": block_number}
+            index.apply_logs(web3.eth.get_logs(log_filter), block_number)
+        return tracker.state(proposal_id, block_number + 1)
+
+    tx = governance.propose(
+        [governance.address],
+        [0],
+        ["setVotingDelay(uint256)"],
+        ["0x0000000000000000000000000000000000000000000000000000000000000064"],
+        "Set voting delay",
+        {"from": whale_voter},
+    )
+    proposal_id = tx.return_value
+    assert sync() == governance.state(proposal_id) == PENDING
+    advance_blocks(7201)
+    assert sync() == governance.state(proposal_id) == ACTIVE
+    governance.castVote(proposal_id, 1, {"from": whale_voter})
+    assert sync() == ACTIVE
+    assert tracker.proposal(proposal_id).deadline == governance.proposalDeadline(proposal_id)
+    assert tracker.proposal(proposal_id).for_votes == governance.proposals(proposal_id)[5]
+    assert tracker.quorum(proposal_id) == governance.quorum(tracker.proposal(proposal_id).snapshot)
+    mine_blocks(web3)
+    assert sync() == governance.state(proposal_id) == SUCCEEDED
+    governance.queue(proposal_id, {"from": whale_voter})
+    assert sync() == governance.state(proposal_id) == QUEUED
+    chain.sleep(86400 * 2)
+    chain.mine()
+    governance.execute(proposal_id, {"from": whale_voter})
+    assert sync() == governance.state(proposal_id) == EXECUTED
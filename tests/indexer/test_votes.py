@@ -0,0 +1,77 @@
+from brownie import accounts, chain, web3
+from scripts.indexer.votes import VotingPowerIndex
+from scripts.retroactive.contracts import ZERO_ADDRESS
+from scripts.retroactive.logs import LogFetcher
+
+from ..helpers import WEEK
+from ..local_rpc import LocalRpc
+from .logs import ALICE, BOB, CAROL, voting_history
+
+
+def test_answers_past_votes_and_supply():
+    index = VotingPowerIndex()
+    # Logs can arrive in any order within a batch
+    index.apply_logs(list(reversed(voting_history())), 60)
+
+    assert index.block_number == 60
+    assert [index.get_past_votes(ALICE, block) for block in [9, 10, 29, 30, 49, 50]] == [0, 300, 300, 500, 500, 200]
+    assert [index.get_past_votes(BOB, block) for block in [19, 20, 30]] == [0, 200, 0]
+    assert index.get_past_votes(BOB.lower(), 25) == 200
+    assert [index.get_past_total_supply(block) for block in [9, 10, 20, 40, 50]] == [0, 300, 500, 520, 220]
+    assert index.delegates(BOB) == ALICE
+    assert index.delegates(ZERO_ADDRESS) == ZERO_ADDRESS
+
+
+def test_top_delegates_at_a_block():
+    index = VotingPowerIndex()
+    index.apply_logs(voting_history())
+
+    assert index.top_delegates(25) == [(ALICE, 300), (BOB, 200)]
+    assert index.top_delegates(45) == [(ALICE, 500), (CAROL, 20)]
+    assert index.top_delegates(50, 1) == [(ALICE, 200)]
+    assert index.top_delegates(5) == []
+
+
+def test_indexes_incrementally_from_the_cursor():
+    logs = voting_history()
+
+    def get_logs(log_filter):
+        start, end = int(log_filter["fromBlock"], 16), int(log_filter["toBlock"], 16)
+        return [log for log in logs if start <= int(log["blockNumber"], 16) <= end]
+
+    with LocalRpc({"eth_getLogs": get_logs}) as rpc:
+        fetcher = LogFetcher(rpc.url, chunk_size=7)
+        index = VotingPowerIndex()
+        index.index(fetcher, ALICE, 0, 35)
+        assert index.get_past_votes(ALICE, 35) == 500
+        index.index(fetcher, ALICE, 0, 60)
+        ranges = [(int(params[0]["fromBlock"], 16), int(params[0]["toBlock"], 16)) for _, params in rpc.calls]
+
+    assert index.block_number == 60
+    assert index.get_past_votes(ALICE, 60) == 200
+    assert index.get_past_total_supply(60) == 220
+    # The second run only fetched the blocks after the first one
+    assert ranges[6][0] == 36
+
+
+def test_matches_staking_checkpoints(token, staking):
+    alice, bob = accounts[0], accounts[1]
+    start = chain.height
+    amount = 1000 * 10**18
+    token.transfer(bob, amount, {"from": alice})
+    token.approve(staking, amount, {"from": alice})
+    token.approve(staking, amount, {"from": bob})
+    staking.mockStake(amount // 2, WEEK, alice, {"from": alice})
+    staking.mockStake(amount, 4 * WEEK, bob, {"from": bob})
+    staking.delegate(alice, {"from": bob})
+    staking.mockStake(amount // 2, 2 * WEEK, alice, {"from": alice})
+    chain.mine()
+    end = chain.height - 1
+
+    index = VotingPowerIndex()
+    index.apply_logs(web3.eth.get_logs({"address": staking.address, "fromBlock": start, "toBlock": end}), end)
+    for block in range(start, end + 1):
+        for account in [alice, bob]:
+            assert index.get_past_votes(account.address, block) == staking.getPastVotes(account, block)
+        assert index.get_past_total_supply(block) == staking.getPastTotalSupply(block)
+    assert index.top_delegates(end) == [(alice.address, staking.getVotes(alice))]
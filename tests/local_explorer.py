@@ -0,0 +1,43 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class LocalExplorer:
+    """Minimal Etherscan API stand-in answering getsourcecode lookups.
+
+    `verified` is the set of addresses with published source. Tests publish
+    by adding to it, every lookup is recorded in `lookups`.
+    """
+
+    def __init__(self, verified=()):
+        self.verified = set(verified)
+        self.lookups = []
+        explorer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+                explorer.lookups.append(query["address"])
+                source = "contract C {}" if query["address"] in explorer.verified else ""
+                body = json.dumps({"status": "1", "message": "OK", "result": [{"SourceCode": source}]}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = "http://127.0.0.1:{}/api".format(self._server.server_address[1])
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,100 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from eth_utils import keccak
+
+try:
+    from eth_abi import decode, encode
+except ImportError:  # eth-abi < 4
+    from eth_abi import decode_abi as decode
+    from eth_abi import encode_abi as encode
+
+
+class LocalRpc:
+    """Minimal JSON-RPC server for tests that need a provider URL.
+
+    `handlers` maps method names to callables taking the request params. A
+    handler raising RpcFailure answers with a JSON-RPC error instead.
+    """
+
+    def __init__(self, handlers):
+        self.handlers = handlers
+        self.calls = []
+        rpc = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                requests = request if isinstance(request, list) else [request]
+                responses = [rpc._dispatch(r) for r in requests]
+                body = json.dumps(responses if isinstance(request, list) else responses[0]).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = "http://127.0.0.1:{}".format(self._server.server_address[1])
+
+    def _dispatch(self, request):
+        self.calls.append((request["method"], request["params"]))
+        response = {"jsonrpc": "2.0", "id": request["id"]}
+        try:
+            response["result"] = self.handlers[request["method"]](*request["params"])
+        except RpcFailure as e:
+            response["error"] = {"code": e.code, "message": e.message}
+        return response
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class RpcFailure(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class LocalMulticall:
+    """eth_call handler answering Multicall3 aggregate3 calls from Python.
+
+    `functions` maps (target address, signature, output types) to callables
+    taking the block number and the decoded arguments. A callable raising
+    makes that call fail. Blocks are recorded in `blocks`, one per eth_call.
+    """
+
+    def __init__(self, functions):
+        self.functions = {}
+        for (target, signature, output_types), function in functions.items():
+            inputs = signature[signature.index("(") + 1 : -1]
+            key = (target.lower(), keccak(text=signature)[:4])
+            self.functions[key] = ([t for t in inputs.split(",") if t], output_types, function)
+        self.blocks = []
+
+    def __call__(self, tx, block):
+        self.blocks.append(block)
+        (calls,) = decode(["(address,bool,bytes)[]"], bytes.fromhex(tx["data"][10:]))
+        results = []
+        for target, allow_failure, data in calls:
+            input_types, output_types, function = self.functions.get((target.lower(), data[:4]), (None, None, None))
+            try:
+                value = function(int(block, 16), *decode(input_types, data[4:]))
+            except Exception:
+                if not allow_failure:
+                    raise RpcFailure(3, "execution reverted")
+                results.append((False, b""))
+                continue
+            values = value if len(output_types) > 1 else (value,)
+            results.append((True, encode(output_types, list(values))))
+        return "0x" + encode(["(bool,bytes)[]"], [results]).hex()
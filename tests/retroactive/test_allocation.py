@@ -0,0 +1,82 @@
+import json
+import random
+
+import pytest
+from scripts.merkle_tree import build_tree, format_amount, parse_amount
+from scripts.retroactive.allocation import OUSD_AIRDROP_AMOUNT, Pool, allocate, allocated_accounts, shares
+from scripts.retroactive.outputs import write_outputs
+from scripts.retroactive.ousd import load_progress, reward_scores
+
+HOLDERS = ["0x" + "{:040x}".format(i + 1) for i in range(6)]
+
+
+def test_shares_sum_to_the_budget():
+    rng = random.Random(3)
+    for _ in range(200):
+        scores = [rng.choice([0, rng.randrange(1, 10**rng.randrange(1, 30))]) for _ in range(rng.randrange(1, 50))]
+        if not any(scores):
+            continue
+        budget = rng.randrange(10**rng.randrange(1, 28))
+        allocated = shares(scores, budget)
+        assert sum(allocated) == budget
+        total = sum(scores)
+        for score, amount in zip(scores, allocated):
+            assert amount - score * budget // total in (0, 1)
+
+    # Dust goes to the largest remainders, then to the earliest score
+    assert shares([1, 1, 1], 10) == [4, 3, 3]
+    assert shares([1, 2, 2], 6) == [1, 3, 2]
+    assert shares([0, 0], 0) == [0, 0]
+    with pytest.raises(ValueError):
+        shares([0, 0], 1)
+
+
+def test_allocates_pools_into_sorted_accounts():
+    accounts = allocate(
+        [
+            Pool(100, {"ogn": {HOLDERS[2]: 1, HOLDERS[0]: 1}, "ognStaking": {HOLDERS[0]: 1}}),
+            Pool(10, {"convex": {HOLDERS[1]: 3, HOLDERS[3]: 0}}),
+        ]
+    )
+    assert list(accounts) == HOLDERS[:4]
+    assert accounts[HOLDERS[0]] == {"amount": 66, "split": {"ogn": 33, "ognStaking": 33, "convex": 0}}
+    assert accounts[HOLDERS[1]]["split"] == {"ogn": 0, "ognStaking": 0, "convex": 10}
+    assert accounts[HOLDERS[2]]["amount"] == 34
+    assert accounts[HOLDERS[3]]["amount"] == 0
+    assert HOLDERS[3] not in allocate([Pool(10, {"convex": {HOLDERS[1]: 3, HOLDERS[3]: 0}})], skip_empty=True)
+
+
+def test_groups_spilled_allocations_by_address():
+    rng = random.Random(5)
+    holders = ["0x" + "{:040x}".format(rng.randrange(2**160)) for _ in range(300)]
+    pools = [
+        Pool(10**24, {"ogn": {holder: rng.randrange(10**20) for holder in holders[:200]}}),
+        Pool(10**22, {"lp": {holder: rng.randrange(10**18) for holder in holders[100:]}}),
+    ]
+    accounts = list(allocated_accounts(pools, chunk_size=7))
+    assert accounts == list(allocate(pools).items())
+    assert [address for address, _ in accounts] == sorted(holders)
+    assert sum(account["amount"] for _, account in accounts) == 10**24 + 10**22
+
+
+def test_distributes_the_ousd_airdrop_dust(tmp_path):
+    _, ousd_holders, wousd_holders = load_progress()
+    ousd_scores, wousd_scores = reward_scores(ousd_holders, wousd_holders)
+    accounts = allocate([Pool(OUSD_AIRDROP_AMOUNT, {"ousd": ousd_scores, "wousd": wousd_scores})])
+    assert sum(account["amount"] for account in accounts.values()) == OUSD_AIRDROP_AMOUNT
+
+    # Only the rounding dust differs from what ousd.ts allocated
+    published = json.load(open("./scripts/1_data/mandatory_lockup_accounts.json"))
+    assert list(accounts) == list(published)
+    for address, data in published.items():
+        for source, amount in data["split"].items():
+            assert accounts[address]["split"][source] - parse_amount(amount) in (0, 1)
+
+    path = str(tmp_path / "accounts.json")
+    write_outputs(accounts, path)
+    written = json.load(open(path))
+    assert {address: parse_amount(data["amount"]) for address, data in written.items()} == {
+        address: account["amount"] for address, account in accounts.items()
+    }
+    assert len(build_tree(written)) == len(accounts)
+    assert format_amount(0) == {"type": "BigNumber", "hex": "0x00"}
@@ -0,0 +1,69 @@
+import os
+
+from scripts.retroactive.checkpoint import Checkpoint
+from scripts.retroactive.contracts import ZERO_ADDRESS
+from scripts.retroactive.history import TokenHistory
+
+HOLDERS = ["0x" + "{:040x}".format(i + 1) for i in range(4)]
+
+
+def _transfers(start, end):
+    for block in range(start, end):
+        holder = HOLDERS[block % len(HOLDERS)]
+        yield block, ZERO_ADDRESS, holder, block * 10
+        yield block, holder, HOLDERS[(block + 1) % len(HOLDERS)], block * 25
+
+
+def _index(path, ranges, compact_every=3):
+    history = TokenHistory()
+    checkpoint = Checkpoint(str(path), {"ogn": history}, compact_every=compact_every)
+    checkpoint.load()
+    for start, end in ranges:
+        for transfer in _transfers(start, end):
+            history.apply_transfer(*transfer)
+        checkpoint.commit(end - 1)
+    return history, checkpoint
+
+
+def _columns(history):
+    return [(list(blocks), deltas, balances) for blocks, deltas, balances in zip(history.blocks, history.deltas, history.balances)]
+
+
+def test_resume_matches_single_run(tmp_path):
+    ranges = [(block, block + 10) for block in range(0, 100, 10)]
+    expected, _ = _index(tmp_path / "full", ranges)
+
+    _index(tmp_path / "resumed", ranges[:7])
+    resumed = TokenHistory()
+    checkpoint = Checkpoint(str(tmp_path / "resumed"), {"ogn": resumed})
+    assert checkpoint.load() == 69
+    for transfer in _transfers(70, 100):
+        resumed.apply_transfer(*transfer)
+
+    assert resumed.addresses == expected.addresses
+    assert _columns(resumed) == _columns(expected)
+
+
+def test_commits_only_append_new_changes(tmp_path):
+    _, checkpoint = _index(tmp_path / "progress", [(0, 10), (10, 20)], compact_every=100)
+    size = os.path.getsize(checkpoint.log_path)
+    checkpoint.commit(20)
+    # Nothing happened in block 20, so the commit is a near empty record
+    assert os.path.getsize(checkpoint.log_path) - size < 100
+    assert not os.path.exists(checkpoint.snapshot_path)
+
+    checkpoint.compact()
+    assert os.path.getsize(checkpoint.log_path) == 0
+    assert os.path.exists(checkpoint.snapshot_path)
+
+
+def test_torn_record_is_dropped(tmp_path):
+    _, checkpoint = _index(tmp_path / "progress", [(0, 10), (10, 20)], compact_every=100)
+    with open(checkpoint.log_path, "a") as f:
+        f.write('{"from":19,"to":29,"tokens":{"ogn":[["0x')
+
+    history = TokenHistory()
+    assert Checkpoint(str(tmp_path / "progress"), {"ogn": history}).load() == 19
+    expected, _ = _index(tmp_path / "expected", [(0, 20)])
+    assert _columns(history) == _columns(expected)
+    assert open(checkpoint.log_path).read().endswith("\n")
@@ -0,0 +1,36 @@
+from scripts.retroactive.contracts import CONVEX_VOTER_PROXY_ADDRESS, EXCLUDED_CONTRACTS
+from scripts.retroactive.exclusions import EXCLUSIONS_FILE, Exclusions, Rule, default_rules, load_addresses
+
+HOLDERS = ["0x" + "{:040x}".format(i + 1) for i in range(6)]
+CHECKSUMMED = "0x9acbB72Cf67103A30333A32CD203459c6a9c3311"
+
+
+def test_matches_addresses_whatever_their_casing():
+    exclusions = Exclusions(
+        [
+            Rule("team", ["ogn", "ognStaking"], [CHECKSUMMED.lower(), HOLDERS[1]]),
+            Rule("pools", ["ousd"], [HOLDERS[2].upper().replace("0X", "0x")]),
+        ]
+    )
+    scores = {CHECKSUMMED: 5, HOLDERS[0]: 7, HOLDERS[1]: 11, HOLDERS[2]: 13}
+    assert exclusions.apply("ogn", scores) == {HOLDERS[0]: 7, HOLDERS[2]: 13}
+    assert exclusions.apply("ousd", scores) == {CHECKSUMMED: 5, HOLDERS[0]: 7, HOLDERS[1]: 11}
+    assert exclusions.apply("wousd", scores) == scores
+    assert exclusions.mask("ousd", list(scores)) == [True, True, True, False]
+    assert [(e.source, e.rule, e.address, e.score) for e in exclusions.excluded] == [
+        ("ogn", "team", CHECKSUMMED, 5),
+        ("ogn", "team", HOLDERS[1], 11),
+        ("ousd", "pools", HOLDERS[2], 13),
+    ]
+    assert exclusions.missing("ognStaking", {HOLDERS[1]: 1}) == [CHECKSUMMED]
+
+
+def test_loads_the_exclusion_list_once():
+    addresses = load_addresses()
+    assert len(addresses) == len(set(addresses)) > 20000
+    assert addresses[0] == CHECKSUMMED
+
+    exclusions = Exclusions(default_rules(EXCLUSIONS_FILE))
+    assert exclusions.addresses("ogn") == set(addresses)
+    assert exclusions.addresses("ousd") == set(EXCLUDED_CONTRACTS)
+    assert exclusions.addresses("ousd3CrvGauge") == {CONVEX_VOTER_PROXY_ADDRESS}
@@ -0,0 +1,80 @@
+import json
+
+from scripts.merkle_tree import parse_amount
+from scripts.retroactive.contracts import TRANSFER_TOPIC, ZERO_ADDRESS
+from scripts.retroactive.history import TokenHistory
+from scripts.retroactive.ousd import load_progress, reward_scores
+
+ALICE = "0x4370823e0453BAe9F6B6b790daA7D02Fd158719f"
+BOB = "0x8dea6Ef7767e0D6ae7Dd9D144E514D7DFAe75B36"
+
+
+def _topic(address):
+    return "0x" + "0" * 24 + address[2:].lower()
+
+
+def test_transfers_update_balances():
+    history = TokenHistory()
+    history.apply_transfer(10, ZERO_ADDRESS, ALICE, 100)
+    history.apply_transfer(20, ALICE, BOB, 30)
+    history.apply_transfer(20, ALICE, BOB, 0)
+    # Sending more than the balance clamps at zero, like the OUSD indexer
+    history.apply_transfer(30, ALICE, BOB, 500)
+
+    assert history.balance(ALICE) == 0
+    assert history.balance(BOB) == 530
+    assert history.balance_at(ALICE, 9) == 0
+    assert history.balance_at(ALICE, 25) == 70
+    assert list(history.deltas[0]) == [100, -30, -70]
+    assert ZERO_ADDRESS not in history
+
+
+def test_same_block_changes_are_merged():
+    history = TokenHistory()
+    history.apply_transfer(10, ZERO_ADDRESS, ALICE, 100)
+    history.apply_transfer(10, ALICE, BOB, 40)
+    history.apply_transfer(10, ZERO_ADDRESS, ALICE, 5)
+    assert list(history.blocks[0]) == [10]
+    assert history.deltas[0] == [65]
+    assert history.balances[0] == [65]
+
+
+def test_score_clips_to_reward_window():
+    history = TokenHistory()
+    history.apply_transfer(100, ZERO_ADDRESS, ALICE, 10)
+    history.apply_transfer(200, ZERO_ADDRESS, ALICE, 10)
+    history.apply_transfer(300, ALICE, BOB, 20)
+
+    assert history.score(ALICE, 400) == 10 * 100 + 20 * 100
+    assert history.score(ALICE, 400, reward_from_block=150) == 10 * 50 + 20 * 100
+    assert history.score(ALICE, 250) == 10 * 100 + 20 * 50
+    assert history.score(BOB, 400) == 20 * 100
+    assert history.score(BOB, 250) == 0
+
+
+def test_decodes_transfer_logs():
+    history = TokenHistory()
+    history.apply_transfer_logs(
+        [
+            {
+                "blockNumber": "0xa",
+                "logIndex": "0x0",
+                "topics": [TRANSFER_TOPIC, _topic(ZERO_ADDRESS), _topic(ALICE)],
+                "data": "0x" + hex(123)[2:].zfill(64),
+            }
+        ]
+    )
+    assert history.balance(ALICE) == 123
+
+
+def test_progress_file_reproduces_ousd_airdrop():
+    airdrop_amount = 400000000 * 10**18
+    _, ousd_holders, wousd_holders = load_progress()
+    ousd_scores, wousd_scores = reward_scores(ousd_holders, wousd_holders)
+    total_score = sum(ousd_scores.values()) + sum(wousd_scores.values())
+
+    accounts = json.load(open("./scripts/1_data/mandatory_lockup_accounts.json"))
+    for address, data in accounts.items():
+        split = data["split"]
+        assert ousd_scores.get(address, 0) * airdrop_amount // total_score == parse_amount(split["ousd"])
+        assert wousd_scores.get(address, 0) * airdrop_amount // total_score == parse_amount(split["wousd"])
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+from scripts.retroactive.contracts import TRANSFER_TOPIC, WOUSD_ADDRESS, ZERO_ADDRESS
+from scripts.retroactive.history import TokenHistory
+from scripts.retroactive.logs import LogFetcher, RpcError
+from scripts.retroactive.ousd import index_transfers
+
+from ..local_rpc import LocalRpc, RpcFailure
+
+MAX_RESULTS = 25
+HOLDERS = ["0x" + "{:040x}".format(i + 1) for i in range(8)]
+
+
+def _topic(address):
+    return "0x" + "0" * 24 + address[2:]
+
+
+def _recorded_logs(count=400, seed=1):
+    """A replayable wOUSD transfer history spread over 1000 blocks."""
+    rng = random.Random(seed)
+    logs = []
+    for block in sorted(rng.randrange(100, 1100) for _ in range(count)):
+        sender = ZERO_ADDRESS if rng.random() < 0.3 else rng.choice(HOLDERS)
+        logs.append(
+            {
+                "address": WOUSD_ADDRESS.lower(),
+                "blockNumber": hex(block),
+                "logIndex": hex(sum(1 for log in logs if int(log["blockNumber"], 16) == block)),
+                "topics": [TRANSFER_TOPIC, _topic(sender), _topic(rng.choice(HOLDERS))],
+                "data": "0x" + "{:064x}".format(rng.randrange(1, 10**20)),
+            }
+        )
+    return logs
+
+
+def _replay(logs):
+    def get_logs(log_filter):
+        start, end = int(log_filter["fromBlock"], 16), int(log_filter["toBlock"], 16)
+        matches = [log for log in logs if start <= int(log["blockNumber"], 16) <= end]
+        if len(matches) > MAX_RESULTS:
+            raise RpcFailure(-32005, "query returned more than {} results".format(MAX_RESULTS))
+        # Providers don't promise any particular order across chunks
+        return list(reversed(matches))
+
+    return LocalRpc({"eth_getLogs": get_logs})
+
+
+def test_bisects_oversized_ranges_and_orders_logs():
+    logs = _recorded_logs()
+    with _replay(logs) as rpc:
+        fetcher = LogFetcher(rpc.url, chunk_size=300, concurrency=4)
+        fetched = fetcher.get_logs({"topics": [TRANSFER_TOPIC]}, 0, 1200)
+    assert fetched == logs
+    assert fetcher.splits > 0
+
+
+def test_gives_up_when_a_single_block_is_too_large():
+    logs = _recorded_logs()
+    for log in logs:
+        log["blockNumber"] = hex(500)
+    with _replay(logs) as rpc:
+        with pytest.raises(RpcError):
+            LogFetcher(rpc.url, chunk_size=1000).get_logs({}, 0, 1000)
+
+
+def test_index_transfers_matches_serial_replay():
+    logs = _recorded_logs()
+    expected = TokenHistory()
+    expected.apply_transfer_logs(logs)
+
+    with _replay(logs) as rpc:
+        _, wousd_holders = index_transfers(LogFetcher(rpc.url, chunk_size=97, concurrency=8), 0, 1200)
+    assert wousd_holders.balance_scores() == expected.balance_scores()
+    assert wousd_holders.scores(1200) == expected.scores(1200)
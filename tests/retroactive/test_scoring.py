@@ -0,0 +1,38 @@
+import random
+
+from scripts.retroactive.contracts import EXCLUDED_CONTRACTS, ZERO_ADDRESS
+from scripts.retroactive.history import TokenHistory
+from scripts.retroactive.ousd import load_progress, reward_scores
+from scripts.retroactive.scoring import CumulativeScores
+
+HOLDERS = ["0x" + "{:040x}".format(i + 1) for i in range(12)]
+
+
+def _random_history(seed=7):
+    rng = random.Random(seed)
+    history = TokenHistory()
+    for block in sorted(rng.randrange(1000, 5000) for _ in range(500)):
+        sender = ZERO_ADDRESS if rng.random() < 0.4 else rng.choice(HOLDERS)
+        history.apply_transfer(block, sender, rng.choice(HOLDERS), rng.randrange(1, 10**21))
+    # Convex style withdrawals can leave a negative balance, which scores zero
+    history.record(HOLDERS[0], 5200, -10**30)
+    return history
+
+
+def test_windows_match_single_scores():
+    history = _random_history()
+    scores = CumulativeScores(history)
+    windows = [(0, 5500), (0, 3000), (2500, 3000), (1200, 1300), (4000, 4000), (0, 900), (3000, 2000)]
+
+    table = scores.table(windows)
+    for i, (start, snapshot) in enumerate(windows):
+        expected = history.scores(snapshot, start)
+        assert scores.scores(snapshot, start) == expected
+        assert {address: row[i] for address, row in table.items()} == expected
+    assert scores.totals(windows) == [sum(history.scores(end, start).values()) for start, end in windows]
+
+
+def test_matches_ousd_airdrop_scores():
+    _, ousd_holders, wousd_holders = load_progress()
+    ousd_scores, _ = reward_scores(ousd_holders, wousd_holders)
+    assert CumulativeScores(ousd_holders, exclude=EXCLUDED_CONTRACTS).scores(15087759) == ousd_scores
@@ -0,0 +1,103 @@
+import json
+
+from scripts.multicall import JsonRpc
+from scripts.retroactive.contracts import OGN_ADDRESS, OGN_STAKING_ADDRESS
+from scripts.retroactive.logs import LogFetcher
+from scripts.retroactive.ousd import SNAPSHOT_BLOCK
+from scripts.retroactive.snapshot import (
+    TOTAL_CURRENT_HOLDINGS,
+    SnapshotRequest,
+    SnapshotStore,
+    ogn_stakers,
+    request_key,
+    snapshot,
+    write_staking_rewards,
+)
+
+from ..indexer.logs import make_log
+from ..local_rpc import LocalMulticall, LocalRpc
+
+STAKERS = ["0x" + "{:040x}".format(i + 1) for i in range(1000)]
+
+
+def _holdings(block, staker):
+    return int(staker, 16) * 10**18
+
+
+def _local_staking():
+    return LocalMulticall(
+        {
+            (OGN_STAKING_ADDRESS, "totalCurrentHoldings(address)", ("uint256",)): _holdings,
+            (OGN_ADDRESS, "balanceOf(address)", ("uint256",)): lambda block, account: 42,
+        }
+    )
+
+
+def _requests(stakers=STAKERS):
+    return [
+        SnapshotRequest(OGN_STAKING_ADDRESS, TOTAL_CURRENT_HOLDINGS, stakers, SNAPSHOT_BLOCK),
+        SnapshotRequest(OGN_ADDRESS, "balanceOf(address)(uint256)", [OGN_STAKING_ADDRESS], SNAPSHOT_BLOCK),
+    ]
+
+
+def test_snapshots_concurrently_and_resumes(tmp_path):
+    path = str(tmp_path / "snapshot.jsonl")
+    holdings, balance = _requests()
+    with LocalRpc({"eth_call": _local_staking()}) as rpc:
+        eth_call = JsonRpc(rpc.url).eth_call
+        results = snapshot(eth_call, [holdings, balance], SnapshotStore(path), batch_size=100, concurrency=4)
+        assert len(rpc.calls) == 11
+        assert set(block for _, (_, block) in rpc.calls) == {hex(SNAPSHOT_BLOCK)}
+
+        assert results[request_key(holdings)] == {staker: _holdings(None, staker) for staker in STAKERS}
+        assert results[request_key(balance)] == {OGN_STAKING_ADDRESS: 42}
+        with open(path) as f:
+            assert len(f.readlines()) == 11
+
+        # Everything is stored, so a second run makes no calls
+        assert snapshot(eth_call, [holdings, balance], SnapshotStore(path), batch_size=100) == results
+        assert len(rpc.calls) == 11
+
+
+def test_drops_a_partially_written_batch(tmp_path):
+    path = str(tmp_path / "snapshot.jsonl")
+    holdings, _ = _requests()
+    with LocalRpc({"eth_call": _local_staking()}) as rpc:
+        eth_call = JsonRpc(rpc.url).eth_call
+        snapshot(eth_call, [holdings._replace(addresses=STAKERS[:300])], SnapshotStore(path), batch_size=100)
+        with open(path) as f:
+            complete = f.read()
+        # As if killed while appending a fourth batch
+        with open(path, "a") as f:
+            f.write('{"key":"' + request_key(holdings) + '","values":{"0x')
+
+        store = SnapshotStore(path)
+        with open(path) as f:
+            assert f.read() == complete
+        assert len(store.values(holdings)) == 300
+
+        results = snapshot(eth_call, [holdings], store, batch_size=100)
+        assert len(rpc.calls) == 3 + 7
+        assert results[request_key(holdings)] == {staker: _holdings(None, staker) for staker in STAKERS}
+
+
+def test_finds_ogn_stakers_in_first_seen_order():
+    logs = [
+        make_log("Staked(address,uint256,uint256,uint256)", 11469400, 0, [STAKERS[2]], [100, 30, 5]),
+        make_log("Staked(address,uint256,uint256,uint256)", 11469401, 0, [STAKERS[0]], [100, 30, 5]),
+        make_log("StakesTransfered(address,address,uint256)", 11469402, 0, [STAKERS[2]], [int(STAKERS[1], 16), 1]),
+        make_log("Staked(address,uint256,uint256,uint256)", 11469403, 0, [STAKERS[2]], [100, 30, 5]),
+    ]
+    with LocalRpc({"eth_getLogs": lambda log_filter: logs}) as rpc:
+        stakers = ogn_stakers(LogFetcher(rpc.url, chunk_size=10**7))
+    assert [int(staker, 16) for staker in stakers] == [3, 1, 2]
+
+
+def test_writes_staking_rewards_as_big_numbers(tmp_path):
+    path = str(tmp_path / "staking-rewards.json")
+    write_staking_rewards({STAKERS[0]: 10**18, STAKERS[1]: 0}, path)
+    with open(path) as f:
+        assert json.load(f) == {
+            STAKERS[0]: {"type": "BigNumber", "hex": "0x0de0b6b3a7640000"},
+            STAKERS[1]: {"type": "BigNumber", "hex": "0x00"},
+        }
@@ -0,0 +1,90 @@
+import random
+
+import pytest
+from brownie import accounts, chain
+from scripts.rewards_simulator import (
+    DAY,
+    UINT64_MAX,
+    FixedRate,
+    InflationSchedule,
+    StakingRewards,
+)
+
+
+def _calculate_inflation(slopes, last, now):
+    # Straight port of RewardsSource._calculateInflation
+    total = 0
+    for start, end, rate_per_day in slopes:
+        if now < start:
+            break
+        range_start, range_end = max(last, start), min(now, end)
+        total += max(0, range_end - range_start) * rate_per_day // DAY
+        if range_end < end:
+            break
+    return total
+
+
+def _random_schedule(rng, count):
+    start = 1_000_000
+    slopes = []
+    for _ in range(count):
+        start += rng.randrange(1, 30 * DAY)
+        slopes.append((start, rng.randrange(0, 10**24)))
+    return slopes
+
+
+def test_normalises_slopes_like_set_inflation():
+    schedule = InflationSchedule([(100, 5), (200, 7)])
+    assert [tuple(slope) for slope in schedule.slopes] == [(100, 200, 5), (200, UINT64_MAX, 7)]
+    with pytest.raises(ValueError, match="Start times must increase"):
+        InflationSchedule([(200, 5), (200, 7)])
+    with pytest.raises(ValueError, match="Too many slopes"):
+        InflationSchedule([(i + 1, 1) for i in range(49)])
+
+
+def test_matches_contract_loop():
+    rng = random.Random(4)
+    for _ in range(50):
+        schedule = InflationSchedule(_random_schedule(rng, rng.randrange(1, 49)))
+        first, final = schedule.starts[0], schedule.starts[-1]
+        for _ in range(50):
+            start = rng.randrange(first - 10 * DAY, final + 10 * DAY)
+            end = start + rng.randrange(0, 200 * DAY)
+            assert schedule.rewards(start, end) == _calculate_inflation(schedule.slopes, start, end)
+
+
+def test_fixed_rate_is_capped_by_balance():
+    source = FixedRate(10, balance=250)
+    assert source.rewards(0, 20) == 200
+    assert source.collect(0, 20) == 200
+    assert source.collect(20, 40) == 50
+    assert source.collect(40, 60) == 0
+
+
+def test_projects_reward_per_share():
+    ledger = StakingRewards(FixedRate(10**18), start=0)
+    # Rewards accrued before anyone staked go to the first collection
+    assert ledger.stake(100, "alice", 10**18) == 0
+    assert ledger.stake(200, "bob", 10**18) == 0
+    assert ledger.acc_reward_per_share == 200 * 10**12
+    assert ledger.preview(300, "alice") == 250 * 10**18
+    assert ledger.collect(300, "alice") == 250 * 10**18
+    assert ledger.unstake(400, "bob", 10**18) == 100 * 10**18
+    assert ledger.project([500, 600]) == [400 * 10**12, 500 * 10**12]
+
+
+def test_matches_rewards_source(token, rewards):
+    token.grantMinterRole(rewards, {"from": accounts[0]})
+    rewards.setRewardsTarget(accounts[0], {"from": accounts[0]})
+    now = chain.time()
+    slopes = [(now + 10, 10**24), (now + 3 * DAY, 2 * 10**23), (now + 10 * DAY, 10**22)]
+    rewards.setInflation([(start, 0, rate) for start, rate in slopes], {"from": accounts[0]})
+    schedule = InflationSchedule.from_contract(rewards)
+    assert [slope.start for slope in schedule.slopes] == [start for start, _ in slopes]
+
+    last = rewards.lastRewardTime()
+    for seconds in [DAY, 5 * DAY + 17, 20 * DAY]:
+        chain.sleep(seconds)
+        tx = rewards.collectRewards({"from": accounts[0]})
+        assert tx.return_value == schedule.rewards(last, tx.timestamp)
+        last = tx.timestamp
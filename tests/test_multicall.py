@@ -0,0 +1,96 @@
+import pytest
+from brownie import MockMulticall3, accounts, chain, web3
+from scripts.multicall import JsonRpc, MulticallReader, split_signature
+
+from .local_rpc import LocalMulticall, LocalRpc
+
+TOKEN = "0x9c354503C38481a7A7a51629142963F98eCC12D0"
+HOLDERS = ["0x" + "{:040x}".format(i + 1) for i in range(25)]
+BALANCES = {block: {holder: block * 1000 + i for i, holder in enumerate(HOLDERS)} for block in [100, 101]}
+
+ERC20_ABI = [
+    {
+        "type": "function",
+        "name": "balanceOf",
+        "inputs": [{"name": "account", "type": "address"}],
+        "outputs": [{"name": "", "type": "uint256"}],
+    },
+    {
+        "type": "function",
+        "name": "totalSupply",
+        "inputs": [],
+        "outputs": [{"name": "", "type": "uint256"}],
+    },
+]
+
+
+def _balance_of(block, holder):
+    return BALANCES[block][holder]
+
+
+def _local_token():
+    return LocalMulticall(
+        {
+            (TOKEN, "balanceOf(address)", ("uint256",)): _balance_of,
+            (TOKEN, "totalSupply()", ("uint256",)): lambda block: sum(BALANCES[block].values()),
+            (TOKEN, "symbol()", ("string",)): lambda block: "OGV",
+            (TOKEN, "lockups(address,uint256)", ("uint128", "uint128", "uint256")): lambda block, user, i: (i, 2, 3),
+        }
+    )
+
+
+def test_splits_output_types():
+    assert split_signature("balanceOf(address)(uint256)") == ("balanceOf(address)", ("uint256",))
+    assert split_signature("lockups(address,uint256)((uint128,uint128),uint256)") == (
+        "lockups(address,uint256)",
+        ("(uint128,uint128)", "uint256"),
+    )
+    assert split_signature("balanceOf(address)") == ("balanceOf(address)", None)
+
+
+def test_batches_reads_at_one_block():
+    multicall = _local_token()
+    with LocalRpc({"eth_call": multicall}) as rpc:
+        reader = MulticallReader(JsonRpc(rpc.url).eth_call, 100, batch_size=10)
+        reader.read_many(TOKEN, "balanceOf", [(holder,) for holder in HOLDERS], abi=ERC20_ABI)
+        supply = reader.read(TOKEN, "totalSupply()(uint256)")
+        reader.read(TOKEN, "symbol()(string)")
+        reader.read(TOKEN, "lockups(address,uint256)(uint128,uint128,uint256)", HOLDERS[0], 7)
+        results = reader.execute()
+
+    assert results[: len(HOLDERS)] == [BALANCES[100][holder] for holder in HOLDERS]
+    assert results[supply] == sum(BALANCES[100].values())
+    assert results[-2:] == ["OGV", (7, 2, 3)]
+    assert reader.calls == len(rpc.calls) == 3
+    assert multicall.blocks == [hex(100)] * 3
+    assert len(reader) == 0
+
+
+def test_failed_reads():
+    reader = MulticallReader(lambda tx, block: bytes.fromhex(_local_token()(tx, hex(block))[2:]), 101)
+    # Reverts in the stand-in, like balanceOf on a contract without it
+    reader.read(TOKEN, "balanceOf(address)(uint256)", TOKEN, allow_failure=True)
+    reader.read(TOKEN, "balanceOf(address)(uint256)", HOLDERS[1])
+    assert reader.execute() == [None, 101001]
+
+    reader.read(TOKEN, "balanceOf(address)(uint256)", TOKEN)
+    with pytest.raises(ValueError, match="reverted"):
+        reader.execute()
+    with pytest.raises(ValueError, match="no function"):
+        reader.read(TOKEN, "balanceOf(uint256)", 1, abi=ERC20_ABI)
+
+
+def test_matches_direct_calls(token, staking):
+    multicall = MockMulticall3.deploy({"from": accounts[0]})
+    chain.mine()
+    block_number = chain.height
+    reader = MulticallReader(web3.eth.call, block_number, batch_size=3, multicall=multicall.address)
+    reader.read_many(token, "balanceOf", [(account,) for account in accounts])
+    reader.read(staking, "getPastTotalSupply", block_number - 1)
+    reader.read(token, "symbol")
+    results = reader.execute()
+    assert results == [token.balanceOf(account) for account in accounts] + [
+        staking.getPastTotalSupply(block_number - 1),
+        token.symbol(),
+    ]
+    assert reader.calls == 4
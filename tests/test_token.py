@@ -1,6 +1,5 @@
 import brownie
 from brownie import *
-from .fixtures import token, staking, rewards
 
 def test_name(token):
     assert token.name() == "Origin DeFi Governance"